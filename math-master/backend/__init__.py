@@ -1 +1 @@
-# Backend package initialization
+# Backend package initialization
@@ -0,0 +1,184 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class PromptCache:
+    """Cache phản hồi AI theo prompt: LRU trong bộ nhớ + SQLite trên đĩa.
+
+    Khóa là hash của (model, prompt đã chuẩn hóa khoảng trắng, tham số sinh)
+    nên cùng một câu hỏi / câu trả lời sai cho cùng một prompt. Mỗi loại yêu
+    cầu (kind) có TTL riêng; TTL 0 hoặc kind không có trong bảng = không cache
+    (chat luôn gọi thẳng). Tầng SQLite dùng chung giữa các worker và giữ
+    được qua các lần khởi động lại.
+
+    Thống kê: tỉ lệ hit và thời gian tiết kiệm ước tính (mỗi hit tính bằng
+    thời gian gọi API trung bình của loại yêu cầu đó).
+    """
+
+    # Số lần ghi giữa hai lần dọn các dòng hết hạn trên đĩa
+    PURGE_EVERY = 500
+
+    def __init__(self, db_path: Optional[str], ttls: Dict[str, int], memory_items: int = 1000):
+        self.db_path = db_path
+        self.ttls = ttls
+        self.memory_items = memory_items
+        self._lock = threading.Lock()
+        self._memory: 'OrderedDict[str, Tuple[float, str]]' = OrderedDict()  # key -> (hết hạn, phản hồi)
+        self._local = threading.local()
+        self._puts = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.saved_seconds = 0.0
+        self._upstream: Dict[str, list] = {}  # kind -> [số lần gọi, tổng thời gian]
+
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+            self._connect().execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, kind TEXT, response TEXT NOT NULL, '
+                'created_at REAL NOT NULL, expires_at REAL NOT NULL)'
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Connection riêng cho thread hiện tại"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(model: str, prompt: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Khóa cache: prompt bỏ khác biệt về khoảng trắng / thụt dòng"""
+        normalized = ' '.join(prompt.split())
+        raw = json.dumps([model, normalized, params or {}], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def ttl(self, kind: Optional[str]) -> int:
+        return self.ttls.get(kind, 0) if kind else 0
+
+    # ==================== LOOKUP / STORE ====================
+    def get(self, key: str) -> Optional[str]:
+        """Phản hồi còn hạn, None nếu không có"""
+        return self._lookup(key)[0]
+
+    def _lookup(self, key: str) -> Tuple[Optional[str], Optional[str]]:
+        """(phản hồi, tầng tìm thấy 'memory' | 'disk'): bộ nhớ trước, sau đó đĩa"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    return entry[1], 'memory'
+                del self._memory[key]
+
+        if not self.db_path:
+            return None, None
+        try:
+            row = self._connect().execute(
+                'SELECT response, expires_at FROM responses WHERE key = ? AND expires_at > ?', (key, now)
+            ).fetchone()
+        except sqlite3.Error as e:
+            print(f"⚠️ AI cache read error: {e}")
+            return None, None
+        if row is None:
+            return None, None
+        self._remember(key, row[0], row[1])
+        return row[0], 'disk'
+
+    def put(self, key: str, kind: str, response: str, ttl: int):
+        now = time.time()
+        self._remember(key, response, now + ttl)
+        if not self.db_path:
+            return
+        try:
+            conn = self._connect()
+            conn.execute('INSERT OR REPLACE INTO responses (key, kind, response, created_at, expires_at) '
+                         'VALUES (?, ?, ?, ?, ?)', (key, kind, response, now, now + ttl))
+            with self._lock:
+                self._puts += 1
+                purge = self._puts % self.PURGE_EVERY == 0
+            if purge:
+                conn.execute('DELETE FROM responses WHERE expires_at <= ?', (now,))
+        except sqlite3.Error as e:
+            print(f"⚠️ AI cache write error: {e}")
+
+    def _remember(self, key: str, response: str, expires_at: float):
+        """Đưa vào LRU trong bộ nhớ, bỏ mục dùng lâu nhất khi đầy"""
+        if self.memory_items <= 0:
+            return
+        with self._lock:
+            self._memory[key] = (expires_at, response)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    # ==================== CALL THROUGH ====================
+    def lookup(self, kind: Optional[str], key: str) -> Optional[str]:
+        """Phản hồi đã cache cho một lần gọi kind (đếm hit / miss / bỏ qua cache)"""
+        if self.ttl(kind) <= 0:
+            with self._lock:
+                self.bypassed += 1
+            return None
+
+        cached, tier = self._lookup(key)
+        with self._lock:
+            if cached is None:
+                self.misses += 1
+            else:
+                if tier == 'memory':
+                    self.memory_hits += 1
+                else:
+                    self.disk_hits += 1
+                self.saved_seconds += self._average_latency(kind)
+        return cached
+
+    def store(self, kind: Optional[str], key: str, response: Optional[str], elapsed: float):
+        """Ghi nhận một lần gọi API (elapsed giây) và lưu phản hồi nếu kind được cache.
+        response None = lỗi, không lưu"""
+        ttl = self.ttl(kind)
+        if ttl <= 0:
+            return
+        with self._lock:
+            upstream = self._upstream.setdefault(kind, [0, 0.0])
+            upstream[0] += 1
+            upstream[1] += elapsed
+        if response:
+            self.put(key, kind, response, ttl)
+
+    def _average_latency(self, kind: str) -> float:
+        """Thời gian gọi API trung bình của kind (hoặc của mọi loại nếu chưa có số liệu)"""
+        calls, seconds = self._upstream.get(kind, (0, 0.0))
+        if not calls:
+            calls = sum(c for c, _ in self._upstream.values())
+            seconds = sum(s for _, s in self._upstream.values())
+        return seconds / calls if calls else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                'memory_items': len(self._memory),
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'bypassed': self.bypassed,
+                'hit_ratio': round(hits / lookups, 3) if lookups else 0.0,
+                'saved_seconds': round(self.saved_seconds, 2),
+                'upstream_avg_seconds': {kind: round(seconds / calls, 3)
+                                         for kind, (calls, seconds) in self._upstream.items() if calls}
+            }
@@ -0,0 +1,276 @@
+"""
+Math Master - chế độ chạy ASGI
+
+Các endpoint Gemini AI (/api/ai/...) được xử lý bằng handler async gọi
+gemini_ai_async: một request đang chờ Gemini chỉ là một coroutine chứ không
+giữ một thread, nên một worker giữ được hàng trăm request AI cùng lúc. Mọi
+route còn lại (đăng nhập, tiến độ, bảng xếp hạng, file tĩnh...) vẫn do app
+Flask (WSGI) trong app.py xử lý, được mount phía sau.
+
+Chạy:
+    cd backend && uvicorn asgi:app --host 0.0.0.0 --port 5000
+
+Cần cài thêm: pip install starlette uvicorn
+"""
+
+import asyncio
+import logging
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.wsgi import WSGIMiddleware
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+
+import serializers
+from ai_services import ai_service
+from app import app as flask_app
+from gemini_async import gemini_ai_async
+
+logger = logging.getLogger(__name__)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse qua serializers (orjson nếu có cài), giống FastJSONProvider của app Flask"""
+
+    def render(self, content) -> bytes:
+        return serializers.dumps_bytes(content)
+
+
+def _error(message, status_code=500, key='error'):
+    return FastJSONResponse({'success': False, key: message}, status_code=status_code)
+
+
+def _missing_field(data, fields):
+    for field in fields:
+        if field not in data:
+            return field
+    return None
+
+
+# Lời gọi Gemini đã quá hạn nhưng còn chạy (giữ tham chiếu để task không bị thu hồi)
+_late_calls = set()
+
+
+async def _call_ai(kind, coro, fallback):
+    """Kết quả của lời gọi Gemini async, hoặc fallback() nếu không có / lỗi /
+    quá hạn chờ của kind (như các method của AIService). Quá hạn thì lời gọi
+    vẫn chạy tiếp và ghi kết quả vào cache."""
+    if not (ai_service.gemini and ai_service.gemini.client):
+        coro.close()
+        return fallback()
+    task = asyncio.ensure_future(coro)
+    budget = ai_service.get_deadline(kind)
+    try:
+        if budget > 0:
+            result = await asyncio.wait_for(asyncio.shield(task), budget)
+        else:
+            result = await asyncio.shield(task)
+    except asyncio.TimeoutError:
+        logger.warning(f"⏱️ Gemini {kind} quá {budget}s, dùng fallback (lời gọi vẫn chạy nền)")
+        ai_service.record_deadline_miss(kind, task)
+        _late_calls.add(task)
+        task.add_done_callback(_late_calls.discard)
+        return fallback()
+    except asyncio.CancelledError:
+        if not task.cancelled():
+            # Chính request này bị hủy (client ngắt kết nối): lời gọi vẫn chạy tiếp
+            _late_calls.add(task)
+            task.add_done_callback(_late_calls.discard)
+            raise
+        # Lời gọi dùng chung (single-flight) bị hủy: request này vẫn trả fallback
+        logger.warning(f"⚠️ Gemini {kind} bị hủy, dùng fallback")
+        return fallback()
+    except Exception as e:
+        logger.error(f"❌ Async AI error: {e}")
+        return fallback()
+    return result if result else fallback()
+
+
+# ==================== API AI SERVICES ====================
+async def ai_smart_explain(request):
+    """AI giải thích thông minh"""
+    try:
+        data = await request.json()
+        field = _missing_field(data, ['question', 'user_answer', 'correct_answer', 'topic'])
+        if field:
+            return _error(f'Thiếu trường: {field}', 400, key='message')
+
+        args = (data['question'], data['user_answer'], data['correct_answer'],
+                data['topic'], data.get('student_level', 'trung bình'))
+        explanation = await _call_ai(
+            'smart_explanation', gemini_ai_async.generate_smart_explanation(*args),
+            lambda: ai_service._create_smart_fallback_explanation(*args)
+        )
+        return FastJSONResponse({'success': True, 'explanation': explanation})
+    except Exception as e:
+        logger.error(f"Smart Explanation error: {e}")
+        return _error(str(e))
+
+
+async def ai_adaptive_exercise(request):
+    """AI tạo bài tập thích ứng"""
+    data = {}
+    try:
+        data = await request.json()
+        student_level = data.get('student_level', 'trung bình')
+        weak_topics = data.get('weak_topics', [])
+
+        exercise = await _call_ai(
+            'adaptive_exercise',
+            gemini_ai_async.generate_adaptive_exercise(student_level, weak_topics, data.get('progress_data', {})),
+            lambda: ai_service._create_fallback_exercise(student_level, weak_topics, 'numbers')
+        )
+        return FastJSONResponse({'success': True, 'exercise': exercise})
+    except Exception as e:
+        logger.error(f"❌ Adaptive Exercise error: {e}")
+        # Fallback để đảm bảo luôn có response
+        fallback_exercise = ai_service._create_fallback_exercise(
+            data.get('student_level', 'trung bình'),
+            data.get('weak_topics', []),
+            'numbers'
+        )
+        return FastJSONResponse({'success': True, 'exercise': fallback_exercise})
+
+
+async def ai_learning_analysis(request):
+    """AI phân tích học tập"""
+    try:
+        data = await request.json()
+        progress_data = data.get('progress_data', {})
+        analysis = await _call_ai(
+            'learning_analysis', gemini_ai_async.analyze_learning_pattern(progress_data),
+            lambda: ai_service._create_fallback_analysis(progress_data)
+        )
+        return FastJSONResponse({'success': True, 'analysis': analysis})
+    except Exception as e:
+        logger.error(f"Learning Analysis error: {e}")
+        return _error(str(e))
+
+
+async def ai_chat(request):
+    """Chat với AI Tutor (dùng cho cả /chat và /smart-chat)"""
+    try:
+        data = await request.json()
+        if 'message' not in data:
+            return _error('Thiếu tin nhắn', 400, key='message')
+
+        message = data['message']
+        context = data.get('context', {})
+        chat_history = context.get('chat_history', []) if context else []
+        response = await _call_ai(
+            'chat', gemini_ai_async.chat_tutor(message, chat_history),
+            lambda: ai_service._get_fallback_chat_response(message)
+        )
+        return FastJSONResponse({'success': True, 'response': response})
+    except Exception as e:
+        logger.error(f"AI Chat error: {e}")
+        return _error(str(e))
+
+
+async def ai_personalized_story(request):
+    """AI tạo câu chuyện cá nhân hóa"""
+    try:
+        data = await request.json()
+        if 'math_concept' not in data:
+            return _error('Thiếu chủ đề toán học', 400, key='message')
+
+        math_concept = data['math_concept']
+        story = await _call_ai(
+            'personalized_story', gemini_ai_async.create_personalized_story(
+                math_concept, data.get('student_interests', ['khám phá', 'động vật', 'thể thao'])),
+            lambda: ai_service.generate_math_story(math_concept)
+        )
+        return FastJSONResponse({'success': True, 'story': story})
+    except Exception as e:
+        logger.error(f"Personalized Story error: {e}")
+        return _error(str(e))
+
+
+# ==================== API MOCK TEST ====================
+async def ai_generate_mock_test(request):
+    """AI tạo đề thi thử"""
+    try:
+        data = await request.json()
+        question_count = data.get('question_count', 10)
+        topics = data.get('topics', ['numbers', 'word_problems', 'geometry', 'measurement'])
+        difficulty = data.get('difficulty', 'medium')
+
+        logger.info(f"🎯 Generating mock test: {question_count} questions, topics: {topics}, difficulty: {difficulty}")
+
+        test = await _call_ai(
+            'mock_test', gemini_ai_async.generate_mock_test(question_count, topics, difficulty),
+            lambda: ai_service._create_fallback_mock_test(question_count, topics, difficulty)
+        )
+        return FastJSONResponse({'success': True, 'test': test})
+    except Exception as e:
+        logger.error(f"Generate Mock Test error: {e}")
+        return _error(str(e))
+
+
+async def ai_evaluate_mock_test(request):
+    """AI đánh giá kết quả thi thử"""
+    try:
+        data = await request.json()
+        field = _missing_field(data, ['test_data', 'user_answers', 'time_spent'])
+        if field:
+            return _error(f'Thiếu trường: {field}', 400, key='message')
+
+        logger.info(f"📊 Evaluating mock test: {len(data.get('user_answers', {}))} answers, time: {data.get('time_spent')}s")
+
+        args = (data['test_data'], data['user_answers'], data['time_spent'])
+        evaluation = await _call_ai(
+            'mock_test_evaluation', gemini_ai_async.evaluate_mock_test(*args),
+            lambda: ai_service._create_fallback_evaluation(*args)
+        )
+        return FastJSONResponse({'success': True, 'evaluation': evaluation})
+    except Exception as e:
+        logger.error(f"Evaluate Mock Test error: {e}")
+        return _error(str(e))
+
+
+async def ai_mock_test_analysis(request):
+    """AI phân tích chi tiết bài thi"""
+    try:
+        data = await request.json()
+        args = (data.get('test_results', {}), data.get('user_profile', {}))
+        analysis = await _call_ai(
+            'mock_test_analysis', gemini_ai_async.analyze_mock_test_performance(*args),
+            lambda: ai_service._create_fallback_performance_analysis(*args)
+        )
+        return FastJSONResponse({'success': True, 'analysis': analysis})
+    except Exception as e:
+        logger.error(f"Mock Test Analysis error: {e}")
+        return _error(str(e))
+
+
+async def ai_async_stats(request):
+    """Số lời gọi Gemini đang chạy / đang chờ / bị từ chối của worker này"""
+    return FastJSONResponse({
+        'success': True,
+        'ai_async': gemini_ai_async.get_stats(),
+        'ai_cache': ai_service.get_cache_stats(),
+        'ai_deadlines': ai_service.get_deadline_stats()
+    })
+
+
+routes = [
+    Route('/api/ai/smart-explain', ai_smart_explain, methods=['POST']),
+    Route('/api/ai/adaptive-exercise', ai_adaptive_exercise, methods=['POST']),
+    Route('/api/ai/learning-analysis', ai_learning_analysis, methods=['POST']),
+    Route('/api/ai/chat', ai_chat, methods=['POST']),
+    Route('/api/ai/smart-chat', ai_chat, methods=['POST']),
+    Route('/api/ai/personalized-story', ai_personalized_story, methods=['POST']),
+    Route('/api/ai/mock-test/generate', ai_generate_mock_test, methods=['POST']),
+    Route('/api/ai/mock-test/evaluate', ai_evaluate_mock_test, methods=['POST']),
+    Route('/api/ai/mock-test/analysis', ai_mock_test_analysis, methods=['POST']),
+    Route('/api/ai/async-stats', ai_async_stats),
+    # Mọi route khác: app Flask (chạy trong thread pool của server ASGI)
+    Mount('/', app=WSGIMiddleware(flask_app)),
+]
+
+# CORS cho cả route async (app Flask có CORS riêng, header bị ghi đè chứ không lặp)
+app = Starlette(routes=routes, middleware=[
+    Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])
+])
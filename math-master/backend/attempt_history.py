@@ -0,0 +1,252 @@
+import base64
+import sys
+from array import array
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+# Mốc thời gian: completed_at là giờ địa phương không có múi giờ nên được
+# quy đổi như UTC để chuyển qua lại không bị lệch (DST...)
+_EPOCH = datetime(1970, 1, 1)
+
+_INT32_MIN, _INT32_MAX = -2 ** 31, 2 ** 31 - 1
+_INT64_MAX = 2 ** 63 - 1
+
+_FIELD_SETS: Dict[Tuple[str, ...], frozenset] = {}
+
+# Định dạng lưu trên đĩa của các cột (little-endian, base64)
+_COLUMNS = (('ts', 'd'), ('category', 'H'), ('score', 'i'), ('time_spent', 'i'), ('ids', 'q'))
+
+
+class AttemptHistory(Sequence):
+    """Lịch sử làm bài dạng cột: mỗi trường là một array song song.
+
+    - ts: epoch seconds (float, giữ được micro giây của completed_at)
+    - category: mã topic / game_type (tra trong bảng categories)
+    - score, time_spent: int32
+    - ids: exercise_id / session_id; số nguyên >= 0 lưu trực tiếp, chuỗi
+      được intern vào bảng labels và lưu thành -(mã + 1)
+
+    Bản ghi không khớp định dạng (thiếu/thừa trường, kiểu lạ...) được giữ
+    nguyên trong extras nên chuyển đổi luôn không mất dữ liệu. Truy cập theo
+    chỉ số / duyệt vẫn trả về dict như list cũ.
+
+    Dữ liệu nguồn (list dict của document lưu dạng 'list', hoặc bản mã hóa)
+    được giữ nguyên tới lần đọc/ghi đầu tiên rồi chuyển sang các cột, dù
+    document lưu theo định dạng nào; nguồn không bao giờ bị sửa nên list
+    trong cache không cần copy. len() không cần chuyển.
+    """
+
+    __slots__ = ('fields', 'id_field', 'category_field', '_field_set', 'ts', 'category', 'score',
+                 'time_spent', 'ids', 'categories', '_category_codes', 'labels', '_label_codes', 'extras',
+                 '_source')
+
+    def __init__(self, fields: Tuple[str, ...], id_field: str, category_field: str,
+                 source: Union[List[Dict[str, Any]], Dict[str, Any], None] = None):
+        self.fields = fields
+        self.id_field = id_field
+        self.category_field = category_field
+        self._field_set = _FIELD_SETS.get(fields) or _FIELD_SETS.setdefault(fields, frozenset(fields))
+        # Các cột chỉ được tạo khi cần (document vừa đọc thường chỉ cần len()),
+        # lịch sử mới bắt đầu như một list rỗng dùng chung
+        self._source = source if source is not None else ()
+
+    def _init_columns(self):
+        self.ts = array('d')
+        self.category = array('H')
+        self.score = array('i')
+        self.time_spent = array('i')
+        self.ids = array('q')
+        self.categories: List[str] = []
+        self._category_codes: Dict[str, int] = {}
+        self.labels: List[str] = []
+        self._label_codes: Dict[str, int] = {}
+        self.extras: Dict[int, Dict[str, Any]] = {}
+
+    @classmethod
+    def for_exercises(cls, source=None) -> 'AttemptHistory':
+        return cls(('exercise_id', 'score', 'topic', 'time_spent', 'completed_at'),
+                   'exercise_id', 'topic', source)
+
+    @classmethod
+    def for_games(cls, source=None) -> 'AttemptHistory':
+        return cls(('session_id', 'game_type', 'score', 'time_spent', 'completed_at'),
+                   'session_id', 'game_type', source)
+
+    @staticmethod
+    def is_encoded(value: Any) -> bool:
+        return isinstance(value, dict) and 'columns' in value
+
+    # ==================== LAZY SOURCE ====================
+    def _load(self):
+        """Chuyển dữ liệu nguồn sang các cột"""
+        source, self._source = self._source, None
+        if source is None:
+            return
+        self._init_columns()
+        if self.is_encoded(source):
+            self._decode(source)
+        else:
+            for record in source:
+                self.append(record)
+
+    def __len__(self) -> int:
+        source = self._source
+        if source is not None:
+            return source['count'] if self.is_encoded(source) else len(source)
+        return len(self.ts)
+
+    # ==================== WRITE ====================
+    def _code(self, value: str, table: List[str], codes: Dict[str, int]) -> int:
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(table)
+            table.append(value)
+        return code
+
+    def _columns_for(self, record: Dict[str, Any]) -> Optional[Tuple[float, str, int, int, int]]:
+        """Giá trị các cột của bản ghi, None nếu không biểu diễn chính xác được"""
+        if not isinstance(record, dict) or record.keys() != self._field_set:
+            return None
+        category, score, time_spent = record[self.category_field], record['score'], record['time_spent']
+        if not isinstance(category, str):
+            return None
+        for value in (score, time_spent):
+            if type(value) is not int or not _INT32_MIN <= value <= _INT32_MAX:
+                return None
+
+        exercise_id = record[self.id_field]
+        if type(exercise_id) is int:
+            if not 0 <= exercise_id <= _INT64_MAX:
+                return None
+            id_value = exercise_id
+        elif isinstance(exercise_id, str):
+            id_value = -(self._code(exercise_id, self.labels, self._label_codes) + 1)
+        else:
+            return None
+
+        completed_at = record['completed_at']
+        try:
+            when = datetime.fromisoformat(completed_at)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is not None or when.isoformat() != completed_at:
+            return None
+        ts = (when - _EPOCH) / timedelta(seconds=1)
+        if _EPOCH + timedelta(seconds=ts) != when:
+            return None
+        return ts, category, score, time_spent, id_value
+
+    def append(self, record: Dict[str, Any]):
+        if self._source is not None:
+            self._load()
+        columns = self._columns_for(record)
+        if columns is None:
+            self.extras[len(self.ts)] = dict(record) if isinstance(record, dict) else record
+            columns = (0.0, '', 0, 0, 0)
+        ts, category, score, time_spent, id_value = columns
+        self.ts.append(ts)
+        self.category.append(self._code(category, self.categories, self._category_codes))
+        self.score.append(score)
+        self.time_spent.append(time_spent)
+        self.ids.append(id_value)
+
+    def copy(self) -> 'AttemptHistory':
+        """Bản sao độc lập (copy array, không tạo dict cho từng bản ghi)"""
+        clone = AttemptHistory(self.fields, self.id_field, self.category_field, self._source)
+        if self._source is not None:
+            # Nguồn chỉ được đọc nên hai bản dùng chung được
+            return clone
+        clone._source = None
+        clone._init_columns()
+        for name, _ in _COLUMNS:
+            setattr(clone, name, array(getattr(self, name).typecode, getattr(self, name)))
+        clone.categories = list(self.categories)
+        clone._category_codes = dict(self._category_codes)
+        clone.labels = list(self.labels)
+        clone._label_codes = dict(self._label_codes)
+        clone.extras = dict(self.extras)
+        return clone
+
+    # ==================== READ ====================
+    def _record(self, i: int) -> Dict[str, Any]:
+        extra = self.extras.get(i)
+        if extra is not None:
+            return dict(extra) if isinstance(extra, dict) else extra
+        id_value = self.ids[i]
+        values = {
+            self.id_field: id_value if id_value >= 0 else self.labels[-id_value - 1],
+            self.category_field: self.categories[self.category[i]],
+            'score': self.score[i],
+            'time_spent': self.time_spent[i],
+            'completed_at': (_EPOCH + timedelta(seconds=self.ts[i])).isoformat()
+        }
+        return {field: values[field] for field in self.fields}
+
+    def __getitem__(self, index):
+        if self._source is not None:
+            self._load()
+        if isinstance(index, slice):
+            return [self._record(i) for i in range(*index.indices(len(self.ts)))]
+        if index < 0:
+            index += len(self.ts)
+        if not 0 <= index < len(self.ts):
+            raise IndexError('AttemptHistory index out of range')
+        return self._record(index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        if self._source is not None:
+            self._load()
+        for i in range(len(self.ts)):
+            yield self._record(i)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (AttemptHistory, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Dạng list dict như API trả về"""
+        return list(self)
+
+    def total_time_spent(self) -> int:
+        if self._source is not None:
+            self._load()
+        return sum(self.time_spent) + sum(extra.get('time_spent', 0) for extra in self.extras.values()
+                                          if isinstance(extra, dict))
+
+    # ==================== ON-DISK ENCODING ====================
+    def encode(self) -> Dict[str, Any]:
+        """Dạng lưu trong JSON: các cột là bytes little-endian mã hóa base64"""
+        source = self._source
+        if self.is_encoded(source):
+            return source
+        if source is not None:
+            self._load()
+        columns = {}
+        for name, _ in _COLUMNS:
+            column = getattr(self, name)
+            if sys.byteorder != 'little':
+                column = array(column.typecode, column)
+                column.byteswap()
+            columns[name] = base64.b64encode(column.tobytes()).decode('ascii')
+        return {
+            'count': len(self.ts),
+            'columns': columns,
+            'categories': self.categories,
+            'labels': self.labels,
+            'extras': {str(i): extra for i, extra in self.extras.items()}
+        }
+
+    def _decode(self, encoded: Dict[str, Any]):
+        for name, typecode in _COLUMNS:
+            column = array(typecode)
+            column.frombytes(base64.b64decode(encoded['columns'][name]))
+            if sys.byteorder != 'little':
+                column.byteswap()
+            setattr(self, name, column)
+        self.categories = list(encoded.get('categories', []))
+        self._category_codes = {value: i for i, value in enumerate(self.categories)}
+        self.labels = list(encoded.get('labels', []))
+        self._label_codes = {value: i for i, value in enumerate(self.labels)}
+        self.extras = {int(i): extra for i, extra in encoded.get('extras', {}).items()}
@@ -1,330 +1,920 @@
-import json
-import os
-import random
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-
-# Import các model
-from models import User, Exercise, Progress, Curriculum, create_sample_exercises, validate_user_data
-from config import Config
-
-class DatabaseManager:
-    def __init__(self):
-        self.config = Config
-        self.data_dir = self.config.DATA_DIR
-        self.users_file = self.config.USERS_FILE
-        self.progress_file = self.config.PROGRESS_FILE
-        self.exercises_file = self.config.EXERCISES_FILE
-        self.curriculum_file = self.config.CURRICULUM_FILE
-        self.game_sessions_file = self.config.GAME_SESSIONS_FILE
-        self.init_db()
-
-    def init_db(self):
-        """Khởi tạo database với dữ liệu mẫu"""
-        try:
-            os.makedirs(self.data_dir, exist_ok=True)
-            
-            self._init_users_file()
-            self._init_progress_file()
-            self._init_exercises_file()
-            self._init_curriculum_file()
-            self._init_game_sessions_file()
-            
-            print("✅ Database initialized successfully!")
-            
-        except Exception as e:
-            print(f"❌ Database initialization error: {e}")
-            raise
-
-    def _init_users_file(self):
-        """Khởi tạo file users"""
-        if not os.path.exists(self.users_file):
-            default_data = {
-                "admin": {
-                    "username": "admin",
-                    "password": "admin123",
-                    "user_type": "teacher",
-                    "created_at": datetime.now().isoformat(),
-                    "last_login": None,
-                    "progress": {}
-                },
-                "demo": {
-                    "username": "demo",
-                    "password": "demo123",
-                    "user_type": "student",
-                    "created_at": datetime.now().isoformat(),
-                    "last_login": None,
-                    "progress": {}
-                }
-            }
-            self._save_json(self.users_file, default_data)
-
-    def _init_progress_file(self):
-        """Khởi tạo file progress"""
-        if not os.path.exists(self.progress_file):
-            default_data = {
-                "demo": {
-                    "username": "demo",
-                    "completed_exercises": [
-                        {
-                            "exercise_id": 1,
-                            "score": 10,
-                            "topic": "numbers",
-                            "time_spent": 45,
-                            "completed_at": (datetime.now() - timedelta(days=1)).isoformat()
-                        }
-                    ],
-                    "game_sessions": [
-                        {
-                            "session_id": "game_1",
-                            "game_type": "number_race",
-                            "score": 80,
-                            "time_spent": 120,
-                            "completed_at": (datetime.now() - timedelta(hours=2)).isoformat()
-                        }
-                    ],
-                    "scores": {"numbers": 10, "games": 80},
-                    "weak_areas": ["geometry"],
-                    "strengths": ["numbers"],
-                    "last_updated": datetime.now().isoformat()
-                }
-            }
-            self._save_json(self.progress_file, default_data)
-
-    def _init_exercises_file(self):
-        """Khởi tạo file exercises"""
-        if not os.path.exists(self.exercises_file):
-            print("📝 Generating sample exercises...")
-            sample_exercises = create_sample_exercises()
-            exercises_data = [ex.to_dict() for ex in sample_exercises]
-            self._save_json(self.exercises_file, exercises_data)
-            print(f"✅ Created {len(exercises_data)} exercises")
-
-    def _init_curriculum_file(self):
-        """Khởi tạo file curriculum"""
-        if not os.path.exists(self.curriculum_file):
-            curriculum = Curriculum()
-            self._save_json(self.curriculum_file, curriculum.topics)
-
-    def _init_game_sessions_file(self):
-        """Khởi tạo file game sessions"""
-        if not os.path.exists(self.game_sessions_file):
-            self._save_json(self.game_sessions_file, {})
-
-    def _save_json(self, file_path: str, data: Any):
-        """Lưu dữ liệu vào file JSON"""
-        try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"❌ Error saving to {file_path}: {e}")
-
-    def _load_json(self, file_path: str) -> Any:
-        """Tải dữ liệu từ file JSON"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return None
-        except Exception as e:
-            print(f"❌ Error loading from {file_path}: {e}")
-            return None
-
-    # USER MANAGEMENT
-    def save_user(self, user_data: Dict[str, Any]) -> bool:
-        """Lưu user mới"""
-        try:
-            users = self._load_json(self.users_file) or {}
-            
-            if not validate_user_data(user_data):
-                return False
-            
-            if user_data['username'] in users:
-                return False
-            
-            user = User(
-                username=user_data['username'],
-                password=user_data['password'],
-                user_type=user_data.get('user_type', 'student')
-            )
-            
-            users[user_data['username']] = user.to_dict()
-            self._save_json(self.users_file, users)
-            
-            self.init_user_progress(user_data['username'])
-            print(f"✅ User {user_data['username']} registered successfully!")
-            return True
-            
-        except Exception as e:
-            print(f"❌ Error saving user: {e}")
-            return False
-
-    def get_user(self, username: str) -> Optional[User]:
-        """Lấy thông tin user"""
-        try:
-            users = self._load_json(self.users_file) or {}
-            user_data = users.get(username)
-            
-            if user_data:
-                return User.from_dict(user_data)
-            return None
-            
-        except Exception as e:
-            print(f"❌ Error getting user: {e}")
-            return None
-
-    def update_user_last_login(self, username: str) -> bool:
-        """Cập nhật thời gian đăng nhập cuối"""
-        try:
-            users = self._load_json(self.users_file) or {}
-            
-            if username in users:
-                users[username]['last_login'] = datetime.now().isoformat()
-                self._save_json(self.users_file, users)
-                return True
-            return False
-            
-        except Exception as e:
-            print(f"❌ Error updating last login: {e}")
-            return False
-
-    # PROGRESS MANAGEMENT
-    def init_user_progress(self, username: str) -> bool:
-        """Khởi tạo progress cho user mới"""
-        try:
-            progress_data = self._load_json(self.progress_file) or {}
-            
-            if username not in progress_data:
-                progress = Progress(username=username)
-                progress_data[username] = progress.to_dict()
-                self._save_json(self.progress_file, progress_data)
-                return True
-            return False
-            
-        except Exception as e:
-            print(f"❌ Error initializing user progress: {e}")
-            return False
-
-    def update_progress(self, username: str, exercise_id: str, score: int, 
-                       time_spent: int, topic: str = 'general') -> bool:
-        """Cập nhật tiến độ học tập"""
-        try:
-            progress_data = self._load_json(self.progress_file) or {}
-            
-            if username not in progress_data:
-                self.init_user_progress(username)
-                progress_data = self._load_json(self.progress_file) or {}
-            
-            user_progress = progress_data.get(username, {})
-            progress = Progress.from_dict(user_progress)
-            
-            if exercise_id.startswith('game'):
-                progress.add_game_session(
-                    game_type=topic,
-                    score=score,
-                    time_spent=time_spent
-                )
-            else:
-                progress.add_completed_exercise(
-                    exercise_id=exercise_id,
-                    score=score,
-                    topic=topic,
-                    time_spent=time_spent
-                )
-            
-            progress_data[username] = progress.to_dict()
-            self._save_json(self.progress_file, progress_data)
-            
-            print(f"✅ Progress updated for {username}: +{score} points")
-            return True
-            
-        except Exception as e:
-            print(f"❌ Error updating progress: {e}")
-            return False
-
-    def get_progress(self, username: str) -> Progress:
-        """Lấy tiến độ học tập"""
-        try:
-            progress_data = self._load_json(self.progress_file) or {}
-            user_progress = progress_data.get(username, {})
-            
-            if user_progress:
-                return Progress.from_dict(user_progress)
-            else:
-                return Progress(username=username)
-                
-        except Exception as e:
-            print(f"❌ Error getting progress: {e}")
-            return Progress(username=username)
-
-    # EXERCISE MANAGEMENT
-    def get_exercises_by_topic(self, topic: str = 'all', limit: int = 20) -> List[Exercise]:
-        """Lấy bài tập theo chủ đề"""
-        try:
-            exercises_data = self._load_json(self.exercises_file) or []
-            
-            if topic != 'all':
-                exercises_data = [ex for ex in exercises_data if ex.get('topic') == topic]
-            
-            random.shuffle(exercises_data)
-            exercises_data = exercises_data[:limit]
-            
-            return [Exercise.from_dict(ex) for ex in exercises_data]
-            
-        except Exception as e:
-            print(f"❌ Error getting exercises: {e}")
-            return []
-
-    def get_exercise_by_id(self, exercise_id: int) -> Optional[Exercise]:
-        """Lấy bài tập theo ID"""
-        try:
-            exercises_data = self._load_json(self.exercises_file) or []
-            
-            for ex_data in exercises_data:
-                if ex_data['id'] == exercise_id:
-                    return Exercise.from_dict(ex_data)
-            return None
-            
-        except Exception as e:
-            print(f"❌ Error getting exercise by ID: {e}")
-            return None
-
-    # CURRICULUM MANAGEMENT
-    def get_curriculum(self) -> Curriculum:
-        """Lấy chương trình học"""
-        try:
-            curriculum_data = self._load_json(self.curriculum_file) or []
-            return Curriculum(topics=curriculum_data)
-        except Exception as e:
-            print(f"❌ Error getting curriculum: {e}")
-            return Curriculum()
-
-    # LEADERBOARD
-    def get_leaderboard(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Lấy bảng xếp hạng"""
-        try:
-            progress_data = self._load_json(self.progress_file) or {}
-            leaderboard = []
-            
-            for username, data in progress_data.items():
-                progress = Progress.from_dict(data)
-                total_score = progress.get_total_score()
-                games_played = len(progress.game_sessions)
-                
-                leaderboard.append({
-                    'username': username,
-                    'total_score': total_score,
-                    'games_played': games_played,
-                    'exercises_completed': len(progress.completed_exercises),
-                    'study_time': progress.get_study_time()
-                })
-            
-            leaderboard.sort(key=lambda x: x['total_score'], reverse=True)
-            return leaderboard[:limit]
-            
-        except Exception as e:
-            print(f"❌ Error getting leaderboard: {e}")
-            return []
-
-# Khởi tạo global instance
-db_manager = DatabaseManager()
\ No newline at end of file
+import json
+import os
+import random
+import threading
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+
+# Import các model
+from models import User, Exercise, Progress, Curriculum, create_sample_exercises, validate_user_data
+from config import Config
+from json_cache import JSONFileCache
+from json_writer import JSONFileWriter
+from progress_log import ProgressEventLog
+from progress_store import JSONProgressStore, ShardedProgressStore, progress_summary
+from locks import FileLock, StripedLocks
+import serializers
+from leaderboard import LeaderboardIndex, window_start
+from exercise_index import ExerciseIndex
+from exercise_bank import ExerciseBank
+from mock_test_store import MockTestStore
+from user_meta import UserMetaBuffer
+from snapshot import SnapshotReader, file_signature, write_snapshot
+
+# Lịch sử trong document tiến độ đọc theo trang: tên API -> (trường của Progress, loại rollup)
+# (mock_tests đọc từ MockTestStore)
+HISTORY_KINDS = {'attempts': ('completed_exercises', 'exercises'), 'games': ('game_sessions', 'games')}
+
+class DatabaseManager:
+    def __init__(self):
+        self.config = Config
+        self.data_dir = self.config.DATA_DIR
+        self.users_file = self.config.USERS_FILE
+        self.progress_file = self.config.PROGRESS_FILE
+        self.exercises_file = self.config.EXERCISES_FILE
+        self.curriculum_file = self.config.CURRICULUM_FILE
+        self.game_sessions_file = self.config.GAME_SESSIONS_FILE
+        self.cache = JSONFileCache() if self.config.JSON_CACHE_ENABLED else None
+        self.writer = JSONFileWriter(
+            mode=self.config.JSON_WRITE_MODE,
+            window=self.config.JSON_WRITE_BATCH_WINDOW,
+            on_written=self._on_json_written
+        )
+        self.locks = StripedLocks(self.config.LOCK_DIR, self.config.LOCK_STRIPES)
+        self.progress_store = None
+        self.progress_log = None
+        self.mock_tests: Optional[MockTestStore] = None
+        self.user_meta: Optional[UserMetaBuffer] = None
+        if self.config.USER_META_FLUSH_INTERVAL > 0:
+            self.user_meta = UserMetaBuffer(self._write_user_meta, self.config.USER_META_FLUSH_INTERVAL)
+        self.leaderboard = LeaderboardIndex()
+        self._exercises: Optional[ExerciseIndex] = None
+        self._bank: Optional[ExerciseBank] = None
+        self._bank_signature = None
+        self.snapshot: Optional[SnapshotReader] = None
+        # File JSON -> section của snapshot dùng khi khởi động (progress chia
+        # shard thì đã đọc được theo từng user nên không cần)
+        self._snapshot_files = {
+            self.users_file: 'users',
+            self.exercises_file: 'exercises',
+            self.curriculum_file: 'curriculum',
+            self.game_sessions_file: 'game_sessions'
+        }
+        if self.config.PROGRESS_LAYOUT != 'sharded':
+            self._snapshot_files[self.progress_file] = 'progress'
+        self.init_db()
+
+    def init_db(self):
+        """Khởi tạo database với dữ liệu mẫu"""
+        try:
+            os.makedirs(self.data_dir, exist_ok=True)
+            if self.config.SNAPSHOT_ENABLED:
+                self.snapshot = SnapshotReader.open(self.config.SNAPSHOT_FILE)
+            
+            self._init_users_file()
+            self._init_progress_file()
+            self._init_exercises_file()
+            self._init_curriculum_file()
+            self._init_game_sessions_file()
+            self._init_progress_store()
+            self._migrate_progress_aggregates()
+            # MockTestStore trước log: khôi phục log (compact dở) có thể gộp sự kiện mock_test
+            self._init_mock_test_store()
+            self._init_progress_log()
+            self.leaderboard.rebuild(self._load_progress_summaries)
+            self._refresh_snapshot_in_background()
+            
+            print("✅ Database initialized successfully!")
+            
+        except Exception as e:
+            print(f"❌ Database initialization error: {e}")
+            raise
+
+    def _init_users_file(self):
+        """Khởi tạo file users"""
+        if not os.path.exists(self.users_file):
+            default_data = {
+                "admin": {
+                    "username": "admin",
+                    "password": "admin123",
+                    "user_type": "teacher",
+                    "created_at": datetime.now().isoformat(),
+                    "last_login": None,
+                    "progress": {}
+                },
+                "demo": {
+                    "username": "demo",
+                    "password": "demo123",
+                    "user_type": "student",
+                    "created_at": datetime.now().isoformat(),
+                    "last_login": None,
+                    "progress": {}
+                }
+            }
+            self._save_json(self.users_file, default_data)
+
+    def _init_progress_file(self):
+        """Khởi tạo file progress"""
+        if not os.path.exists(self.progress_file):
+            default_data = {
+                "demo": {
+                    "username": "demo",
+                    "completed_exercises": [
+                        {
+                            "exercise_id": 1,
+                            "score": 10,
+                            "topic": "numbers",
+                            "time_spent": 45,
+                            "completed_at": (datetime.now() - timedelta(days=1)).isoformat()
+                        }
+                    ],
+                    "game_sessions": [
+                        {
+                            "session_id": "game_1",
+                            "game_type": "number_race",
+                            "score": 80,
+                            "time_spent": 120,
+                            "completed_at": (datetime.now() - timedelta(hours=2)).isoformat()
+                        }
+                    ],
+                    "scores": {"numbers": 10, "games": 80},
+                    "weak_areas": ["geometry"],
+                    "strengths": ["numbers"],
+                    "last_updated": datetime.now().isoformat()
+                }
+            }
+            self._save_json(self.progress_file, default_data)
+
+    def _init_exercises_file(self):
+        """Khởi tạo file exercises"""
+        if not os.path.exists(self.exercises_file):
+            print("📝 Generating sample exercises...")
+            sample_exercises = create_sample_exercises()
+            exercises_data = [ex.to_dict() for ex in sample_exercises]
+            self._save_json(self.exercises_file, exercises_data)
+            print(f"✅ Created {len(exercises_data)} exercises")
+
+    def _init_curriculum_file(self):
+        """Khởi tạo file curriculum"""
+        if not os.path.exists(self.curriculum_file):
+            curriculum = Curriculum()
+            self._save_json(self.curriculum_file, curriculum.topics)
+
+    def _init_game_sessions_file(self):
+        """Khởi tạo file game sessions"""
+        if not os.path.exists(self.game_sessions_file):
+            self._save_json(self.game_sessions_file, {})
+
+    def _save_json(self, file_path: str, data: Any):
+        """Lưu dữ liệu vào file JSON (ghi atomic qua writer, write-through qua cache)"""
+        try:
+            version = self.cache.store(file_path, data) if self.cache else None
+            self.writer.write(file_path, data, token=version)
+        except Exception as e:
+            if self.cache:
+                self.cache.invalidate(file_path)
+            print(f"❌ Error saving to {file_path}: {e}")
+            # Báo lỗi cho nơi gọi (request trả lỗi thay vì báo đã lưu)
+            raise
+
+    def _on_json_written(self, file_path: str, version: Optional[int]):
+        """Writer báo file đã xuống đĩa"""
+        if self.cache and version is not None:
+            self.cache.confirm(file_path, version)
+
+    def _load_json(self, file_path: str) -> Any:
+        """Tải dữ liệu từ file JSON (qua cache nếu được bật)"""
+        if self.cache:
+            return self.cache.load(file_path, self._read_json_file)
+        return self._read_json_file(file_path)
+
+    def _read_json_file(self, file_path: str) -> Any:
+        """Đọc file JSON: từ snapshot nếu section còn khớp file, ngược lại parse file"""
+        section = self._fresh_snapshot_section(file_path)
+        if section is not None:
+            try:
+                return self.snapshot.load(section)
+            except Exception as e:
+                print(f"⚠️ Snapshot section {section} unreadable: {e}")
+        return self._parse_json_file(file_path)
+
+    def _load_json_record(self, file_path: str, key: str) -> Any:
+        """Một key của file JSON dạng dict. File chưa được nạp vào cache mà
+        snapshot còn khớp thì chỉ giải mã key đó thay vì parse cả file."""
+        if self.cache is None or file_path not in self.cache:
+            section = self._fresh_snapshot_section(file_path)
+            if section is not None:
+                try:
+                    return self.snapshot.get(section, key)[1]
+                except Exception as e:
+                    print(f"⚠️ Snapshot section {section} unreadable: {e}")
+        return (self._load_json(file_path) or {}).get(key)
+
+    def _parse_json_file(self, file_path: str) -> Any:
+        """Đọc và parse file JSON từ đĩa"""
+        try:
+            with open(file_path, 'rb') as f:
+                return serializers.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError as e:
+            print(f"❌ Corrupt JSON in {file_path}: {e}")
+            return None
+        except Exception as e:
+            print(f"❌ Error loading from {file_path}: {e}")
+            return None
+
+    # USER MANAGEMENT
+    def save_user(self, user_data: Dict[str, Any]) -> bool:
+        """Lưu user mới"""
+        try:
+            if not validate_user_data(user_data):
+                return False
+            
+            with self.locks.hold(self.users_file):
+                users = self._load_json(self.users_file) or {}
+                
+                if user_data['username'] in users:
+                    return False
+                
+                user = User(
+                    username=user_data['username'],
+                    password=user_data['password'],
+                    user_type=user_data.get('user_type', 'student')
+                )
+                
+                users[user_data['username']] = user.to_dict()
+                self._save_json(self.users_file, users)
+            
+            self.init_user_progress(user_data['username'])
+            print(f"✅ User {user_data['username']} registered successfully!")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error saving user: {e}")
+            return False
+
+    def get_user(self, username: str) -> Optional[User]:
+        """Lấy thông tin user"""
+        try:
+            if self.user_meta:
+                user_data = self.user_meta.load_user(username, lambda: self._load_json_record(self.users_file, username))
+            else:
+                user_data = self._load_json_record(self.users_file, username)
+            
+            if user_data:
+                return User.from_dict(user_data)
+            return None
+            
+        except Exception as e:
+            print(f"❌ Error getting user: {e}")
+            return None
+
+    def update_user_last_login(self, username: str) -> bool:
+        """Cập nhật thời gian đăng nhập cuối (ghi trễ qua user_meta nếu được bật)"""
+        try:
+            now = datetime.now().isoformat()
+            if self.user_meta:
+                self.user_meta.record_login(username, now)
+                return True
+            return self._write_user_meta({username: {'last_login': now, 'login_count': 1}}) > 0
+            
+        except Exception as e:
+            print(f"❌ Error updating last login: {e}")
+            return False
+
+    def _write_user_meta(self, updates: Dict[str, Dict[str, Any]]) -> int:
+        """Ghi last_login / login_count của nhiều user bằng một lần ghi users.json"""
+        with self.locks.hold(self.users_file):
+            users = dict(self._load_json(self.users_file) or {})
+            updated = 0
+            for username, meta in updates.items():
+                user_data = users.get(username)
+                if user_data is None:
+                    continue
+                users[username] = {
+                    **user_data,
+                    'last_login': max(user_data.get('last_login') or '', meta['last_login']),
+                    'login_count': user_data.get('login_count', 0) + meta['login_count']
+                }
+                updated += 1
+            if updated:
+                self._save_json(self.users_file, users)
+            return updated
+
+    # PROGRESS MANAGEMENT
+    def _init_progress_store(self):
+        """Chọn layout lưu tiến độ: một file progress.json hoặc chia shard theo user"""
+        if self.config.PROGRESS_LAYOUT != 'sharded':
+            self.progress_store = JSONProgressStore(
+                self.progress_file, self._load_json, self._save_json,
+                load_record=self._load_json_record, load_summaries=self._snapshot_progress_summaries
+            )
+            return
+
+        self.progress_store = ShardedProgressStore(
+            self.config.PROGRESS_DIR, self.config.PROGRESS_SHARDS, self._load_json, self._save_json
+        )
+        with self.locks.hold(self.progress_file):
+            if self.progress_store.is_empty():
+                # Chuyển dữ liệu từ progress.json sang layout shard (lần đầu)
+                progress_data = self._load_json(self.progress_file) or {}
+                docs = {username: doc for username, doc in progress_data.items()
+                        if isinstance(doc, dict) and 'username' in doc}
+                self.progress_store.put_many(docs)
+                print(f"✅ Migrated {len(docs)} progress records to {self.config.PROGRESS_DIR}")
+
+    def _migrate_progress_aggregates(self):
+        """Bổ sung số liệu cộng dồn (study_time, số lần làm/đúng theo chủ đề...)
+        cho các document tiến độ được ghi trước khi có các trường này"""
+        if self._snapshot_progress_meta().get('needs_migration') == 0:
+            return  # progress.json chưa đổi từ lúc export và không còn document cũ
+        usernames = [username for username, doc in self.progress_store.all().items()
+                     if isinstance(doc, dict) and 'username' in doc and Progress.needs_migration(doc)]
+        if not usernames:
+            return
+        with self.locks.hold(*{self.progress_store.lock_key(username) for username in usernames}):
+            docs = {}
+            for username in usernames:
+                doc = self.progress_store.get(username)
+                if doc and Progress.needs_migration(doc):
+                    # Giữ các trường ngoài Progress (log_seq...)
+                    docs[username] = self._merge_progress_doc(doc, Progress.from_dict(doc))
+            if docs:
+                self.progress_store.put_many(docs)
+                print(f"✅ Backfilled progress aggregates for {len(docs)} users")
+
+    def _init_mock_test_store(self):
+        """Store riêng cho kết quả thi thử; lần đầu chuyển mock_tests cũ ra khỏi progress"""
+        self.mock_tests = MockTestStore(
+            self.config.MOCK_TEST_DIR, self.config.MOCK_TEST_CAPACITY, self.config.MOCK_TEST_SHARDS,
+            self.config.MOCK_TEST_KEEP_SHEETS, self._load_json, self._save_json
+        )
+        if self.mock_tests.is_migrated():
+            return
+        usernames = [username for username, doc in self.progress_store.all().items()
+                     if isinstance(doc, dict) and 'mock_tests' in doc]
+        with self.locks.hold(*{self.progress_store.lock_key(username) for username in usernames},
+                             *{self.mock_tests.lock_key(username) for username in usernames}):
+            for username in usernames:
+                doc = self.progress_store.get(username)
+                # Lần chuyển trước bị dừng giữa chừng: bỏ các bài đã có trong store
+                moved = {record.get('completed_at')
+                         for record in self.mock_tests.recent(username, self.mock_tests.capacity)}
+                tests = [test for test in doc.get('mock_tests') or [] if test.get('completed_at') not in moved]
+                if tests:
+                    self.mock_tests.append_many(username, [(test, test.get('completed_at')) for test in tests])
+                self.progress_store.put(username, {key: value for key, value in doc.items() if key != 'mock_tests'})
+        self.mock_tests.mark_migrated()
+        if usernames:
+            print(f"✅ Moved mock tests of {len(usernames)} users to {self.config.MOCK_TEST_DIR}")
+
+    def _init_progress_log(self):
+        """Bật log sự kiện tiến độ (append-only) nếu được cấu hình"""
+        if not self.config.PROGRESS_LOG_ENABLED:
+            return
+        start_seq = self._snapshot_progress_meta().get('log_seq')
+        if start_seq is None:
+            progress_data = self.progress_store.all()
+            start_seq = max((doc.get('log_seq', 0) for doc in progress_data.values() if isinstance(doc, dict)),
+                            default=0)
+        self.progress_log = ProgressEventLog(
+            self.config.PROGRESS_LOG_FILE,
+            fold=self._fold_progress_events,
+            start_seq=start_seq,
+            compact_interval=self.config.PROGRESS_LOG_COMPACT_INTERVAL,
+            compact_events=self.config.PROGRESS_LOG_COMPACT_EVENTS
+        )
+
+    def _merge_progress_doc(self, doc: Dict[str, Any], progress: Progress) -> Dict[str, Any]:
+        """Ghi các trường của Progress vào document, giữ các trường khác (log_seq...).
+        Lịch sử làm bài được lưu dạng list hoặc dạng cột theo PROGRESS_HISTORY_FORMAT."""
+        stored = progress.to_storage_dict(columnar=self.config.PROGRESS_HISTORY_FORMAT == 'columnar')
+        # Bỏ lịch sử ở định dạng còn lại (khi đổi PROGRESS_HISTORY_FORMAT)
+        stale = (set(Progress.HISTORY_KEYS) | set(Progress.HISTORY_KEYS.values())) - stored.keys()
+        merged = {key: value for key, value in doc.items() if key not in stale}
+        merged.update(stored)
+        return merged
+
+    def _apply_progress_events(self, user_doc: Optional[Dict[str, Any]],
+                               events: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Áp dụng các sự kiện tiến độ (theo thứ tự) lên document của user (không sửa document gốc)"""
+        doc = dict(user_doc) if user_doc else {}
+        if 'username' not in doc:
+            doc = self._merge_progress_doc(doc, Progress(username=events[0]['username']))
+
+        progress = None
+        for event in events:
+            if event['type'] in ('exercise', 'game'):
+                if progress is None:
+                    # Lịch sử làm bài không sửa list/bản mã hóa gốc nên không cần copy
+                    progress = Progress.from_dict(doc)
+                    progress.scores = dict(progress.scores)
+                    progress.daily_scores = dict(progress.daily_scores)
+                    progress.attempts_by_topic = dict(progress.attempts_by_topic)
+                    progress.correct_by_topic = dict(progress.correct_by_topic)
+                    progress.passed_by_topic = dict(progress.passed_by_topic)
+                    progress.version_marks = list(progress.version_marks)
+                if event['type'] == 'game':
+                    progress.add_game_session(
+                        game_type=event['game_type'],
+                        score=event['score'],
+                        time_spent=event['time_spent'],
+                        completed_at=event['ts']
+                    )
+                else:
+                    progress.add_completed_exercise(
+                        exercise_id=event['exercise_id'],
+                        score=event['score'],
+                        topic=event['topic'],
+                        time_spent=event['time_spent'],
+                        completed_at=event['ts']
+                    )
+
+            if 'seq' in event:
+                doc['log_seq'] = event['seq']
+
+        if progress is not None:
+            self._roll_up_history(progress)
+            doc = self._merge_progress_doc(doc, progress)
+        return doc
+
+    def _rollup_cutoff(self) -> Optional[str]:
+        """Ngày đầu tiên còn giữ lịch sử chi tiết, None nếu không gộp.
+        Gộp theo ngày nên mỗi user chỉ gộp tối đa một lần mỗi ngày"""
+        days = self.config.PROGRESS_RAW_RETENTION_DAYS
+        if days <= 0:
+            return None
+        return (datetime.now() - timedelta(days=days)).date().isoformat()
+
+    def _roll_up_history(self, progress: Progress) -> int:
+        """Gộp lịch sử cũ hơn PROGRESS_RAW_RETENTION_DAYS ngày vào rollups"""
+        cutoff = self._rollup_cutoff()
+        return progress.roll_up(cutoff) if cutoff else 0
+
+    @staticmethod
+    def _group_events(events: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        by_user: Dict[str, List[Dict[str, Any]]] = {}
+        for event in events:
+            by_user.setdefault(event['username'], []).append(event)
+        return by_user
+
+    def _fold_progress_events(self, events: List[Dict[str, Any]]):
+        """Gộp các sự kiện từ log vào snapshot (progress store)"""
+        by_user = self._group_events(events)
+        # Sự kiện mock_test còn trong log từ trước khi có MockTestStore được chuyển sang store
+        mock_users = {username for username, user_events in by_user.items()
+                      if any(event['type'] == 'mock_test' for event in user_events)}
+        with self.locks.hold(*{self.progress_store.lock_key(username) for username in by_user},
+                             *{self.mock_tests.lock_key(username) for username in mock_users}):
+            docs: Dict[str, Any] = {}
+            for username, user_events in by_user.items():
+                user_doc = self.progress_store.get(username)
+                applied = user_doc.get('log_seq', 0) if user_doc else 0
+                # Bỏ các sự kiện đã gộp ở lần compact trước
+                pending = [event for event in user_events if event['seq'] > applied]
+                tests = [(event['test_result'], event['ts']) for event in pending if event['type'] == 'mock_test']
+                if tests:
+                    self.mock_tests.append_many(username, tests)
+                if pending:
+                    docs[username] = self._apply_progress_events(user_doc, pending)
+            if docs:
+                self.progress_store.put_many(docs)
+
+    def _record_progress_event(self, event_type: str, username: str, **data):
+        """Ghi một sự kiện tiến độ"""
+        self._record_progress_events([(event_type, username, data)])
+
+    def _record_progress_events(self, entries: List[tuple]):
+        """Ghi các sự kiện (event_type, username, data): append vào log nếu bật,
+        ngược lại cập nhật progress store bằng một lần ghi cho cả batch"""
+        if self.progress_log:
+            events = self.progress_log.append_many(entries)
+            for username in self._group_events(events):
+                user_doc = self._get_user_progress_data(username)
+                self.leaderboard.update(username, progress_summary(user_doc), user_doc.get('version', 0))
+            return
+        now = datetime.now().isoformat()
+        events = [{'type': event_type, 'username': username, 'ts': now, **data}
+                  for event_type, username, data in entries]
+        by_user = self._group_events(events)
+        with self.locks.hold(*{self.progress_store.lock_key(username) for username in by_user}):
+            docs = {username: self._apply_progress_events(self.progress_store.get(username), user_events)
+                    for username, user_events in by_user.items()}
+            self.progress_store.put_many(docs)
+            for username, user_doc in docs.items():
+                self.leaderboard.update(username, progress_summary(user_doc), user_doc.get('version', 0))
+
+    def _get_user_progress_data(self, username: str) -> Optional[Dict[str, Any]]:
+        """Document tiến độ của user = snapshot + các sự kiện chưa gộp"""
+        # Lấy sự kiện trước snapshot: worker khác gộp xong giữa hai bước thì
+        # snapshot đã có chúng và bộ lọc log_seq bỏ phần trùng
+        events = self.progress_log.events_for(username) if self.progress_log else []
+        user_doc = self.progress_store.get(username)
+        if self.progress_log:
+            applied = user_doc.get('log_seq', 0) if user_doc else 0
+            pending = [event for event in events if event['seq'] > applied]
+            if pending:
+                user_doc = self._apply_progress_events(user_doc, pending)
+        return user_doc
+
+    def _load_progress_summaries(self) -> Dict[str, Dict[str, Any]]:
+        """Số liệu tóm tắt của mọi user (đã tính cả phần log chưa gộp)"""
+        summaries = self.progress_store.summaries()
+        if self.progress_log:
+            summaries = dict(summaries)
+            for username in self.progress_log.pending_usernames():
+                summaries[username] = progress_summary(self._get_user_progress_data(username))
+        return summaries
+
+    def init_user_progress(self, username: str) -> bool:
+        """Khởi tạo progress cho user mới"""
+        try:
+            if self._get_user_progress_data(username) is None:
+                self._record_progress_event('init', username)
+                return True
+            return False
+            
+        except Exception as e:
+            print(f"❌ Error initializing user progress: {e}")
+            return False
+
+    @staticmethod
+    def _attempt_event(exercise_id: Any, score: int, time_spent: int, topic: str) -> tuple:
+        """(loại sự kiện, dữ liệu) của một lượt làm bài hoặc chơi game"""
+        if str(exercise_id).startswith('game'):
+            return 'game', {'game_type': topic, 'score': score, 'time_spent': time_spent}
+        return 'exercise', {'exercise_id': exercise_id, 'score': score, 'topic': topic, 'time_spent': time_spent}
+
+    def update_progress(self, username: str, exercise_id: str, score: int, 
+                       time_spent: int, topic: str = 'general') -> bool:
+        """Cập nhật tiến độ học tập"""
+        try:
+            event_type, data = self._attempt_event(exercise_id, score, time_spent, topic)
+            self._record_progress_event(event_type, username, **data)
+            
+            print(f"✅ Progress updated for {username}: +{score} points")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error updating progress: {e}")
+            return False
+
+    def update_progress_batch(self, attempts: List[Dict[str, Any]]) -> bool:
+        """Cập nhật nhiều lượt làm bài (của một hoặc nhiều user) bằng một lần ghi.
+        attempts đã qua parse_progress_attempt; completed_at None = thời điểm hiện tại"""
+        try:
+            entries = []
+            for attempt in attempts:
+                event_type, data = self._attempt_event(attempt['exercise_id'], attempt['score'],
+                                                       attempt['time_spent'], attempt['topic'])
+                if attempt.get('completed_at'):
+                    data['ts'] = attempt['completed_at']
+                entries.append((event_type, attempt['username'], data))
+            if entries:
+                self._record_progress_events(entries)
+
+            print(f"✅ Progress batch applied: {len(entries)} attempts")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error updating progress batch: {e}")
+            return False
+
+    def get_progress(self, username: str) -> Progress:
+        """Lấy tiến độ học tập"""
+        try:
+            user_progress = self._get_user_progress_data(username)
+            
+            if user_progress:
+                return Progress.from_dict(user_progress)
+            else:
+                return Progress(username=username)
+                
+        except Exception as e:
+            print(f"❌ Error getting progress: {e}")
+            return Progress(username=username)
+
+    def get_progress_changes(self, username: str, since: int) -> Optional[Dict[str, Any]]:
+        """Thay đổi tiến độ sau version since (None nếu không có gì mới)"""
+        return self.get_progress(username).changes_since(since)
+
+    # MOCK TEST HISTORY
+    def save_mock_test_result(self, username: str, test_result: Dict[str, Any]) -> bool:
+        """Lưu kết quả thi thử (giữ MOCK_TEST_CAPACITY bài gần nhất)"""
+        try:
+            with self.locks.hold(self.mock_tests.lock_key(username)):
+                self.mock_tests.append(username, test_result, datetime.now().isoformat())
+            return True
+
+        except Exception as e:
+            print(f"❌ Error saving mock test: {e}")
+            return False
+
+    def get_mock_test_history(self, username: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Lấy lịch sử thi thử gần nhất"""
+        try:
+            return self.mock_tests.recent(username, limit)
+        except Exception as e:
+            print(f"❌ Error getting mock tests: {e}")
+            return []
+
+    def get_mock_test_sheet(self, username: str, test_id: str) -> Optional[Dict[str, Any]]:
+        """Một bài thi đầy đủ, kèm bài làm chi tiết nếu được giữ"""
+        try:
+            return self.mock_tests.get_sheet(username, test_id)
+        except Exception as e:
+            print(f"❌ Error getting mock test sheet: {e}")
+            return None
+
+    # PROGRESS SUMMARY & HISTORY PAGES
+    def get_progress_summary(self, username: str) -> Dict[str, Any]:
+        """Số liệu tổng hợp của user (không kèm lịch sử làm bài)"""
+        try:
+            user_doc = self._get_user_progress_data(username)
+            progress = Progress.from_dict(user_doc) if user_doc else Progress(username=username)
+            summary = progress.to_summary_dict()
+            summary['mock_tests_taken'] = self.mock_tests.count(username)
+            return summary
+        except Exception as e:
+            print(f"❌ Error getting progress summary: {e}")
+            return {**Progress(username=username).to_summary_dict(), 'mock_tests_taken': 0}
+
+    def get_history_page(self, username: str, kind: str, cursor: Optional[int] = None,
+                         limit: int = 20) -> Dict[str, Any]:
+        """Một trang lịch sử (mới nhất trước). cursor là next_cursor của trang
+        trước (None = trang đầu); next_cursor None khi đã hết"""
+        try:
+            if kind == 'mock_tests':
+                items, next_cursor = self.mock_tests.page(username, cursor, limit)
+                return {'items': items, 'next_cursor': next_cursor}
+            user_doc = self._get_user_progress_data(username) or {}
+            field, rollup_kind = HISTORY_KINDS[kind]
+            records = Progress.history_from_dict(user_doc, field)
+            # cursor = vị trí (không gồm) của bản ghi cũ nhất đã trả về, tính cả
+            # phần đã gộp vào rollups nên không đổi khi lịch sử được gộp bớt
+            rolled = user_doc.get('rollups', {}).get(rollup_kind, {}).get('count', 0)
+            end = len(records) if cursor is None else max(min(cursor - rolled, len(records)), 0)
+            start = max(end - limit, 0)
+            return {'items': records[start:end][::-1], 'next_cursor': start + rolled if start > 0 else None}
+        except Exception as e:
+            print(f"❌ Error getting {kind} page: {e}")
+            return {'items': [], 'next_cursor': None}
+
+    # EXERCISE MANAGEMENT
+    def _exercise_index(self) -> ExerciseIndex:
+        """Index bài tập, dựng lại khi exercises.json thay đổi (cache trả về list mới)"""
+        exercises_data = self._load_json(self.exercises_file) or []
+        index = self._exercises
+        if index is None or index.source is not exercises_data:
+            index = ExerciseIndex(exercises_data)
+            self._exercises = index
+        return index
+
+    def _exercise_bank(self) -> Optional[ExerciseBank]:
+        """Bank bài tập mmap, mở lại khi .meta.json đổi (vừa sinh thêm bài)"""
+        signature = file_signature(self.config.EXERCISE_BANK_FILE + '.meta.json')
+        if signature != self._bank_signature:
+            self._bank = ExerciseBank.open(self.config.EXERCISE_BANK_FILE) if signature else None
+            self._bank_signature = signature
+        return self._bank
+
+    def _exercise_source(self):
+        """Bank mmap nếu đã tạo, ngược lại index của exercises.json"""
+        bank = self._exercise_bank()
+        return bank if bank is not None and len(bank) else self._exercise_index()
+
+    def get_exercises_by_topic(self, topic: str = 'all', limit: int = 20,
+                               difficulty: Optional[str] = None) -> List[Exercise]:
+        """Lấy bài tập theo chủ đề (và độ khó)"""
+        try:
+            exercises_data = self._exercise_source().sample(topic, difficulty, limit)
+            return [Exercise.from_dict(ex) for ex in exercises_data]
+            
+        except Exception as e:
+            print(f"❌ Error getting exercises: {e}")
+            return []
+
+    def get_exercise_by_id(self, exercise_id: int) -> Optional[Exercise]:
+        """Lấy bài tập theo ID"""
+        try:
+            ex_data = self._exercise_source().get(exercise_id)
+            return Exercise.from_dict(ex_data) if ex_data else None
+            
+        except Exception as e:
+            print(f"❌ Error getting exercise by ID: {e}")
+            return None
+
+    # CURRICULUM MANAGEMENT
+    def get_curriculum(self) -> Curriculum:
+        """Lấy chương trình học"""
+        try:
+            curriculum_data = self._load_json(self.curriculum_file) or []
+            return Curriculum(topics=curriculum_data)
+        except Exception as e:
+            print(f"❌ Error getting curriculum: {e}")
+            return Curriculum()
+
+    # BINARY SNAPSHOT
+    def _fresh_snapshot_section(self, file_path: str) -> Optional[str]:
+        """Section snapshot của file JSON nếu file chưa bị ghi lại từ lúc export"""
+        section = self._snapshot_files.get(file_path)
+        if self.snapshot is None or section is None or not self.snapshot.is_fresh(section, file_path):
+            return None
+        return section
+
+    def _snapshot_progress_meta(self) -> Dict[str, Any]:
+        if self._fresh_snapshot_section(self.progress_file) is None:
+            return {}
+        return self.snapshot.meta('progress')
+
+    def _snapshot_progress_summaries(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Số liệu tóm tắt tính sẵn lúc export (None nếu progress.json đã đổi / đã nạp)"""
+        if self.cache is not None and self.progress_file in self.cache:
+            return None
+        if self._fresh_snapshot_section(self.progress_file) is None:
+            return None
+        try:
+            return self.snapshot.load('progress_summaries')
+        except Exception as e:
+            print(f"⚠️ Snapshot section progress_summaries unreadable: {e}")
+            return None
+
+    def _snapshot_is_current(self, reader: Optional[SnapshotReader]) -> bool:
+        return reader is not None and all(reader.is_fresh(section, file_path)
+                                          for file_path, section in self._snapshot_files.items()
+                                          if os.path.exists(file_path))
+
+    def _refresh_snapshot_in_background(self):
+        """Snapshot cũ (hoặc chưa có) được xuất lại trên thread nền"""
+        if not self.config.SNAPSHOT_ENABLED or self._snapshot_is_current(self.snapshot):
+            return
+        threading.Thread(target=self._refresh_snapshot, name='snapshot-export', daemon=True).start()
+
+    def _refresh_snapshot(self):
+        # Chỉ một worker xuất, các worker chờ khóa dùng lại snapshot vừa xuất
+        with FileLock(self.config.SNAPSHOT_FILE + '.lock'):
+            reader = SnapshotReader.open(self.config.SNAPSHOT_FILE)
+            if self._snapshot_is_current(reader):
+                self.snapshot = reader
+                return
+            self.export_snapshot()
+
+    def _read_snapshot_source(self, file_path: str) -> tuple:
+        """(chữ ký file, dữ liệu) đọc nhất quán trong khóa của file"""
+        with self.locks.hold(file_path):
+            self.writer.flush()
+            signature = file_signature(file_path)
+            data = self._load_json(file_path)
+        if isinstance(data, dict):
+            # Copy nông: user/document có thể bị thay trong cache sau khi nhả khóa
+            data = {key: dict(value) if isinstance(value, dict) else value for key, value in data.items()}
+        return signature, data
+
+    def _snapshot_sections(self):
+        """Các section của snapshot, đọc lần lượt khi đang ghi file"""
+        sources = dict(self._snapshot_files)
+        sources.setdefault(self.progress_file, 'progress')
+        for file_path, section in sources.items():
+            if section != 'progress':
+                signature, data = self._read_snapshot_source(file_path)
+                if data is not None:
+                    yield section, {'data': data, 'keyed': isinstance(data, dict), 'source': signature}
+                continue
+
+            if isinstance(self.progress_store, JSONProgressStore):
+                signature, docs = self._read_snapshot_source(self.progress_file)
+                docs = docs or {}
+            else:
+                signature, docs = None, self.progress_store.all()
+            valid = {username: doc for username, doc in docs.items() if isinstance(doc, dict) and 'username' in doc}
+            meta = {
+                'needs_migration': sum(1 for doc in valid.values() if Progress.needs_migration(doc)),
+                'log_seq': max((doc.get('log_seq', 0) for doc in valid.values()), default=0)
+            }
+            yield 'progress', {'data': docs, 'keyed': True, 'source': signature, 'meta': meta}
+            yield 'progress_summaries', {
+                'data': {username: progress_summary(doc) for username, doc in valid.items()},
+                'source': signature
+            }
+
+    def export_snapshot(self, path: Optional[str] = None) -> bool:
+        """Xuất toàn bộ dữ liệu ra snapshot nhị phân (JSON vẫn là định dạng trao đổi)"""
+        if self.progress_store is None:
+            print("❌ Snapshot chỉ hỗ trợ storage JSON")
+            return False
+        path = path or self.config.SNAPSHOT_FILE
+        try:
+            write_snapshot(path, self._snapshot_sections())
+            if self.config.SNAPSHOT_ENABLED and os.path.abspath(path) == os.path.abspath(self.config.SNAPSHOT_FILE):
+                # Reader cũ không đóng: request khác có thể vẫn đang đọc
+                self.snapshot = SnapshotReader.open(path)
+            print(f"✅ Exported snapshot to {path}")
+            return True
+        except Exception as e:
+            print(f"❌ Error exporting snapshot: {e}")
+            return False
+
+    def import_snapshot(self, path: Optional[str] = None) -> bool:
+        """Ghi dữ liệu trong snapshot ra các file JSON (thay dữ liệu hiện tại).
+        Chỉ nên chạy khi app đang dừng."""
+        if self.progress_store is None:
+            print("❌ Snapshot chỉ hỗ trợ storage JSON")
+            return False
+        path = path or self.config.SNAPSHOT_FILE
+        reader = SnapshotReader.open(path)
+        if reader is None:
+            print(f"❌ Cannot open snapshot {path}")
+            return False
+        try:
+            for file_path, section in ((self.users_file, 'users'), (self.exercises_file, 'exercises'),
+                                       (self.curriculum_file, 'curriculum'),
+                                       (self.game_sessions_file, 'game_sessions')):
+                if section in reader.sections:
+                    with self.locks.hold(file_path):
+                        self._save_json(file_path, reader.load(section))
+            if 'progress' in reader.sections:
+                docs = reader.load('progress')
+                if isinstance(self.progress_store, JSONProgressStore):
+                    with self.locks.hold(self.progress_file):
+                        self._save_json(self.progress_file, docs)
+                else:
+                    # Layout shard: ghi đè document của các user có trong snapshot
+                    with self.locks.hold(*{self.progress_store.lock_key(username) for username in docs}):
+                        self.progress_store.put_many(docs)
+            self.writer.flush()
+            self.leaderboard.rebuild(self._load_progress_summaries)
+            print(f"✅ Imported snapshot from {path}")
+        except Exception as e:
+            print(f"❌ Error importing snapshot: {e}")
+            return False
+        finally:
+            reader.close()
+
+        if self.config.SNAPSHOT_ENABLED:
+            # Các file JSON vừa được ghi lại nên snapshot đang dùng đã cũ
+            self.export_snapshot()
+        return True
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Thống kê hit/miss của cache file JSON"""
+        if self.cache:
+            return {'enabled': True, **self.cache.get_stats()}
+        return {'enabled': False}
+
+    def get_writer_stats(self) -> Dict[str, Any]:
+        """Thống kê số lần ghi file JSON"""
+        return self.writer.get_stats()
+
+    def get_user_meta_stats(self) -> Dict[str, Any]:
+        """Thống kê ghi trễ last_login / login_count"""
+        if self.user_meta:
+            return {'enabled': True, **self.user_meta.get_stats()}
+        return {'enabled': False}
+
+    # LEADERBOARD
+    def _leaderboard_index(self) -> LeaderboardIndex:
+        """Index bảng xếp hạng, dựng lại định kỳ để thấy ghi của worker khác"""
+        interval = self.config.LEADERBOARD_REFRESH_INTERVAL
+        if interval > 0:
+            self.leaderboard.refresh(interval, self._load_progress_summaries)
+        return self.leaderboard
+
+    def get_leaderboard(self, limit: int = 10, window: str = 'all') -> List[Dict[str, Any]]:
+        """Lấy bảng xếp hạng (window: all, today, week, month)"""
+        try:
+            if window != 'all':
+                return self._leaderboard_index().top_window(window_start(window), limit)
+            return self._leaderboard_index().top(limit)
+            
+        except Exception as e:
+            print(f"❌ Error getting leaderboard: {e}")
+            return []
+
+    def get_leaderboard_rank(self, username: str, radius: int = 5) -> Optional[Dict[str, Any]]:
+        """Thứ hạng của user và các user xếp ngay trên/dưới"""
+        try:
+            index = self._leaderboard_index()
+            rank = index.rank(username)
+            if rank is None:
+                return None
+            return {
+                'username': username,
+                'rank': rank,
+                'total_users': len(index),
+                'around': index.around(username, radius)
+            }
+
+        except Exception as e:
+            print(f"❌ Error getting leaderboard rank: {e}")
+            return None
+
+def create_db_manager() -> DatabaseManager:
+    """Tạo DatabaseManager theo STORAGE_BACKEND trong Config"""
+    if Config.STORAGE_BACKEND == 'sqlite':
+        from sqlite_storage import SQLiteDatabaseManager
+        return SQLiteDatabaseManager()
+    return DatabaseManager()
+
+# Khởi tạo global instance
+db_manager = create_db_manager()
\ No newline at end of file
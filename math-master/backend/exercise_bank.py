@@ -0,0 +1,247 @@
+import bisect
+import mmap
+import os
+import random
+import struct
+import sys
+import tempfile
+import threading
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import serializers
+from locks import FileLock
+
+# File index: header cố định rồi các entry 32 byte (id, offset, length, category)
+# với category = mã topic << 16 | mã difficulty
+INDEX_MAGIC = b'MMXIDX'
+INDEX_VERSION = 1
+_INDEX_HEADER = struct.Struct('<6sH8x')
+_ENTRY = struct.Struct('<qqqq')
+
+# Bucket chiếm ít nhất 1/N bank thì chọn bằng cách thử vị trí ngẫu nhiên,
+# bucket thưa hơn thì dựng (một lần) danh sách vị trí
+_DENSE_BUCKET = 16
+
+
+def _write_json_atomic(file_path: str, data: Any):
+    directory = os.path.dirname(file_path) or '.'
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(file_path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(serializers.dumps_bytes(data, indent=True))
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, file_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _read_meta(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path + '.meta.json', 'rb') as f:
+            return serializers.loads(f.read())
+    except FileNotFoundError:
+        return None
+
+
+def append_exercises(path: str, exercises: Iterable[Dict[str, Any]]) -> int:
+    """Thêm bài tập vào cuối bank (tạo mới nếu chưa có), trả về số bài đã thêm.
+
+    id phải là số nguyên tăng dần (như ExerciseGenerator sinh ra). File
+    .meta.json là điểm commit: phần ghi dở của lần append bị lỗi nằm sau
+    count/records_size trong meta nên không ai đọc tới và bị cắt ở lần sau.
+    """
+    with FileLock(path + '.lock'):
+        meta = _read_meta(path) or {
+            'format': serializers.get_backends()['binary'],
+            'count': 0,
+            'records_size': 0,
+            'last_id': None,
+            'topics': [],
+            'difficulties': [],
+            'counts': {}
+        }
+        if meta['format'] != serializers.get_backends()['binary']:
+            raise ValueError(f"Bank dạng {meta['format']} nhưng thư viện tương ứng chưa được cài")
+
+        topic_codes = {topic: i for i, topic in enumerate(meta['topics'])}
+        difficulty_codes = {difficulty: i for i, difficulty in enumerate(meta['difficulties'])}
+        counts = dict(meta['counts'])
+        count, records_size, last_id = meta['count'], meta['records_size'], meta['last_id']
+        index_size = _INDEX_HEADER.size + count * _ENTRY.size
+
+        with open(path, 'ab') as records, open(path + '.idx', 'ab') as index:
+            records.truncate(records_size)
+            index.truncate(index_size)
+            if index_size == _INDEX_HEADER.size and count == 0:
+                index.truncate(0)
+                index.write(_INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION))
+
+            added = 0
+            for exercise in exercises:
+                exercise_id = exercise.get('id')
+                if type(exercise_id) is not int or (last_id is not None and exercise_id <= last_id):
+                    raise ValueError(f"id bài tập phải là số nguyên tăng dần: {exercise_id!r}")
+                topic, difficulty = str(exercise.get('topic')), str(exercise.get('difficulty'))
+                if topic not in topic_codes:
+                    topic_codes[topic] = len(meta['topics'])
+                    meta['topics'].append(topic)
+                if difficulty not in difficulty_codes:
+                    difficulty_codes[difficulty] = len(meta['difficulties'])
+                    meta['difficulties'].append(difficulty)
+                category = topic_codes[topic] << 16 | difficulty_codes[difficulty]
+
+                blob = serializers.packb(exercise)
+                records.write(blob)
+                index.write(_ENTRY.pack(exercise_id, records_size, len(blob), category))
+                records_size += len(blob)
+                counts[str(category)] = counts.get(str(category), 0) + 1
+                last_id = exercise_id
+                added += 1
+
+            for f in (records, index):
+                f.flush()
+                os.fsync(f.fileno())
+
+        meta.update(count=count + added, records_size=records_size, last_id=last_id, counts=counts)
+        _write_json_atomic(path + '.meta.json', meta)
+        return added
+
+
+class _IdColumn:
+    """Cột id của file index như một sequence (để bisect, không copy)"""
+
+    def __init__(self, index: mmap.mmap, count: int):
+        self._index = index
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, position: int) -> int:
+        return _ENTRY.unpack_from(self._index, _INDEX_HEADER.size + position * _ENTRY.size)[0]
+
+
+class ExerciseBank:
+    """Bank bài tập chỉ đọc qua mmap, cùng giao diện get/sample với ExerciseIndex.
+
+    Hai file được mmap (records + index) nằm trong page cache của hệ điều
+    hành nên các worker dùng chung một bản; mỗi lần đọc chỉ giải mã đúng
+    bản ghi cần lấy. Số bản ghi lấy từ .meta.json lúc mở bank.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        meta = _read_meta(path)
+        if meta is None:
+            raise FileNotFoundError(path + '.meta.json')
+        if meta['format'] != serializers.get_backends()['binary']:
+            raise ValueError(f"Bank dạng {meta['format']} nhưng thư viện tương ứng chưa được cài")
+        self.count: int = meta['count']
+        self.last_id: Optional[int] = meta['last_id']
+        self.topics: Dict[str, int] = {topic: i for i, topic in enumerate(meta['topics'])}
+        self.difficulties: Dict[str, int] = {difficulty: i for i, difficulty in enumerate(meta['difficulties'])}
+        self.counts: Dict[int, int] = {int(category): n for category, n in meta['counts'].items()}
+        self._buckets: Dict[Tuple[str, Optional[str]], array] = {}
+        self._lock = threading.Lock()
+        self._records = self._map(path, meta['records_size'])
+        self._index = self._map(path + '.idx', _INDEX_HEADER.size + self.count * _ENTRY.size)
+        if self._index is not None and _INDEX_HEADER.unpack_from(self._index, 0) != (INDEX_MAGIC, INDEX_VERSION):
+            raise ValueError(f"File index không hợp lệ: {path}.idx")
+        self._ids = _IdColumn(self._index, self.count)
+
+    @staticmethod
+    def _map(file_path: str, size: int) -> Optional[mmap.mmap]:
+        if size == 0:
+            return None
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < size:
+                raise ValueError(f"{file_path} ngắn hơn số liệu trong meta")
+            mapped = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+        if hasattr(mapped, 'madvise'):
+            # Đọc ngẫu nhiên từng bản ghi: không đọc trước các trang lân cận
+            mapped.madvise(mmap.MADV_RANDOM)
+        return mapped
+
+    @classmethod
+    def open(cls, path: str) -> Optional['ExerciseBank']:
+        """Mở bank, None nếu chưa có hoặc không dùng được"""
+        try:
+            return cls(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"⚠️ Bỏ qua exercise bank {path}: {e}")
+            return None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _entry(self, position: int) -> Tuple[int, int, int, int]:
+        return _ENTRY.unpack_from(self._index, _INDEX_HEADER.size + position * _ENTRY.size)
+
+    def _read(self, position: int) -> Dict[str, Any]:
+        _, offset, length, _ = self._entry(position)
+        return serializers.unpackb(self._records[offset:offset + length])
+
+    def get(self, exercise_id: Any) -> Optional[Dict[str, Any]]:
+        try:
+            exercise_id = int(exercise_id)
+        except (TypeError, ValueError):
+            return None
+        # id tăng dần theo vị trí nên tìm nhị phân trên cột id
+        position = bisect.bisect_left(self._ids, exercise_id)
+        if position < self.count and self._ids[position] == exercise_id:
+            return self._read(position)
+        return None
+
+    def _categories(self, topic: str, difficulty: Optional[str]) -> frozenset:
+        """Các mã category thuộc bucket (topic 'all' / difficulty None khớp mọi giá trị)"""
+        topic_code = None if topic == 'all' else self.topics.get(topic, -1)
+        difficulty_code = self.difficulties.get(difficulty, -1) if difficulty else None
+        return frozenset(category for category in self.counts
+                         if (topic_code is None or category >> 16 == topic_code) and
+                         (difficulty_code is None or category & 0xFFFF == difficulty_code))
+
+    def _bucket(self, topic: str, difficulty: Optional[str], categories: frozenset) -> array:
+        """Vị trí các bài thuộc bucket (quét cột category một lần, cache theo bucket)"""
+        key = (topic, difficulty)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    entries = array('q')
+                    entries.frombytes(self._index[_INDEX_HEADER.size:])
+                    if sys.byteorder != 'little':
+                        entries.byteswap()
+                    column = entries[3::_ENTRY.size // 8]
+                    del entries
+                    bucket = self._buckets[key] = array('q', (position for position, category in enumerate(column)
+                                                              if category in categories))
+        return bucket
+
+    def sample(self, topic: str = 'all', difficulty: Optional[str] = None, k: int = 20,
+               rng: random.Random = random) -> List[Dict[str, Any]]:
+        """k bài ngẫu nhiên (không lặp) theo chủ đề / độ khó"""
+        categories = self._categories(topic, difficulty)
+        size = sum(self.counts[category] for category in categories)
+        k = min(k, size)
+        if k <= 0:
+            return []
+
+        if size * _DENSE_BUCKET >= self.count and k * 4 <= size:
+            # Bucket dày: thử vị trí ngẫu nhiên trên toàn bank, giữ vị trí khớp
+            chosen: Dict[int, None] = {}
+            while len(chosen) < k:
+                position = rng.randrange(self.count)
+                if position not in chosen and self._entry(position)[3] in categories:
+                    chosen[position] = None
+            positions = list(chosen)
+        else:
+            positions = rng.sample(self._bucket(topic, difficulty, categories), k)
+        return [self._read(position) for position in positions]
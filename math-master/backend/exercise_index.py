@@ -0,0 +1,65 @@
+import random
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+def reservoir_sample(items: Iterable[Any], k: int, rng: random.Random = random) -> List[Any]:
+    """Chọn ngẫu nhiên k phần tử từ một luồng dữ liệu, chỉ giữ k phần tử trong bộ nhớ"""
+    reservoir: List[Any] = []
+    for n, item in enumerate(items):
+        if n < k:
+            reservoir.append(item)
+        else:
+            j = rng.randint(0, n)
+            if j < k:
+                reservoir[j] = item
+    rng.shuffle(reservoir)
+    return reservoir
+
+
+class ExerciseIndex:
+    """Index bài tập dựng một lần cho mỗi phiên bản của exercises.json.
+
+    - by_id: id -> bản ghi
+    - by_topic: topic -> danh sách id
+    - by_topic_difficulty: (topic, difficulty) -> danh sách id
+      (topic 'all' gom mọi chủ đề)
+
+    Chọn ngẫu nhiên k bài dùng random.sample trên danh sách id (O(k)), không
+    shuffle cả bucket.
+    """
+
+    def __init__(self, exercises: List[Dict[str, Any]]):
+        self.source = exercises
+        self.by_id: Dict[Any, Dict[str, Any]] = {}
+        self.by_topic: Dict[str, List[Any]] = {'all': []}
+        self.by_topic_difficulty: Dict[Tuple[str, str], List[Any]] = {}
+
+        for exercise in exercises:
+            exercise_id = exercise.get('id')
+            if exercise_id is None or exercise_id in self.by_id:
+                continue
+            self.by_id[exercise_id] = exercise
+            topic = exercise.get('topic')
+            difficulty = exercise.get('difficulty')
+            self.by_topic['all'].append(exercise_id)
+            self.by_topic.setdefault(topic, []).append(exercise_id)
+            self.by_topic_difficulty.setdefault(('all', difficulty), []).append(exercise_id)
+            self.by_topic_difficulty.setdefault((topic, difficulty), []).append(exercise_id)
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def get(self, exercise_id: Any) -> Optional[Dict[str, Any]]:
+        return self.by_id.get(exercise_id)
+
+    def ids(self, topic: str = 'all', difficulty: Optional[str] = None) -> List[Any]:
+        """Danh sách id của bucket (không copy, không được sửa)"""
+        if difficulty:
+            return self.by_topic_difficulty.get((topic, difficulty), [])
+        return self.by_topic.get(topic, [])
+
+    def sample(self, topic: str = 'all', difficulty: Optional[str] = None, k: int = 20,
+               rng: random.Random = random) -> List[Dict[str, Any]]:
+        """k bài ngẫu nhiên (không lặp) theo chủ đề / độ khó"""
+        bucket = self.ids(topic, difficulty)
+        return [self.by_id[exercise_id] for exercise_id in rng.sample(bucket, min(k, len(bucket)))]
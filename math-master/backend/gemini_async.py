@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict
+
+from ai_cache import PromptCache
+from config import Config
+from gemini_ai import GeminiAIService, gemini_ai
+from single_flight import AsyncSingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class AIQueueFull(Exception):
+    """Đã đủ số lời gọi Gemini đang chạy và hàng đợi cũng đã đầy"""
+
+
+class AsyncLimiter:
+    """Giới hạn số lời gọi API đồng thời (semaphore) kèm hàng đợi có giới hạn.
+
+    Khi đã có max_in_flight lời gọi đang chạy, request mới chờ trong hàng đợi;
+    nếu đã có max_waiting request đang chờ thì bị từ chối ngay (AIQueueFull)
+    để dùng fallback thay vì xếp hàng vô hạn.
+    """
+
+    def __init__(self, max_in_flight: int, max_waiting: int):
+        self.max_in_flight = max_in_flight
+        self.max_waiting = max_waiting
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self.in_flight = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def __aenter__(self):
+        if self._semaphore.locked():
+            if self.waiting >= self.max_waiting:
+                self.rejected += 1
+                raise AIQueueFull()
+            self.waiting += 1
+            try:
+                await self._semaphore.acquire()
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+        self.in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.in_flight -= 1
+        self.completed += 1
+        self._semaphore.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'max_in_flight': self.max_in_flight,
+            'max_waiting': self.max_waiting,
+            'in_flight': self.in_flight,
+            'waiting': self.waiting,
+            'completed': self.completed,
+            'rejected': self.rejected
+        }
+
+
+class AsyncGeminiAIService:
+    """GeminiAIService cho asyncio: mọi method là coroutine.
+
+    Prompt, xử lý phản hồi và fallback dùng chung với GeminiAIService (các
+    generator _..._steps), cache phản hồi cũng dùng chung. Lời gọi API dùng
+    client.aio của google-genai (hoặc client đồng bộ trong thread pool nếu
+    không có), đi qua AsyncLimiter, nên một process giữ được hàng trăm
+    request AI đang chờ mà không cần hàng trăm thread.
+    """
+
+    def __init__(self, service: GeminiAIService, max_in_flight: int = 16, max_waiting: int = 256):
+        self.service = service
+        self.limiter = AsyncLimiter(max_in_flight, max_waiting)
+        self.flights = AsyncSingleFlight()
+
+    @property
+    def client(self):
+        return self.service.client
+
+    async def _run(self, steps):
+        """Như GeminiAIService._run nhưng await lời gọi API"""
+        try:
+            prompt, kind = next(steps)
+            while True:
+                prompt, kind = steps.send(await self._call_gemini(prompt, kind=kind))
+        except StopIteration as done:
+            return done.value
+
+    async def _call_gemini(self, prompt, kind=None, config=None):
+        """Như GeminiAIService._call_gemini: cache, rồi gộp các request giống hệt"""
+        key = PromptCache.make_key(self.service.model_name, prompt, config)
+        if self.service.cache is not None:
+            # Tra theo khóa chính (bộ nhớ rồi SQLite) nên gọi thẳng trong event loop
+            cached = self.service.cache.lookup(kind, key)
+            if cached is not None:
+                return cached
+        return await self.flights.do(key, lambda: self._generate_and_store(prompt, kind, key, config))
+
+    async def _generate_and_store(self, prompt, kind, key, config=None):
+        started = time.monotonic()
+        response = await self._generate(prompt, config)
+        if self.service.cache is not None:
+            self.service.cache.store(kind, key, response, time.monotonic() - started)
+        return response
+
+    async def _generate(self, prompt, config=None):
+        """Một lần gọi Gemini API (qua limiter) với xử lý lỗi"""
+        client = self.service.client
+        if not client:
+            logger.warning("⚠️ Gemini client not available, using fallback")
+            return None
+        try:
+            async with self.limiter:
+                aio = getattr(client, 'aio', None)
+                if aio is None:
+                    return await asyncio.to_thread(self.service._generate, prompt, config)
+                response = await aio.models.generate_content(
+                    model=self.service.model_name,
+                    contents=prompt,
+                    config=config
+                )
+                return response.text
+        except AIQueueFull:
+            logger.warning("⚠️ Hàng đợi gọi Gemini đã đầy, using fallback")
+            return None
+        except Exception as e:
+            logger.error(f"❌ Lỗi gọi Gemini API: {e}")
+            return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Số lời gọi đang chạy / đang chờ và số request được gộp"""
+        return {'limiter': self.limiter.get_stats(), 'coalescing': self.flights.get_stats()}
+
+    async def generate_smart_explanation(self, question, user_answer, correct_answer, topic, student_level):
+        return await self._run(self.service._generate_smart_explanation_steps(
+            question, user_answer, correct_answer, topic, student_level))
+
+    async def generate_adaptive_exercise(self, student_level, weak_topics, progress_data):
+        return await self._run(self.service._generate_adaptive_exercise_steps(
+            student_level, weak_topics, progress_data))
+
+    async def analyze_learning_pattern(self, progress_data):
+        return await self._run(self.service._analyze_learning_pattern_steps(progress_data))
+
+    async def chat_tutor(self, user_message, chat_history):
+        return await self._run(self.service._chat_tutor_steps(user_message, chat_history))
+
+    async def create_personalized_story(self, math_concept, student_interests):
+        return await self._run(self.service._create_personalized_story_steps(math_concept, student_interests))
+
+    async def generate_review_quiz(self, topics, question_count=5):
+        return await self._run(self.service._generate_review_quiz_steps(topics, question_count))
+
+    async def generate_mock_test(self, question_count, topics, difficulty):
+        return await self._run(self.service._generate_mock_test_steps(question_count, topics, difficulty))
+
+    async def evaluate_mock_test(self, test_data, user_answers, time_spent):
+        return await self._run(self.service._evaluate_mock_test_steps(test_data, user_answers, time_spent))
+
+    async def analyze_mock_test_performance(self, test_results, user_profile):
+        return await self._run(self.service._analyze_mock_test_performance_steps(test_results, user_profile))
+
+
+# Dùng chung một limiter cho cả process
+gemini_ai_async = AsyncGeminiAIService(gemini_ai, Config.AI_MAX_IN_FLIGHT, Config.AI_MAX_QUEUE)
@@ -0,0 +1,98 @@
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class JSONFileCache:
+    """Cache trong process cho các file JSON đã parse.
+
+    Đọc được phục vụ từ bộ nhớ, chỉ parse lại khi mtime hoặc size của file
+    thay đổi (ví dụ một process khác vừa ghi file). Ghi là write-through:
+    DatabaseManager đưa dữ liệu mới vào cache (store) rồi chuyển cho writer;
+    khi file đã được ghi xong, writer gọi confirm() để cập nhật mtime/size.
+    Trong lúc chờ ghi, bản trong cache là bản mới nhất nên không bị so mtime.
+
+    Dữ liệu trả về được dùng chung giữa các request, nên chỉ được sửa khi
+    ngay sau đó lưu lại bằng _save_json.
+    """
+
+    def __init__(self):
+        # path -> [signature, data, version chờ ghi (None nếu đã ghi xong)]
+        self._entries: Dict[str, List[Any]] = {}
+        self._lock = threading.Lock()
+        self._version = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _signature(file_path: str) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        # os.replace tạo inode mới nên st_ino giúp phát hiện ghi từ process khác
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def load(self, file_path: str, loader: Callable[[str], Any]) -> Any:
+        """Trả về dữ liệu từ cache, hoặc gọi loader nếu file đã thay đổi"""
+        signature = self._signature(file_path)
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if entry is not None and (entry[2] is not None or (signature is not None and entry[0] == signature)):
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        data = loader(file_path)
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if entry is not None and entry[2] is not None:
+                return entry[1]  # có bản ghi mới hơn vừa được store
+            if signature is not None and data is not None:
+                self._entries[file_path] = [signature, data, None]
+            else:
+                self._entries.pop(file_path, None)
+        return data
+
+    def __contains__(self, file_path: str) -> bool:
+        """File đã có trong cache (đã nạp hoặc đang chờ ghi)"""
+        with self._lock:
+            return file_path in self._entries
+
+    def store(self, file_path: str, data: Any) -> int:
+        """Đưa dữ liệu mới vào cache trước khi ghi xuống đĩa, trả về version"""
+        with self._lock:
+            self._version += 1
+            self._entries[file_path] = [None, data, self._version]
+            return self._version
+
+    def confirm(self, file_path: str, version: int):
+        """Writer báo file đã được ghi xong với dữ liệu của version"""
+        signature = self._signature(file_path)
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if entry is None or entry[2] != version:
+                return  # đã có bản mới hơn đang chờ ghi
+            if signature is not None:
+                entry[0], entry[2] = signature, None
+            else:
+                self._entries.pop(file_path, None)
+
+    def invalidate(self, file_path: Optional[str] = None):
+        """Xóa cache của một file (hoặc toàn bộ)"""
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(file_path, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Số lần hit/miss để theo dõi hiệu quả cache"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / total, 3) if total else 0.0,
+                'cached_files': len(self._entries)
+            }
@@ -0,0 +1,195 @@
+import atexit
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import serializers
+
+
+class _WriteTicket:
+    """Chờ một lần ghi (mode batched) hoàn tất"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.error: Optional[Exception] = None
+
+
+class JSONFileWriter:
+    """Ghi file JSON an toàn: ghi ra file tạm, fsync, os.replace rồi fsync thư
+    mục (để lần đổi tên không mất khi mất điện).
+
+    Các chế độ bền vững (JSON_WRITE_MODE):
+    - sync: ghi ngay trên thread của request (mặc định)
+    - batched: thread writer gom các lần ghi cùng file trong một cửa sổ ngắn,
+      chỉ ghi bản mới nhất và báo xong cho tất cả request đang chờ cùng lúc
+    - async: như batched nhưng request không chờ ghi xong
+
+    Dữ liệu được serialize trên thread gọi write() để writer không đọc
+    object trong lúc request khác đang sửa nó.
+    """
+
+    MODES = ('sync', 'batched', 'async')
+
+    def __init__(self, mode: str = 'sync', window: float = 0.02,
+                 on_written: Optional[Callable[[str, Any], None]] = None):
+        if mode not in self.MODES:
+            raise ValueError(f"JSON write mode không hợp lệ: {mode}")
+        self.mode = mode
+        self.window = window
+        self.on_written = on_written
+        self.files_written = 0
+        self.writes_requested = 0
+
+        self._cond = threading.Condition()
+        self._pending: Dict[str, tuple] = {}  # path -> (JSON bytes, token)
+        self._tickets: Dict[str, List[_WriteTicket]] = {}
+        self._inflight = False
+        self._stopped = False
+        self._thread = None
+
+        if mode != 'sync':
+            self._thread = threading.Thread(target=self._run, name='json-writer', daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def write(self, file_path: str, data: Any, token: Any = None):
+        """Ghi data vào file_path theo chế độ đã cấu hình"""
+        text = serializers.dumps_bytes(data, indent=True)
+
+        if self.mode == 'sync' or self._stopped:
+            with self._cond:
+                self.writes_requested += 1
+            self._write_file(file_path, text)
+            self._notify_written(file_path, token)
+            return
+
+        ticket = _WriteTicket() if self.mode == 'batched' else None
+        with self._cond:
+            self.writes_requested += 1
+            self._pending[file_path] = (text, token)
+            if ticket:
+                self._tickets.setdefault(file_path, []).append(ticket)
+            self._cond.notify_all()
+
+        if ticket:
+            ticket.done.wait()
+            if ticket.error:
+                raise ticket.error
+
+    def _write_file(self, file_path: str, text: bytes, sync_directory: bool = True):
+        """Ghi atomic: file tạm cùng thư mục + fsync + os.replace + fsync thư mục
+        (sync_directory=False: người gọi tự fsync thư mục, ví dụ một lần cho cả batch)"""
+        directory = os.path.dirname(file_path) or '.'
+        fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(file_path) + '.', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            try:
+                os.chmod(tmp_path, os.stat(file_path).st_mode & 0o777)
+            except FileNotFoundError:
+                os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, file_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        if sync_directory:
+            self._fsync_directory(directory)
+        with self._cond:
+            self.files_written += 1
+
+    @staticmethod
+    def _fsync_directory(directory: str):
+        """fsync thư mục chứa file để entry mới sau os.replace được ghi xuống đĩa"""
+        try:
+            fd = os.open(directory, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+        except OSError:
+            return  # Windows không mở được thư mục (NTFS tự ghi nhật ký metadata)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _notify_written(self, file_path: str, token: Any):
+        if self.on_written:
+            try:
+                self.on_written(file_path, token)
+            except Exception as e:
+                print(f"⚠️ JSON writer callback error: {e}")
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopped:
+                    self._cond.wait()
+                if not self._pending and self._stopped:
+                    return
+
+            # Chờ thêm một chút để gom các lần ghi tiếp theo vào cùng batch
+            if self.window > 0 and not self._stopped:
+                time.sleep(self.window)
+
+            with self._cond:
+                batch, self._pending = self._pending, {}
+                tickets, self._tickets = self._tickets, {}
+                self._inflight = True
+
+            errors: Dict[str, Optional[Exception]] = {}
+            for file_path, (text, _) in batch.items():
+                try:
+                    self._write_file(file_path, text, sync_directory=False)
+                    errors[file_path] = None
+                except Exception as e:
+                    errors[file_path] = e
+                    print(f"❌ Error saving to {file_path}: {e}")
+            # Mỗi thư mục chỉ fsync một lần cho cả batch, trước khi báo xong
+            for directory in {os.path.dirname(path) or '.' for path, error in errors.items() if error is None}:
+                try:
+                    self._fsync_directory(directory)
+                except Exception as e:
+                    print(f"❌ Error syncing directory {directory}: {e}")
+                    for path in errors:
+                        if errors[path] is None and (os.path.dirname(path) or '.') == directory:
+                            errors[path] = e
+            for file_path, (_, token) in batch.items():
+                if errors[file_path] is None:
+                    self._notify_written(file_path, token)
+                for ticket in tickets.get(file_path, []):
+                    ticket.error = errors[file_path]
+                    ticket.done.set()
+
+            with self._cond:
+                self._inflight = False
+                self._cond.notify_all()
+
+    def flush(self):
+        """Chờ tới khi mọi lần ghi đang chờ đã xuống đĩa"""
+        if self._thread is None:
+            return
+        with self._cond:
+            self._cond.notify_all()
+            while (self._pending or self._inflight) and self._thread.is_alive():
+                self._cond.wait(0.1)
+
+    def close(self):
+        """Ghi nốt các file đang chờ và dừng thread writer"""
+        if self._thread is None or self._stopped:
+            return
+        self.flush()
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Số lần ghi được yêu cầu so với số file thực sự ghi (fsync)"""
+        with self._cond:
+            return {
+                'mode': self.mode,
+                'writes_requested': self.writes_requested,
+                'files_written': self.files_written
+            }
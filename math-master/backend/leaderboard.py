@@ -0,0 +1,311 @@
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+SUMMARY_FIELDS = ('total_score', 'games_played', 'exercises_completed', 'study_time')
+
+# Các khoảng thời gian của bảng xếp hạng ('all' = toàn thời gian)
+WINDOWS = ('all', 'today', 'week', 'month')
+
+
+def window_start(window: str, today: Optional[date] = None) -> str:
+    """Ngày bắt đầu (YYYY-MM-DD) của khoảng: hôm nay, tuần này (từ thứ Hai), tháng này"""
+    today = today or date.today()
+    if window == 'today':
+        start = today
+    elif window == 'week':
+        start = today - timedelta(days=today.weekday())
+    elif window == 'month':
+        start = today.replace(day=1)
+    else:
+        raise ValueError(f"Khoảng thời gian không hợp lệ: {window}")
+    return start.isoformat()
+
+
+def oldest_window_start(today: Optional[date] = None) -> str:
+    """Ngày bắt đầu sớm nhất trong các khoảng (tuần có thể bắt đầu từ tháng trước)"""
+    today = today or date.today()
+    return min(window_start(window, today) for window in WINDOWS if window != 'all')
+
+
+class SortedKeyList:
+    """List đã sắp xếp chia thành các khúc tối đa CHUNK phần tử.
+
+    Chèn/xóa là bisect trên khúc cuối của từng khúc rồi trong một khúc, chỉ
+    dịch tối đa CHUNK phần tử thay vì cả list. Số phần tử của các khúc được
+    cộng dồn trong một cây Fenwick nên vị trí của một khóa và phần tử thứ i
+    đều là O(log n). Cây được dựng lại khi một khúc bị tách hoặc bị xóa
+    (mỗi ~CHUNK/2 lần chèn).
+    """
+
+    CHUNK = 512
+
+    def __init__(self, keys: Iterable[Tuple[int, str]] = ()):
+        keys = sorted(keys)
+        # Các khúc đầy một nửa để lần chèn tiếp theo không phải tách ngay
+        size = self.CHUNK // 2
+        self._chunks = [keys[i:i + size] for i in range(0, len(keys), size)]
+        self._maxes = [chunk[-1] for chunk in self._chunks]
+        self._len = len(keys)
+        self._build_tree()
+
+    def _build_tree(self):
+        tree = [0] * (len(self._chunks) + 1)
+        for i, chunk in enumerate(self._chunks, 1):
+            tree[i] += len(chunk)
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _tree_add(self, chunk: int, delta: int):
+        i = chunk + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _count_before(self, chunk: int) -> int:
+        """Số phần tử trong các khúc trước khúc chunk"""
+        total = 0
+        while chunk > 0:
+            total += self._tree[chunk]
+            chunk -= chunk & -chunk
+        return total
+
+    def add(self, key: Tuple[int, str]):
+        if not self._chunks:
+            self._chunks, self._maxes, self._len = [[key]], [key], 1
+            self._build_tree()
+            return
+        i = min(bisect_left(self._maxes, key), len(self._chunks) - 1)
+        chunk = self._chunks[i]
+        insort(chunk, key)
+        self._maxes[i] = chunk[-1]
+        self._len += 1
+        if len(chunk) > self.CHUNK:
+            half = len(chunk) // 2
+            self._chunks[i:i + 1] = [chunk[:half], chunk[half:]]
+            self._maxes[i:i + 1] = [chunk[half - 1], chunk[-1]]
+            self._build_tree()
+        else:
+            self._tree_add(i, 1)
+
+    def remove(self, key: Tuple[int, str]) -> bool:
+        i = bisect_left(self._maxes, key)
+        if i == len(self._chunks):
+            return False
+        chunk = self._chunks[i]
+        pos = bisect_left(chunk, key)
+        if pos == len(chunk) or chunk[pos] != key:
+            return False
+        del chunk[pos]
+        self._len -= 1
+        if chunk:
+            self._maxes[i] = chunk[-1]
+            self._tree_add(i, -1)
+        else:
+            del self._chunks[i], self._maxes[i]
+            self._build_tree()
+        return True
+
+    def index(self, key: Tuple[int, str]) -> int:
+        """Vị trí (tính từ 0) của key trong list (như bisect_left)"""
+        i = bisect_left(self._maxes, key)
+        if i == len(self._chunks):
+            return self._len
+        return self._count_before(i) + bisect_left(self._chunks[i], key)
+
+    def __getitem__(self, position: int) -> Tuple[int, str]:
+        if not 0 <= position < self._len:
+            raise IndexError(position)
+        # Tìm khúc chứa phần tử thứ position bằng cách đi xuống cây Fenwick
+        chunk, step = 0, 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            nxt = chunk + step
+            if nxt < len(self._tree) and self._tree[nxt] <= position:
+                chunk = nxt
+                position -= self._tree[nxt]
+            step >>= 1
+        return self._chunks[chunk][position]
+
+    def __len__(self) -> int:
+        return self._len
+
+
+class LeaderboardIndex:
+    """Bảng xếp hạng được cập nhật dần thay vì sắp xếp lại toàn bộ mỗi request.
+
+    Các user được giữ trong một SortedKeyList theo khóa (-total_score,
+    username): thứ hạng của user, top-K và các user xung quanh đều là
+    O(log n) mỗi dòng. Mỗi lần điểm thay đổi chỉ xóa/chèn một khóa, O(log n)
+    cộng với việc dịch tối đa SortedKeyList.CHUNK phần tử.
+
+    Bảng xếp hạng theo tuần/tháng cộng các bucket điểm theo ngày
+    (day -> {username: điểm}) của đúng các ngày trong khoảng, tối đa ~31
+    bucket thay vì toàn bộ lịch sử làm bài. Chỉ giữ bucket từ ngày bắt đầu
+    sớm nhất của các khoảng (oldest_window_start); bucket cũ hơn (kể cả từ
+    bài làm gửi bù với ngày cũ) bị bỏ khi sang ngày mới.
+
+    Index nằm trong bộ nhớ của từng process: ghi của process khác chỉ thấy
+    được sau lần rebuild tiếp theo.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = SortedKeyList()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._versions: Dict[str, int] = {}  # version tiến độ của lần update gần nhất
+        self._daily: Dict[str, Dict[str, int]] = {}  # day -> {username: điểm}, day >= _daily_since
+        self._daily_since = oldest_window_start()
+        self._touched: Optional[Set[str]] = None  # user được cập nhật trong lúc rebuild
+        self._rebuild_lock = threading.Lock()
+        self.built_at = 0.0
+
+    @staticmethod
+    def _key(username: str, entry: Dict[str, Any]) -> Tuple[int, str]:
+        return (-entry['total_score'], username)
+
+    @staticmethod
+    def _entry(summary: Dict[str, Any]) -> Dict[str, Any]:
+        return {field: summary.get(field, 0) for field in SUMMARY_FIELDS}
+
+    def rebuild(self, load_summaries: Callable[[], Dict[str, Dict[str, Any]]]):
+        """Dựng lại toàn bộ index từ số liệu tóm tắt trong storage.
+
+        Các user được update() trong lúc đang đọc storage giữ số liệu mới
+        hơn đó thay vì bị ghi đè bằng bản vừa đọc.
+        """
+        with self._rebuild_lock:
+            self._rebuild(load_summaries)
+
+    def refresh(self, max_age: float, load_summaries: Callable[[], Dict[str, Dict[str, Any]]]):
+        """Dựng lại nếu index cũ hơn max_age giây (bỏ qua nếu thread khác đang dựng)"""
+        if time.time() - self.built_at <= max_age or not self._rebuild_lock.acquire(blocking=False):
+            return
+        try:
+            if time.time() - self.built_at > max_age:
+                self._rebuild(load_summaries)
+        finally:
+            self._rebuild_lock.release()
+
+    def _rebuild(self, load_summaries: Callable[[], Dict[str, Dict[str, Any]]]):
+        with self._lock:
+            self._touched = set()
+        try:
+            summaries = load_summaries()
+        except Exception:
+            with self._lock:
+                self._touched = None
+            raise
+        entries = {username: self._entry(summary) for username, summary in summaries.items()}
+        daily_since = oldest_window_start()
+        daily: Dict[str, Dict[str, int]] = {}
+        for username, summary in summaries.items():
+            for day, score in (summary.get('daily_scores') or {}).items():
+                if day >= daily_since:
+                    daily.setdefault(day, {})[username] = score
+        with self._lock:
+            for username in self._touched:
+                entries[username] = self._entries[username]
+                for day, users in daily.items():
+                    users.pop(username, None)
+                for day, users in self._daily.items():
+                    if username in users and day >= daily_since:
+                        daily.setdefault(day, {})[username] = users[username]
+            self._touched = None
+            self._entries = entries
+            self._daily = daily
+            self._daily_since = daily_since
+            self._keys = SortedKeyList(self._key(username, entry) for username, entry in entries.items())
+            self.built_at = time.time()
+
+    def _replace(self, username: str, entry: Dict[str, Any]):
+        old = self._entries.get(username)
+        if old is not None:
+            self._keys.remove(self._key(username, old))
+        self._entries[username] = entry
+        self._keys.add(self._key(username, entry))
+
+    def update(self, username: str, summary: Dict[str, Any], version: Optional[int] = None):
+        """Cập nhật số liệu của một user sau khi tiến độ thay đổi.
+
+        summary được tính trước khi gọi (không đọc storage trong khóa của
+        index). version là version của document tiến độ đã dùng để tính:
+        bản tóm tắt cũ hơn lần cập nhật trước (hai request cùng user về theo
+        thứ tự ngược) bị bỏ qua.
+        """
+        entry = self._entry(summary)
+        with self._lock:
+            if version is not None:
+                if version < self._versions.get(username, version):
+                    return
+                self._versions[username] = version
+            self._replace(username, entry)
+            self._prune_daily()
+            daily_scores = summary.get('daily_scores') or {}
+            for day, users in self._daily.items():
+                if day not in daily_scores:
+                    users.pop(username, None)
+            for day, score in daily_scores.items():
+                if day >= self._daily_since:
+                    self._daily.setdefault(day, {})[username] = score
+            if self._touched is not None:
+                self._touched.add(username)
+
+    def _prune_daily(self):
+        """Bỏ các bucket ngày đã ra khỏi mọi khoảng (chỉ chạy khi sang ngày mới)"""
+        daily_since = oldest_window_start()
+        if daily_since != self._daily_since:
+            self._daily_since = daily_since
+            for day in [day for day in self._daily if day < daily_since]:
+                del self._daily[day]
+
+    def _row(self, position: int) -> Dict[str, Any]:
+        username = self._keys[position][1]
+        return {'username': username, **self._entries[username], 'rank': position + 1}
+
+    def top(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """K user điểm cao nhất"""
+        with self._lock:
+            return [self._row(i) for i in range(min(limit, len(self._keys)))]
+
+    def top_window(self, since: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """K user nhiều điểm nhất từ ngày since (YYYY-MM-DD) tới nay"""
+        with self._lock:
+            self._prune_daily()
+            window_scores: Dict[str, int] = {}
+            day, today = date.fromisoformat(since), date.today()
+            while day <= today:
+                for username, score in self._daily.get(day.isoformat(), {}).items():
+                    window_scores[username] = window_scores.get(username, 0) + score
+                day += timedelta(days=1)
+            best = heapq.nsmallest(limit, ((-score, username) for username, score in window_scores.items()
+                                           if score > 0))
+            return [{'username': username, **self._entries.get(username, {}),
+                     'window_score': -neg_score, 'rank': i + 1}
+                    for i, (neg_score, username) in enumerate(best)]
+
+    def rank(self, username: str) -> Optional[int]:
+        """Thứ hạng (bắt đầu từ 1) của user, None nếu chưa có"""
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None:
+                return None
+            return self._keys.index(self._key(username, entry)) + 1
+
+    def around(self, username: str, radius: int = 5) -> List[Dict[str, Any]]:
+        """Các user xếp ngay trên/dưới user (mỗi bên tối đa radius người)"""
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None:
+                return []
+            position = self._keys.index(self._key(username, entry))
+            start = max(0, position - radius)
+            end = min(len(self._keys), position + radius + 1)
+            return [self._row(i) for i in range(start, end)]
+
+    def __len__(self) -> int:
+        return len(self._keys)
@@ -0,0 +1,75 @@
+import os
+import threading
+import zlib
+from contextlib import contextmanager
+from typing import List
+
+try:
+    import fcntl
+except ImportError:  # Windows: chỉ khóa được giữa các thread trong một process
+    fcntl = None
+
+
+class FileLock:
+    """Khóa độc quyền dùng được giữa các thread (threading.Lock) và giữa các
+    process (fcntl.flock advisory trên một file .lock)."""
+
+    def __init__(self, lock_file: str):
+        self.lock_file = lock_file
+        self._thread_lock = threading.Lock()
+        self._fd = None
+
+    def acquire(self):
+        self._thread_lock.acquire()
+        if fcntl is None:
+            return
+        try:
+            fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            self._fd = fd
+        except Exception:
+            self._thread_lock.release()
+            raise
+
+    def release(self):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class StripedLocks:
+    """Lock striping: mỗi key (user, file shard...) được ánh xạ vào một trong
+    N khóa, nên ghi cho các key khác nhau chạy song song còn ghi cùng key
+    được tuần tự hóa, kể cả giữa nhiều worker gunicorn."""
+
+    def __init__(self, lock_dir: str, stripes: int = 64):
+        os.makedirs(lock_dir, exist_ok=True)
+        self.stripes = max(1, stripes)
+        self._locks = [FileLock(os.path.join(lock_dir, f'stripe_{i:03d}.lock'))
+                       for i in range(self.stripes)]
+
+    def _stripe(self, key: str) -> int:
+        return zlib.crc32(key.encode('utf-8')) % self.stripes
+
+    @contextmanager
+    def hold(self, *keys: str):
+        """Giữ khóa của tất cả các key (lấy theo thứ tự stripe để tránh deadlock)"""
+        acquired: List[FileLock] = []
+        try:
+            for index in sorted({self._stripe(key) for key in keys}):
+                lock = self._locks[index]
+                lock.acquire()
+                acquired.append(lock)
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
@@ -0,0 +1,165 @@
+import hashlib
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import serializers
+from locks import FileLock
+
+
+class MockTestStore:
+    """Kết quả thi thử lưu riêng (không nằm trong progress) trong DATA_DIR/mock_tests/.
+
+    Mỗi user có một ring buffer dung lượng cố định:
+    {'capacity': c, 'total': số bài đã lưu, 'slots': [...]}; bài thứ i (đếm từ 0)
+    nằm ở slots[i % c] nên thêm bài chỉ ghi đè một ô, đọc N bài gần nhất chỉ
+    chạm N ô. Các ring được chia vào shard_count file theo hash username.
+
+    Phần bài làm chi tiết (các trường dạng dict/list như evaluation, answers)
+    được tách khỏi ring: nếu keep_sheets thì ghi thêm vào sheets.jsonl (chỉ
+    append, ô của ring giữ [offset, length]), ngược lại bị bỏ.
+    """
+
+    SHEETS_NAME = 'sheets.jsonl'
+    # File đánh dấu đã chuyển xong mock_tests cũ từ progress sang store
+    MIGRATED_NAME = 'migrated'
+
+    def __init__(self, store_dir: str, capacity: int, shard_count: int, keep_sheets: bool,
+                 load_json: Callable[[str], Any], save_json: Callable[[str, Any], None]):
+        self.store_dir = store_dir
+        self.capacity = max(1, capacity)
+        self.shard_count = max(1, shard_count)
+        self.keep_sheets = keep_sheets
+        self.sheets_file = os.path.join(store_dir, self.SHEETS_NAME)
+        self._load_json = load_json
+        self._save_json = save_json
+        self.migrated_file = os.path.join(store_dir, self.MIGRATED_NAME)
+        os.makedirs(store_dir, exist_ok=True)
+        self._sheets_lock = FileLock(os.path.join(store_dir, 'sheets.lock'))
+
+    def is_migrated(self) -> bool:
+        return os.path.exists(self.migrated_file)
+
+    def mark_migrated(self):
+        """Ghi file đánh dấu sau khi chuyển dữ liệu cũ xong (chuyển dở thì lần sau chạy lại)"""
+        with open(self.migrated_file, 'w') as f:
+            f.write('1')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _shard_file(self, username: str) -> str:
+        digest = hashlib.md5(username.encode('utf-8')).hexdigest()
+        shard = int(digest[:8], 16) % self.shard_count
+        return os.path.join(self.store_dir, f'shard_{shard:03d}.json')
+
+    def lock_key(self, username: str) -> str:
+        """Key để khóa khi thêm bài thi của user (file shard của user)"""
+        return self._shard_file(username)
+
+    def _ring(self, username: str) -> Optional[Dict[str, Any]]:
+        return (self._load_json(self._shard_file(username)) or {}).get(username)
+
+    @staticmethod
+    def _ordered(ring: Dict[str, Any], n: int) -> List[Dict[str, Any]]:
+        """n bài gần nhất của ring, cũ trước"""
+        slots, total = ring['slots'], ring['total']
+        n = min(n, len(slots))
+        records = (slots[seq % ring['capacity']] for seq in range(total - n, total))
+        return [record for record in records if record is not None]
+
+    def _resized(self, ring: Dict[str, Any]) -> Dict[str, Any]:
+        """Ring theo dung lượng hiện tại (khi đổi MOCK_TEST_CAPACITY); ô không
+        còn bài (bài cũ đã bị đẩy ra trước khi tăng dung lượng) là None"""
+        kept = self._ordered(ring, self.capacity)
+        total = ring['total']
+        slots: List[Optional[Dict[str, Any]]] = [None] * min(total, self.capacity)
+        for seq, record in zip(range(total - len(kept), total), kept):
+            slots[seq % self.capacity] = record
+        return {'capacity': self.capacity, 'total': total, 'slots': slots}
+
+    # ==================== WRITE ====================
+    def append_many(self, username: str, results: List[Tuple[Dict[str, Any], str]]) -> List[Dict[str, Any]]:
+        """Thêm các bài thi (result, completed_at) của user, trả về bản ghi đã lưu.
+        Người gọi giữ khóa lock_key(username)."""
+        shard_file = self._shard_file(username)
+        shard = dict(self._load_json(shard_file) or {})
+        ring = shard.get(username) or {'capacity': self.capacity, 'total': 0, 'slots': []}
+        if ring['capacity'] != self.capacity:
+            ring = self._resized(ring)
+        slots, total = list(ring['slots']), ring['total']
+
+        stored = []
+        for result, completed_at in results:
+            record = {key: value for key, value in result.items() if not isinstance(value, (dict, list))}
+            record.update(id=f"test_{total + 1}", completed_at=completed_at)
+            sheet = {key: value for key, value in result.items() if isinstance(value, (dict, list))}
+            if sheet and self.keep_sheets:
+                record['sheet'] = self._write_sheet(username, record['id'], sheet)
+            # Ô của bài thứ total là total % capacity (ring chưa đầy: ô cuối + 1)
+            position = total % self.capacity
+            if position < len(slots):
+                slots[position] = record
+            else:
+                slots.append(record)
+            total += 1
+            stored.append(record)
+
+        shard[username] = {'capacity': self.capacity, 'total': total, 'slots': slots}
+        self._save_json(shard_file, shard)
+        return stored
+
+    def append(self, username: str, result: Dict[str, Any], completed_at: str) -> Dict[str, Any]:
+        return self.append_many(username, [(result, completed_at)])[0]
+
+    def _write_sheet(self, username: str, test_id: str, sheet: Dict[str, Any]) -> List[int]:
+        line = serializers.dumps_bytes({'username': username, 'id': test_id, 'sheet': sheet}) + b'\n'
+        with self._sheets_lock:
+            with open(self.sheets_file, 'ab') as f:
+                offset = f.tell()
+                f.write(line)
+        return [offset, len(line)]
+
+    # ==================== READ ====================
+    @staticmethod
+    def _public(record: Dict[str, Any]) -> Dict[str, Any]:
+        if 'sheet' not in record:
+            return record
+        public = {key: value for key, value in record.items() if key != 'sheet'}
+        public['has_sheet'] = True
+        return public
+
+    def count(self, username: str) -> int:
+        """Tổng số bài thi user đã làm (kể cả bài đã bị đẩy khỏi ring)"""
+        ring = self._ring(username)
+        return ring['total'] if ring else 0
+
+    def recent(self, username: str, n: int) -> List[Dict[str, Any]]:
+        """n bài gần nhất, cũ trước"""
+        ring = self._ring(username)
+        return [self._public(record) for record in self._ordered(ring, n)] if ring else []
+
+    def page(self, username: str, cursor: Optional[int], limit: int) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Một trang mới nhất trước; cursor là số thứ tự (không gồm) của bài cũ nhất đã trả về"""
+        ring = self._ring(username)
+        if not ring:
+            return [], None
+        total, oldest = ring['total'], ring['total'] - len(ring['slots'])
+        end = total if cursor is None else min(cursor, total)
+        start = max(end - limit, oldest)
+        records = (ring['slots'][seq % ring['capacity']] for seq in range(end - 1, start - 1, -1))
+        items = [self._public(record) for record in records if record is not None]
+        return items, start if start > oldest else None
+
+    def get_sheet(self, username: str, test_id: str) -> Optional[Dict[str, Any]]:
+        """Bài thi đầy đủ (kèm bài làm chi tiết nếu còn giữ) của một bài trong ring"""
+        ring = self._ring(username)
+        record = next((record for record in ring['slots'] if record and record.get('id') == test_id),
+                      None) if ring else None
+        if record is None:
+            return None
+        result = {key: value for key, value in record.items() if key != 'sheet'}
+        if 'sheet' in record:
+            offset, length = record['sheet']
+            with open(self.sheets_file, 'rb') as f:
+                f.seek(offset)
+                result.update(serializers.loads(f.read(length))['sheet'])
+        return result
@@ -1,268 +1,655 @@
-import json
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-import random
-
-class User:
-    def __init__(self, username: str, password: str, user_type: str = 'student'):
-        self.username = username
-        self.password = password
-        self.user_type = user_type
-        self.created_at = datetime.now().isoformat()
-        self.last_login = None
-        self.progress = {}
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            'username': self.username,
-            'password': self.password,
-            'user_type': self.user_type,
-            'created_at': self.created_at,
-            'last_login': self.last_login,
-            'progress': self.progress
-        }
-
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'User':
-        user = cls(
-            username=data['username'],
-            password=data['password'],
-            user_type=data.get('user_type', 'student')
-        )
-        user.created_at = data.get('created_at', datetime.now().isoformat())
-        user.last_login = data.get('last_login')
-        user.progress = data.get('progress', {})
-        return user
-
-class Exercise:
-    def __init__(self, id: int, question: str, options: List[str], correct_answer: str,
-                 explanation: str, topic: str, difficulty: str, points: int = 10):
-        self.id = id
-        self.question = question
-        self.options = options
-        self.correct_answer = correct_answer
-        self.explanation = explanation
-        self.topic = topic
-        self.difficulty = difficulty
-        self.points = points
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            'id': self.id,
-            'question': self.question,
-            'options': self.options,
-            'correct_answer': self.correct_answer,
-            'explanation': self.explanation,
-            'topic': self.topic,
-            'difficulty': self.difficulty,
-            'points': self.points
-        }
-
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'Exercise':
-        return cls(
-            id=data['id'],
-            question=data['question'],
-            options=data['options'],
-            correct_answer=data['correct_answer'],
-            explanation=data['explanation'],
-            topic=data['topic'],
-            difficulty=data['difficulty'],
-            points=data.get('points', 10)
-        )
-
-class Progress:
-    def __init__(self, username: str):
-        self.username = username
-        self.completed_exercises: List[Dict[str, Any]] = []
-        self.game_sessions: List[Dict[str, Any]] = []
-        self.scores: Dict[str, int] = {}
-        self.weak_areas: List[str] = []
-        self.strengths: List[str] = []
-        self.last_updated = datetime.now().isoformat()
-
-    def add_completed_exercise(self, exercise_id: str, score: int, topic: str, time_spent: int):
-        self.completed_exercises.append({
-            'exercise_id': exercise_id,
-            'score': score,
-            'topic': topic,
-            'time_spent': time_spent,
-            'completed_at': datetime.now().isoformat()
-        })
-        self._update_scores(topic, score)
-        self.last_updated = datetime.now().isoformat()
-
-    def add_game_session(self, game_type: str, score: int, time_spent: int):
-        self.game_sessions.append({
-            'session_id': f"game_{len(self.game_sessions) + 1}",
-            'game_type': game_type,
-            'score': score,
-            'time_spent': time_spent,
-            'completed_at': datetime.now().isoformat()
-        })
-        self._update_scores('games', score)
-        self.last_updated = datetime.now().isoformat()
-
-    def _update_scores(self, category: str, score: int):
-        if category in self.scores:
-            self.scores[category] += score
-        else:
-            self.scores[category] = score
-
-    def get_total_score(self) -> int:
-        return sum(self.scores.values())
-
-    def get_study_time(self) -> int:
-        total_time = 0
-        for exercise in self.completed_exercises:
-            total_time += exercise.get('time_spent', 0)
-        for game in self.game_sessions:
-            total_time += game.get('time_spent', 0)
-        return total_time
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            'username': self.username,
-            'completed_exercises': self.completed_exercises,
-            'game_sessions': self.game_sessions,
-            'scores': self.scores,
-            'weak_areas': self.weak_areas,
-            'strengths': self.strengths,
-            'last_updated': self.last_updated
-        }
-
-    @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> 'Progress':
-        progress = cls(username=data['username'])
-        progress.completed_exercises = data.get('completed_exercises', [])
-        progress.game_sessions = data.get('game_sessions', [])
-        progress.scores = data.get('scores', {})
-        progress.weak_areas = data.get('weak_areas', [])
-        progress.strengths = data.get('strengths', [])
-        progress.last_updated = data.get('last_updated', datetime.now().isoformat())
-        return progress
-
-class Curriculum:
-    def __init__(self):
-        self.topics = [
-            {
-                'id': 'numbers',
-                'name': 'Số học',
-                'description': 'Học về các phép tính cộng, trừ, nhân, chia',
-                'icon': '🔢',
-                'lessons': [
-                    {'name': 'Cộng trong phạm vi 100', 'completed': False},
-                    {'name': 'Trừ trong phạm vi 100', 'completed': False},
-                    {'name': 'Bảng cửu chương', 'completed': False},
-                    {'name': 'Nhân chia cơ bản', 'completed': False}
-                ]
-            },
-            {
-                'id': 'geometry',
-                'name': 'Hình học',
-                'description': 'Nhận biết và tính toán với các hình học',
-                'icon': '🔺',
-                'lessons': [
-                    {'name': 'Hình vuông, hình chữ nhật', 'completed': False},
-                    {'name': 'Hình tròn, hình tam giác', 'completed': False},
-                    {'name': 'Chu vi các hình', 'completed': False},
-                    {'name': 'Diện tích cơ bản', 'completed': False}
-                ]
-            },
-            {
-                'id': 'measurement',
-                'name': 'Đo lường',
-                'description': 'Học về đơn vị đo lường và thời gian',
-                'icon': '📏',
-                'lessons': [
-                    {'name': 'Đơn vị đo độ dài', 'completed': False},
-                    {'name': 'Đơn vị đo khối lượng', 'completed': False},
-                    {'name': 'Đọc giờ và lịch', 'completed': False},
-                    {'name': 'Tiền Việt Nam', 'completed': False}
-                ]
-            },
-            {
-                'id': 'word_problems',
-                'name': 'Giải toán có lời văn',
-                'description': 'Ứng dụng toán học vào thực tế',
-                'icon': '📝',
-                'lessons': [
-                    {'name': 'Bài toán về nhiều hơn, ít hơn', 'completed': False},
-                    {'name': 'Bài toán về gấp lên, giảm đi', 'completed': False},
-                    {'name': 'Bài toán tìm số trung bình', 'completed': False},
-                    {'name': 'Bài toán thực tế', 'completed': False}
-                ]
-            }
-        ]
-
-def create_sample_exercises() -> List[Exercise]:
-    exercises = []
-    
-    # Bài tập số học
-    math_exercises = [
-        {
-            'question': '12 + 25 = ?',
-            'options': ['37', '36', '38', '35'],
-            'correct_answer': '37',
-            'explanation': '12 + 25 = 37. Cộng từ phải sang trái: 2 + 5 = 7, 1 + 2 = 3',
-            'topic': 'numbers',
-            'difficulty': 'dễ'
-        },
-        {
-            'question': '45 - 18 = ?',
-            'options': ['27', '26', '28', '25'],
-            'correct_answer': '27',
-            'explanation': '45 - 18 = 27. Trừ từ phải sang trái: 5 không trừ được 8, mượn 1 thành 15-8=7, 3-1=2',
-            'topic': 'numbers',
-            'difficulty': 'dễ'
-        },
-        {
-            'question': '7 × 6 = ?',
-            'options': ['42', '41', '43', '40'],
-            'correct_answer': '42',
-            'explanation': '7 × 6 = 42. Đây là phép nhân trong bảng cửu chương 7',
-            'topic': 'numbers',
-            'difficulty': 'trung bình'
-        },
-        {
-            'question': '63 ÷ 9 = ?',
-            'options': ['7', '6', '8', '9'],
-            'correct_answer': '7',
-            'explanation': '63 ÷ 9 = 7. Vì 7 × 9 = 63',
-            'topic': 'numbers',
-            'difficulty': 'trung bình'
-        }
-    ]
-    
-    # Bài tập hình học
-    geometry_exercises = [
-        {
-            'question': 'Hình nào có 4 cạnh bằng nhau?',
-            'options': ['Hình vuông', 'Hình chữ nhật', 'Hình tam giác', 'Hình tròn'],
-            'correct_answer': 'Hình vuông',
-            'explanation': 'Hình vuông có 4 cạnh bằng nhau và 4 góc vuông',
-            'topic': 'geometry',
-            'difficulty': 'dễ'
-        }
-    ]
-    
-    # Thêm bài tập vào danh sách
-    for i, ex in enumerate(math_exercises + geometry_exercises):
-        exercises.append(Exercise(
-            id=i + 1,
-            question=ex['question'],
-            options=ex['options'],
-            correct_answer=ex['correct_answer'],
-            explanation=ex['explanation'],
-            topic=ex['topic'],
-            difficulty=ex['difficulty']
-        ))
-    
-    return exercises
-
-def validate_user_data(user_data: Dict[str, Any]) -> bool:
-    required_fields = ['username', 'password']
-    for field in required_fields:
-        if field not in user_data or not user_data[field]:
-            return False
-    return len(user_data['username']) >= 3 and len(user_data['password']) >= 3
\ No newline at end of file
+import copy
+import json
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+import random
+from itertools import chain
+
+from attempt_history import AttemptHistory
+from serializers import register
+
+# Số ngày giữ điểm theo ngày (đủ cho bảng xếp hạng tuần/tháng)
+DAILY_SCORE_RETENTION_DAYS = 40
+
+# Điểm tối thiểu để một bài được tính là làm đạt (tỉ lệ chính xác trên dashboard)
+PASS_SCORE = 5
+
+# Số mốc version giữ lại để tính delta (client cũ hơn thì nhận lại toàn bộ)
+VERSION_MARKS_KEPT = 500
+
+class User:
+    __slots__ = ('username', 'password', 'user_type', 'created_at', 'last_login', 'login_count', 'progress')
+
+    def __init__(self, username: str, password: str, user_type: str = 'student'):
+        self.username = username
+        self.password = password
+        self.user_type = user_type
+        self.created_at = datetime.now().isoformat()
+        self.last_login = None
+        self.login_count = 0
+        self.progress = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'username': self.username,
+            'password': self.password,
+            'user_type': self.user_type,
+            'created_at': self.created_at,
+            'last_login': self.last_login,
+            'login_count': self.login_count,
+            'progress': self.progress
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'User':
+        user = cls(
+            username=data['username'],
+            password=data['password'],
+            user_type=data.get('user_type', 'student')
+        )
+        user.created_at = data.get('created_at', datetime.now().isoformat())
+        user.last_login = data.get('last_login')
+        user.login_count = data.get('login_count', 0)
+        user.progress = data.get('progress', {})
+        return user
+
+class Exercise:
+    __slots__ = ('id', 'question', 'options', 'correct_answer', 'explanation', 'topic', 'difficulty', 'points')
+
+    def __init__(self, id: int, question: str, options: List[str], correct_answer: str,
+                 explanation: str, topic: str, difficulty: str, points: int = 10):
+        self.id = id
+        self.question = question
+        self.options = options
+        self.correct_answer = correct_answer
+        self.explanation = explanation
+        self.topic = topic
+        self.difficulty = difficulty
+        self.points = points
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'question': self.question,
+            'options': self.options,
+            'correct_answer': self.correct_answer,
+            'explanation': self.explanation,
+            'topic': self.topic,
+            'difficulty': self.difficulty,
+            'points': self.points
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Exercise':
+        return cls(
+            id=data['id'],
+            question=data['question'],
+            options=data['options'],
+            correct_answer=data['correct_answer'],
+            explanation=data['explanation'],
+            topic=data['topic'],
+            difficulty=data['difficulty'],
+            points=data.get('points', 10)
+        )
+
+class Progress:
+    __slots__ = ('username', 'completed_exercises', 'game_sessions', 'scores', 'weak_areas', 'strengths',
+                 'daily_scores', 'study_time', 'attempts_by_topic', 'correct_by_topic', 'passed_by_topic',
+                 'last_activity', 'last_updated', 'version', 'version_marks', 'rollups')
+
+    def __init__(self, username: str):
+        self.username = username
+        self.completed_exercises = AttemptHistory.for_exercises()
+        self.game_sessions = AttemptHistory.for_games()
+        self.scores: Dict[str, int] = {}
+        self.weak_areas: List[str] = []
+        self.strengths: List[str] = []
+        self.daily_scores: Dict[str, int] = {}  # 'YYYY-MM-DD' -> điểm trong ngày
+        # Số liệu cộng dồn, cập nhật mỗi lần thêm bài/game để không phải duyệt lịch sử
+        self.study_time = 0
+        self.attempts_by_topic: Dict[str, int] = {}
+        self.correct_by_topic: Dict[str, int] = {}
+        self.passed_by_topic: Dict[str, int] = {}  # số bài đạt (score >= PASS_SCORE)
+        self.last_activity: Optional[str] = None
+        self.last_updated = datetime.now().isoformat()
+        # Tăng 1 mỗi lần thêm bài/game; version_marks: [version, số bài, số game]
+        # (tính cả phần đã gộp) tại các version gần nhất để biết client đã có
+        # tới đâu trong lịch sử
+        self.version = 0
+        self.version_marks: List[List[int]] = []
+        # Lịch sử cũ đã gộp theo ngày + chủ đề (xem roll_up):
+        # {'exercises' | 'games': {'count': số bản ghi, 'days': {ngày: {chủ đề: [lượt, đúng, đạt, điểm, thời gian]}}}}
+        self.rollups: Dict[str, Dict[str, Any]] = {}
+
+    def add_completed_exercise(self, exercise_id: str, score: int, topic: str, time_spent: int,
+                               completed_at: Optional[str] = None):
+        completed_at = completed_at or datetime.now().isoformat()
+        self.completed_exercises.append({
+            'exercise_id': exercise_id,
+            'score': score,
+            'topic': topic,
+            'time_spent': time_spent,
+            'completed_at': completed_at
+        })
+        self._update_scores(topic, score)
+        self._add_daily_score(completed_at, score)
+        self._add_attempt(topic, score)
+        self._add_activity(time_spent, completed_at)
+        self.last_updated = completed_at
+        exercises, games = self.get_exercises_completed(), self.get_games_played()
+        self.version = self.advance_version(self.version_marks, self.version,
+                                            (exercises - 1, games), (exercises, games))
+
+    def add_game_session(self, game_type: str, score: int, time_spent: int,
+                         completed_at: Optional[str] = None):
+        completed_at = completed_at or datetime.now().isoformat()
+        self.game_sessions.append({
+            'session_id': f"game_{self.get_games_played() + 1}",
+            'game_type': game_type,
+            'score': score,
+            'time_spent': time_spent,
+            'completed_at': completed_at
+        })
+        self._update_scores('games', score)
+        self._add_daily_score(completed_at, score)
+        self._add_activity(time_spent, completed_at)
+        self.last_updated = completed_at
+        exercises, games = self.get_exercises_completed(), self.get_games_played()
+        self.version = self.advance_version(self.version_marks, self.version,
+                                            (exercises, games - 1), (exercises, games))
+
+    @staticmethod
+    def advance_version(marks: List[List[int]], version: int, before: Tuple[int, int],
+                        after: Tuple[int, int]) -> int:
+        """Ghi mốc cho version mới vào marks (sửa tại chỗ), trả về version mới.
+        before / after: (số bài, số game) trước và sau thay đổi"""
+        if not marks or marks[-1][0] != version:
+            # Thay đổi đầu tiên được theo dõi (document cũ): ghi cả mốc trước đó
+            marks.append([version, *before])
+        marks.append([version + 1, *after])
+        if len(marks) > VERSION_MARKS_KEPT:
+            del marks[:len(marks) - VERSION_MARKS_KEPT]
+        return version + 1
+
+    def _update_scores(self, category: str, score: int):
+        if category in self.scores:
+            self.scores[category] += score
+        else:
+            self.scores[category] = score
+
+    def _add_attempt(self, topic: str, score: int):
+        self.attempts_by_topic[topic] = self.attempts_by_topic.get(topic, 0) + 1
+        if score > 0:
+            self.correct_by_topic[topic] = self.correct_by_topic.get(topic, 0) + 1
+        if score >= PASS_SCORE:
+            self.passed_by_topic[topic] = self.passed_by_topic.get(topic, 0) + 1
+
+    def _add_activity(self, time_spent: int, completed_at: str):
+        self.study_time += time_spent or 0
+        if not self.last_activity or completed_at > self.last_activity:
+            self.last_activity = completed_at
+
+    def _rebuild_aggregates(self):
+        """Tính lại các số liệu cộng dồn từ lịch sử (migration cho dữ liệu cũ)"""
+        self.study_time = 0
+        self.attempts_by_topic = {}
+        self.correct_by_topic = {}
+        self.passed_by_topic = {}
+        self.last_activity = None
+        for exercise in self.completed_exercises:
+            self._add_attempt(exercise.get('topic', 'general'), exercise.get('score', 0))
+            self._add_activity(exercise.get('time_spent', 0), exercise.get('completed_at') or '')
+        for game in self.game_sessions:
+            self._add_activity(game.get('time_spent', 0), game.get('completed_at') or '')
+        self.last_activity = self.last_activity or None
+
+    def _add_daily_score(self, completed_at: str, score: int):
+        """Cộng điểm vào bucket của ngày và bỏ các bucket quá cũ"""
+        day = completed_at[:10]
+        self.daily_scores[day] = self.daily_scores.get(day, 0) + score
+        cutoff = (datetime.fromisoformat(day) - timedelta(days=DAILY_SCORE_RETENTION_DAYS)).date().isoformat()
+        for old_day in [d for d in self.daily_scores if d < cutoff]:
+            del self.daily_scores[old_day]
+
+    @staticmethod
+    def _daily_scores_from_history(records) -> Dict[str, int]:
+        """Tính lại điểm theo ngày từ lịch sử (dữ liệu cũ chưa có daily_scores)"""
+        cutoff = (datetime.now() - timedelta(days=DAILY_SCORE_RETENTION_DAYS)).date().isoformat()
+        daily_scores: Dict[str, int] = {}
+        for record in records:
+            day = (record.get('completed_at') or '')[:10]
+            if day >= cutoff:
+                daily_scores[day] = daily_scores.get(day, 0) + record.get('score', 0)
+        return daily_scores
+
+    def get_total_score(self) -> int:
+        return sum(self.scores.values())
+
+    def get_study_time(self) -> int:
+        return self.study_time
+
+    def get_exercises_completed(self) -> int:
+        return self.rolled_up_count('exercises') + len(self.completed_exercises)
+
+    def get_games_played(self) -> int:
+        return self.rolled_up_count('games') + len(self.game_sessions)
+
+    def rolled_up_count(self, kind: str) -> int:
+        """Số bản ghi 'exercises' / 'games' đã gộp vào rollups"""
+        return self.rollups.get(kind, {}).get('count', 0)
+
+    # Loại rollup -> lịch sử tương ứng
+    ROLLUP_KINDS = {'exercises': 'completed_exercises', 'games': 'game_sessions'}
+
+    def roll_up(self, before_day: str) -> int:
+        """Gộp các bài/game của những ngày trước before_day ('YYYY-MM-DD') vào
+        rollups, lịch sử chi tiết chỉ còn phần gần đây. Trả về số bản ghi đã gộp.
+
+        Bản ghi cũ ở bất kỳ vị trí nào cũng được gộp (lượt làm offline gửi bù
+        có completed_at cũ nằm sau các bản ghi mới hơn). Các số liệu cộng dồn
+        (scores, attempts_by_topic, study_time...) và version không đổi; mốc
+        version của client chưa có đủ các bản ghi bị gộp được bỏ (xem
+        drop_version_marks_before) để client đó tải lại toàn bộ thay vì nhận
+        delta lệch vị trí.
+        """
+        rollups = None
+        rolled = 0
+        thresholds = [0, 0]
+        for column, (kind, field) in enumerate(self.ROLLUP_KINDS.items()):
+            history = getattr(self, field)
+            old = [index for index, record in enumerate(history)
+                   if (record.get('completed_at') or '')[:10] < before_day]
+            if not old:
+                continue
+            count = len(old)
+            if rollups is None:
+                # Copy-on-write: dict gốc có thể nằm trong cache
+                rollups = copy.deepcopy(self.rollups)
+            bucket = rollups.setdefault(kind, {'count': 0, 'days': {}})
+            thresholds[column] = bucket['count'] + old[-1] + 1
+            for index in old:
+                record = history[index]
+                day = (record.get('completed_at') or '')[:10] or 'unknown'
+                category = record.get(history.category_field) or 'general'
+                entry = bucket['days'].setdefault(day, {}).setdefault(category, [0, 0, 0, 0, 0])
+                score = record.get('score', 0) or 0
+                entry[0] += 1
+                entry[1] += 1 if score > 0 else 0
+                entry[2] += 1 if score >= PASS_SCORE else 0
+                entry[3] += score
+                entry[4] += record.get('time_spent', 0) or 0
+            bucket['count'] += count
+            if old[-1] + 1 == count:
+                recent = history[count:]
+            else:
+                old_set = set(old)
+                recent = [record for index, record in enumerate(history) if index not in old_set]
+            setattr(self, field, AttemptHistory(history.fields, history.id_field, history.category_field, recent))
+            rolled += count
+
+        if rolled:
+            self.rollups = rollups
+            self.version_marks = self.drop_version_marks_before(self.version_marks, *thresholds)
+        return rolled
+
+    @staticmethod
+    def drop_version_marks_before(marks: List[List[int]], exercises: int, games: int) -> List[List[int]]:
+        """Bỏ các mốc có ít hơn (exercises, games) bản ghi: các bản ghi từ vị trí đó
+        đã bị gộp nên vị trí trong lịch sử chi tiết của mốc không còn đúng.
+        Số đếm của các mốc tăng dần nên phần bị bỏ luôn là đoạn đầu"""
+        return [mark for mark in marks if mark[1] >= exercises and mark[2] >= games]
+
+    def get_accuracy(self, topic: str) -> float:
+        """Tỉ lệ làm đúng (0-1) của một chủ đề"""
+        attempts = self.attempts_by_topic.get(topic, 0)
+        return self.correct_by_topic.get(topic, 0) / attempts if attempts else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = self.to_storage_dict(columnar=False)
+        del data['version_marks']  # chỉ dùng nội bộ để tính delta
+        data['exercises_completed'] = self.get_exercises_completed()
+        data['games_played'] = self.get_games_played()
+        return data
+
+    # Khóa lưu lịch sử dạng cột trong document (thay cho list dict)
+    HISTORY_KEYS = {'completed_exercises': 'exercise_history', 'game_sessions': 'game_history'}
+
+    def to_storage_dict(self, columnar: bool = False) -> Dict[str, Any]:
+        """Dạng lưu xuống storage: như to_dict, hoặc lịch sử mã hóa dạng cột (nhỏ hơn nhiều)"""
+        if columnar:
+            history = {'exercise_history': self.completed_exercises.encode(),
+                       'game_history': self.game_sessions.encode()}
+        else:
+            history = {'completed_exercises': self.completed_exercises.to_list(),
+                       'game_sessions': self.game_sessions.to_list()}
+        return {
+            'username': self.username,
+            **history,
+            **self._state_fields(),
+            'rollups': self.rollups,
+            'version_marks': self.version_marks
+        }
+
+    def to_summary_dict(self) -> Dict[str, Any]:
+        """Chỉ các số liệu tổng hợp (cho dashboard), không kèm lịch sử"""
+        return {
+            'username': self.username,
+            'total_score': self.get_total_score(),
+            'exercises_completed': self.get_exercises_completed(),
+            'games_played': self.get_games_played(),
+            'study_time': self.study_time,
+            'scores': self.scores,
+            'weak_areas': self.weak_areas,
+            'strengths': self.strengths,
+            'attempts_by_topic': self.attempts_by_topic,
+            'correct_by_topic': self.correct_by_topic,
+            'passed_by_topic': self.passed_by_topic,
+            'last_activity': self.last_activity,
+            'last_updated': self.last_updated,
+            'version': self.version
+        }
+
+    def _state_fields(self) -> Dict[str, Any]:
+        """Các trường ngoài lịch sử làm bài (gửi lại đủ trong mỗi delta)"""
+        return {
+            'scores': self.scores,
+            'weak_areas': self.weak_areas,
+            'strengths': self.strengths,
+            'daily_scores': self.daily_scores,
+            'study_time': self.study_time,
+            'attempts_by_topic': self.attempts_by_topic,
+            'correct_by_topic': self.correct_by_topic,
+            'passed_by_topic': self.passed_by_topic,
+            'last_activity': self.last_activity,
+            'last_updated': self.last_updated,
+            'version': self.version
+        }
+
+    def history_lengths_at(self, version: int) -> Optional[Tuple[int, int]]:
+        """(số bài, số game) trong lịch sử chi tiết tại version, None nếu mốc
+        đó không còn giữ hoặc một phần đã được gộp vào rollups"""
+        marks = self.version_marks
+        if not marks:
+            return None
+        # Các mốc có version liên tiếp nên tra trực tiếp theo vị trí
+        position = version - marks[0][0]
+        if not (0 <= position < len(marks) and marks[position][0] == version):
+            return None
+        exercises = marks[position][1] - self.rolled_up_count('exercises')
+        games = marks[position][2] - self.rolled_up_count('games')
+        if exercises < 0 or games < 0:
+            return None
+        return exercises, games
+
+    def changes_since(self, version: int) -> Optional[Dict[str, Any]]:
+        """Thay đổi sau version của client: None nếu không có gì mới; nếu không
+        tính được delta (version quá cũ / không hợp lệ) thì trả về toàn bộ"""
+        if version == self.version:
+            return None
+        lengths = self.history_lengths_at(version)
+        if lengths is None:
+            return {'full': True, 'progress': self.to_dict()}
+        exercises, games = lengths
+        return self.delta(version, self.completed_exercises[exercises:], self.game_sessions[games:])
+
+    def delta(self, since: int, completed_exercises: List[Dict[str, Any]],
+              game_sessions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Delta từ version since: phần lịch sử mới cùng toàn bộ các trường còn lại"""
+        return {
+            'full': False,
+            'since': since,
+            'completed_exercises': completed_exercises,
+            'game_sessions': game_sessions,
+            'exercises_completed': self.get_exercises_completed(),
+            'games_played': self.get_games_played(),
+            **self._state_fields()
+        }
+
+    # Các trường cộng dồn lưu cùng document (thiếu thì tính lại từ lịch sử)
+    AGGREGATE_FIELDS = ('study_time', 'attempts_by_topic', 'correct_by_topic', 'last_activity')
+
+    @classmethod
+    def needs_migration(cls, data: Dict[str, Any]) -> bool:
+        """Document cũ chưa có các số liệu cộng dồn"""
+        return ('daily_scores' not in data or 'passed_by_topic' not in data
+                or any(field not in data for field in cls.AGGREGATE_FIELDS))
+
+    @classmethod
+    def history_from_dict(cls, data: Dict[str, Any], field: str) -> AttemptHistory:
+        """Lịch sử completed_exercises / game_sessions của document (không dựng cả Progress)"""
+        source = data.get(cls.HISTORY_KEYS[field]) or data.get(field)
+        if field == 'game_sessions':
+            return AttemptHistory.for_games(source)
+        return AttemptHistory.for_exercises(source)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Progress':
+        # Không gọi __init__: mọi slot đều được gán bên dưới
+        progress = cls.__new__(cls)
+        progress.username = data['username']
+        progress.completed_exercises = cls.history_from_dict(data, 'completed_exercises')
+        progress.game_sessions = cls.history_from_dict(data, 'game_sessions')
+        progress.scores = data.get('scores', {})
+        progress.weak_areas = data.get('weak_areas', [])
+        progress.strengths = data.get('strengths', [])
+        if 'daily_scores' in data:
+            progress.daily_scores = data['daily_scores']
+        else:
+            progress.daily_scores = cls._daily_scores_from_history(
+                chain(progress.completed_exercises, progress.game_sessions)
+            )
+        if all(field in data for field in cls.AGGREGATE_FIELDS):
+            progress.study_time = data['study_time']
+            progress.attempts_by_topic = data['attempts_by_topic']
+            progress.correct_by_topic = data['correct_by_topic']
+            progress.last_activity = data['last_activity']
+            progress.passed_by_topic = data['passed_by_topic'] if 'passed_by_topic' in data else None
+        else:
+            progress._rebuild_aggregates()
+        progress.last_updated = data['last_updated'] if 'last_updated' in data else datetime.now().isoformat()
+        progress.version = data.get('version', 0)
+        progress.version_marks = data.get('version_marks', [])
+        progress.rollups = data.get('rollups', {})
+        if progress.passed_by_topic is None:
+            progress.passed_by_topic = progress._passed_from_history()
+        return progress
+
+    def _passed_from_history(self) -> Dict[str, int]:
+        """Số bài đạt theo chủ đề cho document ghi trước khi có passed_by_topic
+        (lịch sử chi tiết + số bài đạt đã gộp vào rollups)"""
+        passed: Dict[str, int] = {}
+        for days in (self.rollups.get('exercises', {}).get('days') or {}).values():
+            for topic, entry in days.items():
+                if entry[2]:
+                    passed[topic] = passed.get(topic, 0) + entry[2]
+        for exercise in self.completed_exercises:
+            if (exercise.get('score', 0) or 0) >= PASS_SCORE:
+                topic = exercise.get('topic', 'general')
+                passed[topic] = passed.get(topic, 0) + 1
+        return passed
+
+class Curriculum:
+    __slots__ = ('topics',)
+
+    def __init__(self):
+        self.topics = [
+            {
+                'id': 'numbers',
+                'name': 'Số học',
+                'description': 'Học về các phép tính cộng, trừ, nhân, chia',
+                'icon': '🔢',
+                'lessons': [
+                    {'name': 'Cộng trong phạm vi 100', 'completed': False},
+                    {'name': 'Trừ trong phạm vi 100', 'completed': False},
+                    {'name': 'Bảng cửu chương', 'completed': False},
+                    {'name': 'Nhân chia cơ bản', 'completed': False}
+                ]
+            },
+            {
+                'id': 'geometry',
+                'name': 'Hình học',
+                'description': 'Nhận biết và tính toán với các hình học',
+                'icon': '🔺',
+                'lessons': [
+                    {'name': 'Hình vuông, hình chữ nhật', 'completed': False},
+                    {'name': 'Hình tròn, hình tam giác', 'completed': False},
+                    {'name': 'Chu vi các hình', 'completed': False},
+                    {'name': 'Diện tích cơ bản', 'completed': False}
+                ]
+            },
+            {
+                'id': 'measurement',
+                'name': 'Đo lường',
+                'description': 'Học về đơn vị đo lường và thời gian',
+                'icon': '📏',
+                'lessons': [
+                    {'name': 'Đơn vị đo độ dài', 'completed': False},
+                    {'name': 'Đơn vị đo khối lượng', 'completed': False},
+                    {'name': 'Đọc giờ và lịch', 'completed': False},
+                    {'name': 'Tiền Việt Nam', 'completed': False}
+                ]
+            },
+            {
+                'id': 'word_problems',
+                'name': 'Giải toán có lời văn',
+                'description': 'Ứng dụng toán học vào thực tế',
+                'icon': '📝',
+                'lessons': [
+                    {'name': 'Bài toán về nhiều hơn, ít hơn', 'completed': False},
+                    {'name': 'Bài toán về gấp lên, giảm đi', 'completed': False},
+                    {'name': 'Bài toán tìm số trung bình', 'completed': False},
+                    {'name': 'Bài toán thực tế', 'completed': False}
+                ]
+            }
+        ]
+
+# Đăng ký các model với serializer chung (jsonify, ghi file, msgpack)
+register(User)
+register(Exercise)
+register(Progress)
+register(AttemptHistory, AttemptHistory.to_list)
+
+def create_sample_exercises() -> List[Exercise]:
+    exercises = []
+    
+    # Bài tập số học
+    math_exercises = [
+        {
+            'question': '12 + 25 = ?',
+            'options': ['37', '36', '38', '35'],
+            'correct_answer': '37',
+            'explanation': '12 + 25 = 37. Cộng từ phải sang trái: 2 + 5 = 7, 1 + 2 = 3',
+            'topic': 'numbers',
+            'difficulty': 'dễ'
+        },
+        {
+            'question': '45 - 18 = ?',
+            'options': ['27', '26', '28', '25'],
+            'correct_answer': '27',
+            'explanation': '45 - 18 = 27. Trừ từ phải sang trái: 5 không trừ được 8, mượn 1 thành 15-8=7, 3-1=2',
+            'topic': 'numbers',
+            'difficulty': 'dễ'
+        },
+        {
+            'question': '7 × 6 = ?',
+            'options': ['42', '41', '43', '40'],
+            'correct_answer': '42',
+            'explanation': '7 × 6 = 42. Đây là phép nhân trong bảng cửu chương 7',
+            'topic': 'numbers',
+            'difficulty': 'trung bình'
+        },
+        {
+            'question': '63 ÷ 9 = ?',
+            'options': ['7', '6', '8', '9'],
+            'correct_answer': '7',
+            'explanation': '63 ÷ 9 = 7. Vì 7 × 9 = 63',
+            'topic': 'numbers',
+            'difficulty': 'trung bình'
+        }
+    ]
+    
+    # Bài tập hình học
+    geometry_exercises = [
+        {
+            'question': 'Hình nào có 4 cạnh bằng nhau?',
+            'options': ['Hình vuông', 'Hình chữ nhật', 'Hình tam giác', 'Hình tròn'],
+            'correct_answer': 'Hình vuông',
+            'explanation': 'Hình vuông có 4 cạnh bằng nhau và 4 góc vuông',
+            'topic': 'geometry',
+            'difficulty': 'dễ'
+        }
+    ]
+    
+    # Thêm bài tập vào danh sách
+    for i, ex in enumerate(math_exercises + geometry_exercises):
+        exercises.append(Exercise(
+            id=i + 1,
+            question=ex['question'],
+            options=ex['options'],
+            correct_answer=ex['correct_answer'],
+            explanation=ex['explanation'],
+            topic=ex['topic'],
+            difficulty=ex['difficulty']
+        ))
+    
+    return exercises
+
+def validate_user_data(user_data: Dict[str, Any]) -> bool:
+    required_fields = ['username', 'password']
+    for field in required_fields:
+        if field not in user_data or not user_data[field]:
+            return False
+    return len(user_data['username']) >= 3 and len(user_data['password']) >= 3
+
+
+def parse_progress_attempt(attempt: Any) -> Dict[str, Any]:
+    """Kiểm tra và chuẩn hóa một lượt làm bài / chơi game gửi lên theo batch
+    (ValueError nếu không hợp lệ)"""
+    if not isinstance(attempt, dict):
+        raise ValueError('Lượt làm bài phải là object')
+    username = attempt.get('username')
+    if not isinstance(username, str) or not username:
+        raise ValueError('Thiếu username')
+    if 'exercise_id' not in attempt:
+        raise ValueError('Thiếu exercise_id')
+    exercise_id = attempt['exercise_id']
+    if not isinstance(exercise_id, (str, int)) or isinstance(exercise_id, bool) or exercise_id == '':
+        raise ValueError('exercise_id phải là chuỗi hoặc số')
+    if 'score' not in attempt:
+        raise ValueError('Thiếu score')
+    topic = attempt.get('topic', 'general')
+    if not isinstance(topic, str) or not topic:
+        raise ValueError('topic phải là chuỗi')
+    score = attempt['score']
+    time_spent = attempt.get('time_spent', 60)
+    values = {}
+    for name, value in (('score', score), ('time_spent', time_spent)):
+        # Số từ client JS có thể gửi dạng 5.0
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        if type(value) is not int or value < 0:
+            raise ValueError(f'{name} phải là số nguyên không âm')
+        values[name] = value
+    score, time_spent = values['score'], values['time_spent']
+
+    completed_at = attempt.get('completed_at')
+    if completed_at is not None:
+        try:
+            when = datetime.fromisoformat(str(completed_at).replace('Z', '+00:00'))
+        except ValueError:
+            raise ValueError('completed_at không đúng định dạng ISO 8601')
+        if when.tzinfo is not None:
+            # Lưu như datetime.now(): giờ địa phương không kèm múi giờ
+            when = when.astimezone().replace(tzinfo=None)
+        if when > datetime.now() + timedelta(minutes=5):
+            raise ValueError('completed_at nằm trong tương lai')
+        completed_at = when.isoformat()
+
+    return {
+        'username': username,
+        'exercise_id': exercise_id,
+        'score': score,
+        'time_spent': time_spent,
+        'topic': topic,
+        'completed_at': completed_at
+    }
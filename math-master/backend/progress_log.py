@@ -0,0 +1,259 @@
+import atexit
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+import serializers
+from locks import FileLock
+
+
+class ProgressEventLog:
+    """Log append-only (JSONL) cho các thay đổi tiến độ học tập.
+
+    Mỗi bài làm / game / bài thi thử được ghi thành một dòng vào cuối file,
+    chi phí O(kích thước sự kiện). Một thread nền định kỳ gộp (compact) log
+    vào snapshot progress.json thông qua hàm fold do DatabaseManager cung cấp.
+    Trong lúc chờ gộp, các sự kiện được giữ trong bộ nhớ theo từng user để
+    get_progress có thể replay snapshot + phần đuôi log.
+
+    Mỗi sự kiện có số thứ tự seq tăng dần; snapshot lưu log_seq của sự kiện
+    cuối cùng đã gộp cho từng user nên việc gộp lại sau khi crash không bị
+    áp dụng trùng.
+
+    Dùng chung được giữa nhiều worker (gunicorn): ghi log giữ khóa file
+    (.lock), trước khi ghi đọc nốt phần đuôi do worker khác ghi nên seq lấy
+    từ chính file log (log mới sau compact bắt đầu bằng một dòng checkpoint
+    chứa seq cuối cùng). Compact giữ khóa riêng (.compact.lock) suốt lúc đổi
+    tên và gộp, nên chỉ một worker gộp một lần và không mất dòng nào được
+    ghi trong lúc đó. Các worker khác thấy log đã được đổi tên (inode khác)
+    và chuyển phần đã đọc sang nhóm đang gộp.
+    """
+
+    def __init__(self, log_file: str, fold: Callable[[List[Dict[str, Any]]], None],
+                 start_seq: int = 0, compact_interval: float = 30.0, compact_events: int = 1000):
+        self.log_file = log_file
+        self.compacting_file = log_file + '.compacting'
+        self._fold = fold
+        self.compact_interval = compact_interval
+        self.compact_events = compact_events
+
+        self._lock = threading.Lock()
+        self._append_lock = FileLock(log_file + '.lock')
+        self._compact_lock = FileLock(log_file + '.compact.lock')
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._seq = start_seq
+        self._pending: Dict[str, List[Dict[str, Any]]] = {}
+        self._compacting: Dict[str, List[Dict[str, Any]]] = {}
+        self._pending_count = 0
+        self._reader = None
+        self._offset = 0
+
+        self._recover()
+        self._fh = open(self.log_file, 'ab')
+        with self._lock:
+            self._sync()
+
+        self._thread = threading.Thread(target=self._run, name='progress-log-compactor', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ==================== RECOVERY ====================
+    @staticmethod
+    def _parse_lines(lines: List[bytes], source: str) -> List[Dict[str, Any]]:
+        events = []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                events.append(serializers.loads(line))
+            except json.JSONDecodeError:
+                # Dòng cuối có thể bị ghi dở khi crash
+                print(f"⚠️ Bỏ qua dòng log hỏng trong {source}")
+        return events
+
+    @classmethod
+    def _read_events(cls, file_path: str) -> List[Dict[str, Any]]:
+        if not os.path.exists(file_path):
+            return []
+        with open(file_path, 'rb') as f:
+            return cls._parse_lines(f.read().split(b'\n'), file_path)
+
+    def _fold_leftover(self) -> int:
+        """Gộp file .compacting còn lại (compact bị crash hoặc fold lỗi lần trước).
+        Người gọi giữ _compact_lock."""
+        if not os.path.exists(self.compacting_file):
+            return 0
+        events = [event for event in self._read_events(self.compacting_file) if event.get('type') != self.CHECKPOINT]
+        if events:
+            self._fold(events)
+        os.remove(self.compacting_file)
+        return len(events)
+
+    def _recover(self):
+        """Gộp lần compact dở dang (phần đuôi log được nạp ở _sync)"""
+        with self._compact_lock:
+            self._fold_leftover()
+
+    # ==================== ĐỌC PHẦN ĐUÔI LOG ====================
+    CHECKPOINT = 'checkpoint'
+
+    def _add_events(self, events: List[Dict[str, Any]]):
+        for event in events:
+            self._seq = max(self._seq, event.get('seq', 0))
+            if event.get('type') == self.CHECKPOINT:
+                continue
+            self._pending.setdefault(event['username'], []).append(event)
+            self._pending_count += 1
+
+    def _read_tail(self):
+        """Đọc các dòng đầy đủ mới được ghi (của mọi worker) từ vị trí đã đọc"""
+        self._reader.seek(self._offset)
+        data = self._reader.read()
+        end = data.rfind(b'\n') + 1
+        if end:
+            self._offset += end
+            self._add_events(self._parse_lines(data[:end].split(b'\n'), self.log_file))
+
+    def _sync(self):
+        """Bắt kịp file log: đọc phần đuôi mới, xử lý việc log bị worker khác
+        đổi tên sang .compacting. Người gọi giữ _lock."""
+        if self._reader is not None:
+            try:
+                rotated = os.stat(self.log_file).st_ino != os.fstat(self._reader.fileno()).st_ino
+            except FileNotFoundError:
+                rotated = True
+            if rotated:
+                # Đọc nốt file cũ (đã thành .compacting) rồi chuyển sang nhóm đang gộp
+                self._read_tail()
+                self._reader.close()
+                self._reader = None
+                for username, events in self._pending.items():
+                    self._compacting.setdefault(username, []).extend(events)
+                self._pending = {}
+                self._pending_count = 0
+        if self._compacting and not os.path.exists(self.compacting_file):
+            # Worker khác đã gộp xong vào snapshot
+            self._compacting = {}
+        if self._reader is None:
+            try:
+                self._reader = open(self.log_file, 'rb')
+            except FileNotFoundError:
+                return
+            self._offset = 0
+        self._read_tail()
+
+    # ==================== WRITE PATH ====================
+    def append(self, event_type: str, username: str, **data) -> Dict[str, Any]:
+        """Ghi một sự kiện vào cuối log"""
+        return self.append_many([(event_type, username, data)])[0]
+
+    def append_many(self, entries: List[Tuple[str, str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Ghi nhiều sự kiện (event_type, username, data) bằng một lần write"""
+        with self._lock, self._append_lock:
+            self._sync()
+            if self._reader is None or os.fstat(self._fh.fileno()).st_ino != os.fstat(self._reader.fileno()).st_ino:
+                # Log đã được đổi tên: ghi vào file log mới
+                self._fh.close()
+                self._fh = open(self.log_file, 'ab')
+                self._sync()
+            now = datetime.now().isoformat()
+            events = []
+            for event_type, username, data in entries:
+                events.append({
+                    'seq': self._seq + len(events) + 1,
+                    'type': event_type,
+                    'username': username,
+                    'ts': now,
+                    **data
+                })
+            payload = ''.join(serializers.dumps(event) + '\n' for event in events).encode('utf-8')
+            if os.fstat(self._fh.fileno()).st_size > self._offset:
+                # Còn dòng ghi dở (worker crash giữa lúc ghi): kết thúc nó để không dính vào dòng mới
+                payload = b'\n' + payload
+            self._fh.write(payload)
+            self._fh.flush()
+            # Đang giữ khóa ghi và đã đọc hết file trước đó nên payload nằm ngay sau _offset
+            self._offset += len(payload)
+            self._add_events(events)
+            should_compact = self._pending_count >= self.compact_events
+
+        if should_compact:
+            self._wakeup.set()
+        return events
+
+    # ==================== READ PATH ====================
+    def events_for(self, username: str) -> List[Dict[str, Any]]:
+        """Các sự kiện của user chưa có trong snapshot (theo thứ tự seq)"""
+        with self._lock:
+            self._sync()
+            return self._compacting.get(username, []) + self._pending.get(username, [])
+
+    def pending_usernames(self) -> List[str]:
+        """Các user có sự kiện chưa được gộp"""
+        with self._lock:
+            self._sync()
+            return list(set(self._compacting) | set(self._pending))
+
+    # ==================== COMPACTION ====================
+    def compact(self) -> int:
+        """Gộp toàn bộ log hiện tại vào snapshot, trả về số sự kiện đã gộp"""
+        with self._compact_lock:
+            try:
+                leftover = self._fold_leftover()
+            except Exception as e:
+                print(f"❌ Progress log compaction error: {e}")
+                return 0
+
+            with self._lock, self._append_lock:
+                self._sync()
+                if not self._pending_count:
+                    return leftover
+                os.replace(self.log_file, self.compacting_file)
+                self._fh.close()
+                self._fh = open(self.log_file, 'ab')
+                # Worker khởi động sau khi log này được gộp vẫn lấy được seq cuối cùng
+                self._fh.write((serializers.dumps({'seq': self._seq, 'type': self.CHECKPOINT}) + '\n').encode('utf-8'))
+                self._fh.flush()
+                self._sync()
+                count = leftover + sum(len(events) for events in self._compacting.values())
+                events = sorted((e for evs in self._compacting.values() for e in evs),
+                                key=lambda e: e['seq'])
+
+            try:
+                self._fold(events)
+            except Exception as e:
+                # Giữ file .compacting: lần compact sau (của worker bất kỳ) gộp lại
+                print(f"❌ Progress log compaction error: {e}")
+                return leftover
+
+            os.remove(self.compacting_file)
+            with self._lock:
+                self._compacting = {}
+            return count
+
+    def _run(self):
+        while not self._stopped:
+            self._wakeup.wait(self.compact_interval)
+            self._wakeup.clear()
+            if self._stopped:
+                break
+            try:
+                self.compact()
+            except Exception as e:
+                print(f"❌ Progress log compactor error: {e}")
+
+    def close(self):
+        """Dừng compactor và gộp phần log còn lại"""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._wakeup.set()
+        self.compact()
+        with self._lock:
+            self._fh.close()
+            if self._reader is not None:
+                self._reader.close()
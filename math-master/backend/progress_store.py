@@ -0,0 +1,181 @@
+import glob
+import hashlib
+import os
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import quote
+
+from models import Progress
+from locks import FileLock
+
+
+def progress_summary(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Các số liệu tóm tắt của một document tiến độ (dùng cho bảng xếp hạng)"""
+    progress = Progress.from_dict(doc)
+    return {
+        'total_score': progress.get_total_score(),
+        'games_played': progress.get_games_played(),
+        'exercises_completed': progress.get_exercises_completed(),
+        'study_time': progress.get_study_time(),
+        'daily_scores': progress.daily_scores
+    }
+
+
+class JSONProgressStore:
+    """Tiến độ của tất cả user trong một file progress.json (layout mặc định).
+
+    load_record / load_summaries (tùy chọn) cho phép đọc một user hoặc số liệu
+    tóm tắt mà không parse cả file (ví dụ từ snapshot nhị phân); load_summaries
+    trả về None khi không dùng được.
+    """
+
+    def __init__(self, progress_file: str, load_json: Callable[[str], Any],
+                 save_json: Callable[[str, Any], None],
+                 load_record: Optional[Callable[[str, str], Any]] = None,
+                 load_summaries: Optional[Callable[[], Optional[Dict[str, Dict[str, Any]]]]] = None):
+        self.progress_file = progress_file
+        self._load_json = load_json
+        self._save_json = save_json
+        self._load_record = load_record
+        self._load_summaries = load_summaries
+
+    def lock_key(self, username: str) -> str:
+        """Key để khóa khi đọc-sửa-ghi tiến độ của user (cả file dùng chung)"""
+        return self.progress_file
+
+    def get(self, username: str) -> Optional[Dict[str, Any]]:
+        if self._load_record:
+            return self._load_record(self.progress_file, username)
+        return (self._load_json(self.progress_file) or {}).get(username)
+
+    def put(self, username: str, doc: Dict[str, Any]):
+        self.put_many({username: doc})
+
+    def put_many(self, docs: Dict[str, Dict[str, Any]]):
+        progress_data = dict(self._load_json(self.progress_file) or {})
+        progress_data.update(docs)
+        self._save_json(self.progress_file, progress_data)
+
+    def all(self) -> Dict[str, Dict[str, Any]]:
+        return self._load_json(self.progress_file) or {}
+
+    def summaries(self) -> Dict[str, Dict[str, Any]]:
+        summaries = self._load_summaries() if self._load_summaries else None
+        if summaries is not None:
+            return summaries
+        return {username: progress_summary(doc) for username, doc in self.all().items()
+                if isinstance(doc, dict) and 'username' in doc}
+
+
+class ShardedProgressStore:
+    """Tiến độ chia theo user trong DATA_DIR/progress/.
+
+    - shard_count = 0: mỗi user một file (user_<username>.json)
+    - shard_count = N: N file shard_XXX.json, chọn shard theo hash username
+
+    Mỗi lần ghi chỉ đọc/ghi lại shard của user đó và file index-XXX.json
+    nhỏ của shard đó (số liệu tóm tắt từng user để bảng xếp hạng không phải
+    đọc toàn bộ dữ liệu); summaries() gộp các index lại. Layout mỗi user một
+    file chia index theo hash username vào INDEX_BUCKETS file.
+    """
+
+    LEGACY_INDEX_NAME = 'index.json'
+    INDEX_BUCKETS = 64
+
+    def __init__(self, progress_dir: str, shard_count: int, load_json: Callable[[str], Any],
+                 save_json: Callable[[str, Any], None]):
+        self.progress_dir = progress_dir
+        self.shard_count = shard_count
+        self._load_json = load_json
+        self._save_json = save_json
+        os.makedirs(progress_dir, exist_ok=True)
+        buckets = shard_count if shard_count > 0 else self.INDEX_BUCKETS
+        self._index_locks = [FileLock(os.path.join(progress_dir, f'index-{bucket:03d}.lock'))
+                             for bucket in range(buckets)]
+        self._split_legacy_index()
+
+    def _bucket(self, username: str) -> int:
+        """Shard (hoặc nhóm index) của user"""
+        digest = hashlib.md5(username.encode('utf-8')).hexdigest()
+        return int(digest[:8], 16) % len(self._index_locks)
+
+    def _shard_file(self, username: str) -> str:
+        if self.shard_count <= 0:
+            return os.path.join(self.progress_dir, 'user_' + quote(username, safe='') + '.json')
+        return os.path.join(self.progress_dir, f'shard_{self._bucket(username):03d}.json')
+
+    def _index_file(self, bucket: int) -> str:
+        return os.path.join(self.progress_dir, f'index-{bucket:03d}.json')
+
+    def _index_files(self):
+        return sorted(glob.glob(os.path.join(glob.escape(self.progress_dir), 'index-*.json')))
+
+    def _split_legacy_index(self):
+        """Chia index.json chung (bản cũ) thành các index theo shard"""
+        legacy_file = os.path.join(self.progress_dir, self.LEGACY_INDEX_NAME)
+        if not os.path.exists(legacy_file):
+            return
+        with FileLock(os.path.join(self.progress_dir, 'index.lock')):
+            if not os.path.exists(legacy_file):
+                return
+            self._update_index(self._load_json(legacy_file) or {})
+            os.remove(legacy_file)
+            print(f"✅ Split {self.LEGACY_INDEX_NAME} into per-shard indexes")
+
+    def _update_index(self, summaries: Dict[str, Dict[str, Any]]):
+        """Ghi số liệu tóm tắt vào index của từng shard (mỗi index một khóa riêng)"""
+        by_bucket: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        for username, summary in summaries.items():
+            by_bucket.setdefault(self._bucket(username), {})[username] = summary
+        for bucket, bucket_summaries in by_bucket.items():
+            index_file = self._index_file(bucket)
+            with self._index_locks[bucket]:
+                index = dict(self._load_json(index_file) or {})
+                index.update(bucket_summaries)
+                self._save_json(index_file, index)
+
+    def lock_key(self, username: str) -> str:
+        """Key để khóa khi đọc-sửa-ghi tiến độ của user (file shard của user)"""
+        return self._shard_file(username)
+
+    def is_empty(self) -> bool:
+        return not self._index_files()
+
+    def get(self, username: str) -> Optional[Dict[str, Any]]:
+        data = self._load_json(self._shard_file(username))
+        if data is None:
+            return None
+        return data if self.shard_count <= 0 else data.get(username)
+
+    def put(self, username: str, doc: Dict[str, Any]):
+        self.put_many({username: doc})
+
+    def put_many(self, docs: Dict[str, Dict[str, Any]]):
+        by_shard: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for username, doc in docs.items():
+            by_shard.setdefault(self._shard_file(username), {})[username] = doc
+
+        for shard_file, shard_docs in by_shard.items():
+            if self.shard_count <= 0:
+                # Mỗi file chỉ chứa document của đúng một user
+                self._save_json(shard_file, next(iter(shard_docs.values())))
+            else:
+                shard_data = dict(self._load_json(shard_file) or {})
+                shard_data.update(shard_docs)
+                self._save_json(shard_file, shard_data)
+
+        self._update_index({username: progress_summary(doc) for username, doc in docs.items()})
+
+    def all(self) -> Dict[str, Dict[str, Any]]:
+        """Đọc toàn bộ dữ liệu (chỉ dùng cho migration / bảo trì)"""
+        result = {}
+        for username in self.summaries():
+            doc = self.get(username)
+            if doc is not None:
+                result[username] = doc
+        return result
+
+    def summaries(self) -> Dict[str, Dict[str, Any]]:
+        result: Dict[str, Dict[str, Any]] = {}
+        for index_file in self._index_files():
+            result.update(self._load_json(index_file) or {})
+        return result
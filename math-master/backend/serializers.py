@@ -0,0 +1,89 @@
+import json
+from typing import Any, Callable, Dict, Optional, Tuple, Type, Union
+
+# Fast path tùy chọn: orjson cho JSON, msgpack cho dạng nhị phân
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# class -> (to_dict, from_dict)
+_registry: Dict[type, Tuple[Callable[[Any], Any], Optional[Callable[[Any], Any]]]] = {}
+
+
+def register(cls: Type, to_dict: Optional[Callable[[Any], Any]] = None,
+             from_dict: Optional[Callable[[Any], Any]] = None) -> Type:
+    """Đăng ký cách chuyển một class sang / từ dữ liệu JSON"""
+    _registry[cls] = (to_dict or cls.to_dict, from_dict or getattr(cls, 'from_dict', None))
+    return cls
+
+
+def to_primitive(obj: Any, fallback: Optional[Callable[[Any], Any]] = None) -> Any:
+    """Hàm default= cho json/orjson/msgpack: object đã đăng ký -> dict/list"""
+    entry = _registry.get(type(obj))
+    if entry is not None:
+        return entry[0](obj)
+    if fallback is not None:
+        return fallback(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def from_primitive(cls: Type, data: Any) -> Any:
+    """Tạo object của class đã đăng ký từ dữ liệu JSON"""
+    return _registry[cls][1](data)
+
+
+def dumps_bytes(obj: Any, indent: bool = False, sort_keys: bool = False,
+                default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Serialize sang JSON (UTF-8) qua orjson nếu có, ngược lại dùng json"""
+    encode = (lambda value: to_primitive(value, default)) if default else to_primitive
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=encode, option=option)
+        except TypeError:
+            pass  # kiểu orjson không hỗ trợ (số nguyên > 64 bit...) -> json
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None,
+                      sort_keys=sort_keys, default=encode).encode('utf-8')
+
+
+def dumps(obj: Any, indent: bool = False, sort_keys: bool = False,
+          default: Optional[Callable[[Any], Any]] = None) -> str:
+    return dumps_bytes(obj, indent, sort_keys, default).decode('utf-8')
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON (lỗi cú pháp luôn là json.JSONDecodeError)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def packb(obj: Any) -> bytes:
+    """Dạng nhị phân: msgpack nếu có cài, ngược lại là JSON UTF-8"""
+    if msgpack is not None:
+        return msgpack.packb(obj, default=to_primitive, use_bin_type=True)
+    return dumps_bytes(obj)
+
+
+def unpackb(data: bytes) -> Any:
+    if msgpack is not None:
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+    return loads(data)
+
+
+def get_backends() -> Dict[str, str]:
+    """Thư viện đang dùng cho JSON / nhị phân"""
+    return {
+        'json': 'orjson' if orjson is not None else 'json',
+        'binary': 'msgpack' if msgpack is not None else 'json'
+    }
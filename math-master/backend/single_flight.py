@@ -0,0 +1,113 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+class _Flight:
+    """Một lời gọi đang chạy và các request đang chờ kết quả của nó"""
+
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Gộp các lời gọi trùng khóa đang chạy cùng lúc (single-flight).
+
+    Request đầu tiên với một khóa (leader) thực hiện lời gọi; các request cùng
+    khóa tới trong lúc đó chỉ chờ và nhận chung kết quả (hoặc exception) thay
+    vì gọi thêm. Khóa được bỏ ngay khi lời gọi xong nên request sau đó sẽ gọi
+    lại (hoặc đọc cache do leader vừa ghi).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.max_waiters = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Kết quả của fn(), dùng chung với các request cùng key đang chạy"""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self.calls += 1
+                leader = True
+            else:
+                flight.waiters += 1
+                self.coalesced += 1
+                self.max_waiters = max(self.max_waiters, flight.waiters)
+                leader = False
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'coalesced': self.coalesced,
+                'max_waiters': self.max_waiters,
+                'in_flight': len(self._flights)
+            }
+
+
+class AsyncSingleFlight:
+    """SingleFlight cho asyncio: lời gọi chạy trong một task riêng, các coroutine
+    cùng khóa (kể cả leader) await chung task đó (chỉ dùng trong một event loop)"""
+
+    def __init__(self):
+        self._flights: Dict[str, List[Any]] = {}  # key -> [Task, số request đang chờ]
+        self.calls = 0
+        self.coalesced = 0
+        self.max_waiters = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Kết quả của await fn(), dùng chung với các coroutine cùng key đang chạy"""
+        flight = self._flights.get(key)
+        if flight is not None:
+            flight[1] += 1
+            self.coalesced += 1
+            self.max_waiters = max(self.max_waiters, flight[1])
+        else:
+            task = asyncio.ensure_future(fn())
+            flight = self._flights[key] = [task, 0]
+            self.calls += 1
+            task.add_done_callback(lambda done: self._finish(key, done))
+        # shield: request bị hủy (kể cả leader) không hủy lời gọi dùng chung,
+        # các request khác vẫn nhận được kết quả
+        return await asyncio.shield(flight[0])
+
+    def _finish(self, key: str, task: 'asyncio.Future'):
+        if self._flights.get(key, [None])[0] is task:
+            del self._flights[key]
+        if not task.cancelled():
+            task.exception()  # đánh dấu đã đọc để không bị log khi không còn ai chờ
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'calls': self.calls,
+            'coalesced': self.coalesced,
+            'max_waiters': self.max_waiters,
+            'in_flight': len(self._flights)
+        }
@@ -0,0 +1,214 @@
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import serializers
+
+# Đầu file: magic, version, offset + độ dài của header (header nằm cuối file
+# để các section được ghi tuần tự, không phải giữ cả snapshot trong bộ nhớ)
+MAGIC = b'MMSNAP'
+VERSION = 1
+_PRELUDE = struct.Struct('<6sHQI')
+
+
+class SnapshotError(ValueError):
+    """File snapshot hỏng hoặc không đọc được bằng thư viện đang cài"""
+
+
+def file_signature(file_path: str) -> Optional[List[int]]:
+    """(inode, mtime_ns, size) như JSONFileCache: đổi khi file được ghi lại"""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return [stat.st_ino, stat.st_mtime_ns, stat.st_size]
+
+
+def write_snapshot(path: str, sections: Iterable[Tuple[str, Dict[str, Any]]]):
+    """Ghi snapshot (atomic qua file tạm + os.replace).
+
+    sections: (name, spec) với spec gồm
+    - data: dữ liệu của section
+    - keyed: True nếu data là dict và mỗi key được pack riêng (đọc lẻ từng key)
+    - source: chữ ký file JSON nguồn lúc đọc data (None nếu không có)
+    - meta: thông tin thêm tùy ý (JSON)
+    """
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_PRELUDE.pack(MAGIC, VERSION, 0, 0))
+            table = {}
+            for name, spec in sections:
+                table[name] = _write_section(f, spec)
+            header = serializers.dumps_bytes({
+                'format': serializers.get_backends()['binary'],
+                'created_at': datetime.now().isoformat(),
+                'sections': table
+            })
+            header_offset = f.tell()
+            f.write(header)
+            f.seek(0)
+            f.write(_PRELUDE.pack(MAGIC, VERSION, header_offset, len(header)))
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _write_section(f, spec: Dict[str, Any]) -> Dict[str, Any]:
+    offset = f.tell()
+    entry: Dict[str, Any] = {'source': spec.get('source'), 'meta': spec.get('meta') or {}}
+    data = spec['data']
+    if spec.get('keyed'):
+        # Mỗi key một blob, bảng key -> (offset, length) đặt ngay sau các blob
+        index = {}
+        for key, value in data.items():
+            blob = serializers.packb(value)
+            index[key] = (f.tell() - offset, len(blob))
+            f.write(blob)
+        blob = serializers.packb(index)
+        entry['index'] = [f.tell() - offset, len(blob)]
+        entry['count'] = len(index)
+        f.write(blob)
+    else:
+        f.write(serializers.packb(data))
+    entry['offset'] = offset
+    entry['length'] = f.tell() - offset
+    return entry
+
+
+class SnapshotReader:
+    """Đọc snapshot qua mmap, giải mã từng section (hoặc từng key) khi cần.
+
+    Mở file chỉ đọc prelude + header; dữ liệu chỉ được giải mã khi gọi
+    load()/get(). Section nào có chữ ký nguồn khác file JSON hiện tại thì
+    coi như cũ và người gọi đọc lại file JSON.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < _PRELUDE.size:
+                raise SnapshotError(f"Snapshot quá ngắn: {path}")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, header_offset, header_length = _PRELUDE.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise SnapshotError(f"Không phải snapshot v{VERSION}: {path}")
+        if header_offset + header_length > size or header_length == 0:
+            self.close()
+            raise SnapshotError(f"Snapshot bị cắt cụt: {path}")
+        header = serializers.loads(self._mmap[header_offset:header_offset + header_length])
+
+        self.format = header['format']
+        if self.format != serializers.get_backends()['binary']:
+            self.close()
+            raise SnapshotError(f"Snapshot dạng {self.format} nhưng thư viện tương ứng chưa được cài")
+        self.created_at = header.get('created_at')
+        self.sections: Dict[str, Dict[str, Any]] = header['sections']
+        self._indexes: Dict[str, Dict[str, List[int]]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path: str) -> Optional['SnapshotReader']:
+        """Mở snapshot, None nếu chưa có hoặc không dùng được"""
+        try:
+            return cls(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"⚠️ Bỏ qua snapshot {path}: {e}")
+            return None
+
+    def close(self):
+        self._mmap.close()
+
+    def is_fresh(self, name: str, source_path: str) -> bool:
+        """Section còn khớp file JSON nguồn (file chưa bị ghi lại từ lúc export)"""
+        entry = self.sections.get(name)
+        if entry is None or entry.get('source') is None:
+            return False
+        return entry['source'] == file_signature(source_path)
+
+    def meta(self, name: str) -> Dict[str, Any]:
+        entry = self.sections.get(name)
+        return entry['meta'] if entry else {}
+
+    def _blob(self, entry: Dict[str, Any], offset: int, length: int) -> Any:
+        start = entry['offset'] + offset
+        return serializers.unpackb(self._mmap[start:start + length])
+
+    def _index(self, name: str) -> Dict[str, List[int]]:
+        index = self._indexes.get(name)
+        if index is None:
+            with self._lock:
+                index = self._indexes.get(name)
+                if index is None:
+                    entry = self.sections[name]
+                    index = self._indexes[name] = self._blob(entry, *entry['index'])
+        return index
+
+    def load(self, name: str) -> Any:
+        """Giải mã toàn bộ section"""
+        entry = self.sections[name]
+        if 'index' not in entry:
+            return self._blob(entry, 0, entry['length'])
+        return {key: self._blob(entry, offset, length) for key, (offset, length) in self._index(name).items()}
+
+    def get(self, name: str, key: str) -> Tuple[bool, Any]:
+        """(có key, giá trị) của một key trong section keyed, chỉ giải mã key đó"""
+        location = self._index(name).get(key)
+        if location is None:
+            return False, None
+        return True, self._blob(self.sections[name], *location)
+
+    def get_info(self) -> Dict[str, Any]:
+        return {
+            'path': self.path,
+            'format': self.format,
+            'created_at': self.created_at,
+            'sections': {name: {'bytes': entry['length'], 'count': entry.get('count'), 'meta': entry['meta']}
+                         for name, entry in self.sections.items()}
+        }
+
+
+def main():
+    """CLI: export / import / info snapshot của DATA_DIR"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Snapshot nhị phân của dữ liệu Math Master')
+    parser.add_argument('command', choices=('export', 'import', 'info'))
+    parser.add_argument('path', nargs='?', help='File snapshot (mặc định: SNAPSHOT_FILE)')
+    args = parser.parse_args()
+
+    from database import db_manager
+    path = args.path or db_manager.config.SNAPSHOT_FILE
+    if args.command == 'export':
+        ok = db_manager.export_snapshot(path)
+    elif args.command == 'import':
+        ok = db_manager.import_snapshot(path)
+    else:
+        reader = SnapshotReader.open(path)
+        ok = reader is not None
+        if ok:
+            print(serializers.dumps(reader.get_info(), indent=True))
+    db_manager.writer.close()
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
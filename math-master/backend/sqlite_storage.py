@@ -0,0 +1,752 @@
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+
+from models import User, Exercise, Progress, validate_user_data, DAILY_SCORE_RETENTION_DAYS, PASS_SCORE
+from config import Config
+from database import DatabaseManager
+from leaderboard import window_start
+from exercise_index import reservoir_sample
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    password TEXT NOT NULL,
+    user_type TEXT NOT NULL DEFAULT 'student',
+    created_at TEXT,
+    last_login TEXT,
+    login_count INTEGER NOT NULL DEFAULT 0,
+    progress TEXT NOT NULL DEFAULT '{}'
+);
+
+CREATE TABLE IF NOT EXISTS progress (
+    username TEXT PRIMARY KEY,
+    scores TEXT NOT NULL DEFAULT '{}',
+    weak_areas TEXT NOT NULL DEFAULT '[]',
+    strengths TEXT NOT NULL DEFAULT '[]',
+    total_score INTEGER NOT NULL DEFAULT 0,
+    study_time INTEGER NOT NULL DEFAULT 0,
+    exercises_completed INTEGER NOT NULL DEFAULT 0,
+    games_played INTEGER NOT NULL DEFAULT 0,
+    attempts_by_topic TEXT NOT NULL DEFAULT '{}',
+    correct_by_topic TEXT NOT NULL DEFAULT '{}',
+    passed_by_topic TEXT NOT NULL DEFAULT '{}',
+    last_activity TEXT,
+    last_updated TEXT,
+    version INTEGER NOT NULL DEFAULT 0,
+    version_marks TEXT NOT NULL DEFAULT '[]'
+);
+CREATE INDEX IF NOT EXISTS idx_progress_total_score ON progress (total_score DESC);
+
+CREATE TABLE IF NOT EXISTS exercise_attempts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL,
+    exercise_id,
+    score INTEGER NOT NULL DEFAULT 0,
+    topic TEXT,
+    time_spent INTEGER NOT NULL DEFAULT 0,
+    completed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_attempts_user ON exercise_attempts (username, id);
+
+CREATE TABLE IF NOT EXISTS game_sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL,
+    session_id TEXT,
+    game_type TEXT,
+    score INTEGER NOT NULL DEFAULT 0,
+    time_spent INTEGER NOT NULL DEFAULT 0,
+    completed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_game_sessions_user ON game_sessions (username, id);
+
+-- Lịch sử cũ đã gộp theo ngày + chủ đề (kind: exercises | games)
+CREATE TABLE IF NOT EXISTS attempt_rollups (
+    username TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    day TEXT NOT NULL,
+    category TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    correct INTEGER NOT NULL DEFAULT 0,
+    passed INTEGER NOT NULL DEFAULT 0,
+    score INTEGER NOT NULL DEFAULT 0,
+    time_spent INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (username, kind, day, category)
+);
+
+CREATE TABLE IF NOT EXISTS mock_tests (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL,
+    data TEXT NOT NULL,
+    completed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_mock_tests_user ON mock_tests (username, id);
+
+CREATE TABLE IF NOT EXISTS exercises (
+    id INTEGER PRIMARY KEY,
+    topic TEXT NOT NULL,
+    difficulty TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_exercises_topic ON exercises (topic, difficulty);
+
+CREATE TABLE IF NOT EXISTS daily_scores (
+    day TEXT NOT NULL,
+    username TEXT NOT NULL,
+    score INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, username)
+);
+"""
+
+
+class SQLiteDatabaseManager(DatabaseManager):
+    """DatabaseManager lưu dữ liệu trong SQLite (WAL) thay vì các file JSON.
+
+    Mỗi lần ghi chỉ chạm vào các dòng của một user, không phải toàn bộ dữ liệu.
+    Curriculum vẫn đọc từ file JSON vì là dữ liệu tĩnh.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or Config.SQLITE_FILE
+        self._local = threading.local()
+        super().__init__()
+
+    def init_db(self):
+        """Khởi tạo schema SQLite và nhập dữ liệu từ các file JSON (lần đầu)"""
+        try:
+            os.makedirs(self.data_dir, exist_ok=True)
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+
+            # Các file JSON vẫn là nguồn dữ liệu mẫu và định dạng trao đổi
+            self._init_users_file()
+            self._init_progress_file()
+            self._init_exercises_file()
+            self._init_curriculum_file()
+
+            conn = self._connect()
+            conn.executescript(SCHEMA)
+            self._import_json_data()
+
+            print(f"✅ SQLite database initialized: {self.db_path}")
+
+        except Exception as e:
+            print(f"❌ Database initialization error: {e}")
+            raise
+
+    # ==================== CONNECTION ====================
+    def _connect(self) -> sqlite3.Connection:
+        """Lấy connection riêng cho thread hiện tại"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None,
+                                   check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """Transaction ghi (BEGIN IMMEDIATE) để tránh mất cập nhật giữa các worker"""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        else:
+            conn.execute('COMMIT')
+
+    def _import_json_data(self):
+        """Nhập dữ liệu từ users/progress/exercises.json khi database còn trống"""
+        conn = self._connect()
+        if conn.execute('SELECT 1 FROM users LIMIT 1').fetchone():
+            return
+
+        users = self._load_json(self.users_file) or {}
+        progress_data = self._load_json(self.progress_file) or {}
+        exercises_data = self._load_json(self.exercises_file) or []
+
+        with self._transaction() as conn:
+            for username, user_data in users.items():
+                self._insert_user(conn, User.from_dict(user_data))
+
+            for username, data in progress_data.items():
+                if 'username' in data:
+                    self._insert_progress(conn, Progress.from_dict(data))
+                for test in data.get('mock_tests', [])[-Config.MOCK_TEST_CAPACITY:]:
+                    conn.execute(
+                        'INSERT INTO mock_tests (username, data, completed_at) VALUES (?, ?, ?)',
+                        (username, json.dumps(test, ensure_ascii=False), test.get('completed_at'))
+                    )
+
+            for ex_data in exercises_data:
+                self._insert_exercise(conn, ex_data)
+
+        print(f"✅ Imported {len(users)} users, {len(progress_data)} progress records, "
+              f"{len(exercises_data)} exercises into SQLite")
+
+    # ==================== ROW HELPERS ====================
+    def _insert_user(self, conn: sqlite3.Connection, user: User):
+        conn.execute(
+            'INSERT OR IGNORE INTO users (username, password, user_type, created_at, last_login, login_count, '
+            'progress) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (user.username, user.password, user.user_type, user.created_at, user.last_login, user.login_count,
+             json.dumps(user.progress, ensure_ascii=False))
+        )
+
+    def _insert_progress(self, conn: sqlite3.Connection, progress: Progress):
+        conn.execute(
+            'INSERT OR IGNORE INTO progress (username, scores, weak_areas, strengths, total_score, '
+            'study_time, exercises_completed, games_played, attempts_by_topic, correct_by_topic, passed_by_topic, '
+            'last_activity, last_updated, version, version_marks) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (progress.username, json.dumps(progress.scores, ensure_ascii=False),
+             json.dumps(progress.weak_areas, ensure_ascii=False),
+             json.dumps(progress.strengths, ensure_ascii=False),
+             progress.get_total_score(), progress.get_study_time(),
+             progress.get_exercises_completed(), progress.get_games_played(),
+             json.dumps(progress.attempts_by_topic, ensure_ascii=False),
+             json.dumps(progress.correct_by_topic, ensure_ascii=False),
+             json.dumps(progress.passed_by_topic, ensure_ascii=False),
+             progress.last_activity, progress.last_updated,
+             progress.version, json.dumps(progress.version_marks))
+        )
+        for record in progress.completed_exercises:
+            self._insert_attempt(conn, progress.username, record)
+        for record in progress.game_sessions:
+            self._insert_game_session(conn, progress.username, record)
+        conn.executemany('INSERT OR IGNORE INTO daily_scores (day, username, score) VALUES (?, ?, ?)',
+                         [(day, progress.username, score) for day, score in progress.daily_scores.items()])
+        for kind, bucket in progress.rollups.items():
+            conn.executemany(
+                'INSERT OR IGNORE INTO attempt_rollups (username, kind, day, category, count, correct, '
+                'passed, score, time_spent) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [(progress.username, kind, day, category, *entry)
+                 for day, categories in bucket['days'].items() for category, entry in categories.items()]
+            )
+
+    def _insert_attempt(self, conn: sqlite3.Connection, username: str, record: Dict[str, Any]):
+        conn.execute(
+            'INSERT INTO exercise_attempts (username, exercise_id, score, topic, time_spent, completed_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (username, record.get('exercise_id'), record.get('score', 0), record.get('topic'),
+             record.get('time_spent', 0), record.get('completed_at'))
+        )
+
+    def _insert_game_session(self, conn: sqlite3.Connection, username: str, record: Dict[str, Any]):
+        conn.execute(
+            'INSERT INTO game_sessions (username, session_id, game_type, score, time_spent, completed_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (username, record.get('session_id'), record.get('game_type'), record.get('score', 0),
+             record.get('time_spent', 0), record.get('completed_at'))
+        )
+
+    def _insert_exercise(self, conn: sqlite3.Connection, ex_data: Dict[str, Any]):
+        conn.execute(
+            'INSERT OR REPLACE INTO exercises (id, topic, difficulty, data) VALUES (?, ?, ?, ?)',
+            (ex_data['id'], ex_data.get('topic'), ex_data.get('difficulty'),
+             json.dumps(ex_data, ensure_ascii=False))
+        )
+
+    # USER MANAGEMENT
+    def save_user(self, user_data: Dict[str, Any]) -> bool:
+        """Lưu user mới"""
+        try:
+            if not validate_user_data(user_data):
+                return False
+
+            user = User(
+                username=user_data['username'],
+                password=user_data['password'],
+                user_type=user_data.get('user_type', 'student')
+            )
+
+            with self._transaction() as conn:
+                if conn.execute('SELECT 1 FROM users WHERE username = ?', (user.username,)).fetchone():
+                    return False
+                self._insert_user(conn, user)
+                self._insert_progress(conn, Progress(username=user.username))
+
+            print(f"✅ User {user_data['username']} registered successfully!")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error saving user: {e}")
+            return False
+
+    def get_user(self, username: str) -> Optional[User]:
+        """Lấy thông tin user"""
+        try:
+            if self.user_meta:
+                user_data = self.user_meta.load_user(username, lambda: self._load_user_row(username))
+            else:
+                user_data = self._load_user_row(username)
+            if user_data:
+                return User.from_dict(user_data)
+            return None
+
+        except Exception as e:
+            print(f"❌ Error getting user: {e}")
+            return None
+
+    def _load_user_row(self, username: str) -> Optional[Dict[str, Any]]:
+        """Đọc bản ghi user trong bảng users (chưa cộng thay đổi đang chờ ghi)"""
+        row = self._connect().execute('SELECT * FROM users WHERE username = ?', (username,)).fetchone()
+        if row is None:
+            return None
+        user_data = dict(row)
+        user_data['progress'] = json.loads(user_data['progress'] or '{}')
+        return user_data
+
+    def _write_user_meta(self, updates: Dict[str, Dict[str, Any]]) -> int:
+        """Ghi last_login / login_count của nhiều user trong một transaction"""
+        with self._transaction() as conn:
+            cursor = conn.executemany(
+                'UPDATE users SET last_login = MAX(COALESCE(last_login, ?), ?), '
+                'login_count = login_count + ? WHERE username = ?',
+                [(meta['last_login'], meta['last_login'], meta['login_count'], username)
+                 for username, meta in updates.items()]
+            )
+        return cursor.rowcount
+
+    # PROGRESS MANAGEMENT
+    def init_user_progress(self, username: str) -> bool:
+        """Khởi tạo progress cho user mới"""
+        try:
+            with self._transaction() as conn:
+                cursor = conn.execute('INSERT OR IGNORE INTO progress (username, last_updated) VALUES (?, ?)',
+                                      (username, datetime.now().isoformat()))
+            return cursor.rowcount > 0
+
+        except Exception as e:
+            print(f"❌ Error initializing user progress: {e}")
+            return False
+
+    def _apply_attempt(self, conn: sqlite3.Connection, username: str, exercise_id: Any, score: int,
+                       time_spent: int, topic: str, completed_at: str):
+        """Ghi một lượt làm bài / chơi game và cập nhật số liệu của user"""
+        now = datetime.now().isoformat()
+        conn.execute('INSERT OR IGNORE INTO progress (username, last_updated) VALUES (?, ?)',
+                     (username, now))
+        row = conn.execute('SELECT scores, exercises_completed, games_played, attempts_by_topic, correct_by_topic, '
+                           'passed_by_topic, version, version_marks FROM progress WHERE username = ?',
+                           (username,)).fetchone()
+        scores = json.loads(row['scores'] or '{}')
+        attempts_by_topic = json.loads(row['attempts_by_topic'] or '{}')
+        correct_by_topic = json.loads(row['correct_by_topic'] or '{}')
+        passed_by_topic = json.loads(row['passed_by_topic'] or '{}')
+        version_marks = json.loads(row['version_marks'] or '[]')
+        before = (row['exercises_completed'], row['games_played'])
+
+        if str(exercise_id).startswith('game'):
+            self._insert_game_session(conn, username, {
+                'session_id': f"game_{row['games_played'] + 1}",
+                'game_type': topic,
+                'score': score,
+                'time_spent': time_spent,
+                'completed_at': completed_at
+            })
+            category = 'games'
+            counters = 'games_played = games_played + 1'
+            after = (before[0], before[1] + 1)
+        else:
+            self._insert_attempt(conn, username, {
+                'exercise_id': exercise_id,
+                'score': score,
+                'topic': topic,
+                'time_spent': time_spent,
+                'completed_at': completed_at
+            })
+            category = topic
+            counters = 'exercises_completed = exercises_completed + 1'
+            after = (before[0] + 1, before[1])
+            attempts_by_topic[topic] = attempts_by_topic.get(topic, 0) + 1
+            if score > 0:
+                correct_by_topic[topic] = correct_by_topic.get(topic, 0) + 1
+            if score >= PASS_SCORE:
+                passed_by_topic[topic] = passed_by_topic.get(topic, 0) + 1
+
+        scores[category] = scores.get(category, 0) + score
+        version = Progress.advance_version(version_marks, row['version'], before, after)
+        conn.execute(
+            'INSERT INTO daily_scores (day, username, score) VALUES (?, ?, ?) '
+            'ON CONFLICT (day, username) DO UPDATE SET score = score + excluded.score',
+            (completed_at[:10], username, score)
+        )
+        conn.execute(
+            f'UPDATE progress SET scores = ?, total_score = total_score + ?, '
+            f'study_time = study_time + ?, {counters}, attempts_by_topic = ?, correct_by_topic = ?, '
+            f'passed_by_topic = ?, last_activity = MAX(COALESCE(last_activity, ?), ?), last_updated = ?, '
+            f'version = ?, version_marks = ? WHERE username = ?',
+            (json.dumps(scores, ensure_ascii=False), score, time_spent,
+             json.dumps(attempts_by_topic, ensure_ascii=False),
+             json.dumps(correct_by_topic, ensure_ascii=False),
+             json.dumps(passed_by_topic, ensure_ascii=False), completed_at, completed_at, now,
+             version, json.dumps(version_marks), username)
+        )
+        self._roll_up_rows(conn, username)
+
+    # Loại rollup -> (bảng lịch sử, cột chủ đề)
+    ROLLUP_TABLES = {'exercises': ('exercise_attempts', 'topic'), 'games': ('game_sessions', 'game_type')}
+
+    def _roll_up_rows(self, conn: sqlite3.Connection, username: str) -> int:
+        """Gộp các bản ghi cũ của user vào attempt_rollups (như Progress.roll_up):
+        bản ghi cũ ở bất kỳ vị trí nào, rồi bỏ các mốc version bị lệch vị trí"""
+        cutoff = self._rollup_cutoff()
+        if not cutoff:
+            return 0
+        rolled = 0
+        thresholds = [0, 0]
+        for column, (kind, (table, category)) in enumerate(self.ROLLUP_TABLES.items()):
+            old = conn.execute(f'SELECT COUNT(*), MAX(id) FROM {table} '
+                               f'WHERE username = ? AND COALESCE(completed_at, \'\') < ?',
+                               (username, cutoff)).fetchone()
+            if not old[0]:
+                continue
+            rolled_before = conn.execute('SELECT COALESCE(SUM(count), 0) FROM attempt_rollups '
+                                         'WHERE username = ? AND kind = ?', (username, kind)).fetchone()[0]
+            # Vị trí (tính từ 1) của bản ghi cũ cuối cùng trong lịch sử chi tiết
+            last_position = conn.execute(f'SELECT COUNT(*) FROM {table} WHERE username = ? AND id <= ?',
+                                         (username, old[1])).fetchone()[0]
+            thresholds[column] = rolled_before + last_position
+            conn.execute(
+                f'INSERT INTO attempt_rollups (username, kind, day, category, count, correct, passed, score, time_spent) '
+                f'SELECT username, ?, COALESCE(NULLIF(substr(completed_at, 1, 10), \'\'), \'unknown\'), '
+                f'COALESCE(NULLIF({category}, \'\'), \'general\'), COUNT(*), SUM(score > 0), SUM(score >= ?), SUM(score), '
+                f'SUM(time_spent) FROM {table} WHERE username = ? AND COALESCE(completed_at, \'\') < ? '
+                f'GROUP BY 3, 4 '
+                f'ON CONFLICT (username, kind, day, category) DO UPDATE SET count = count + excluded.count, '
+                f'correct = correct + excluded.correct, passed = passed + excluded.passed, score = score + excluded.score, '
+                f'time_spent = time_spent + excluded.time_spent',
+                (kind, PASS_SCORE, username, cutoff)
+            )
+            rolled += conn.execute(f'DELETE FROM {table} WHERE username = ? AND COALESCE(completed_at, \'\') < ?',
+                                   (username, cutoff)).rowcount
+        if rolled:
+            row = conn.execute('SELECT version_marks FROM progress WHERE username = ?', (username,)).fetchone()
+            marks = json.loads(row['version_marks'] or '[]')
+            kept = Progress.drop_version_marks_before(marks, *thresholds)
+            if len(kept) != len(marks):
+                conn.execute('UPDATE progress SET version_marks = ? WHERE username = ?',
+                             (json.dumps(kept), username))
+        return rolled
+
+    def _rollups(self, conn: sqlite3.Connection, username: str) -> Dict[str, Dict[str, Any]]:
+        """rollups của user theo dạng Progress.rollups"""
+        rollups: Dict[str, Dict[str, Any]] = {}
+        for row in conn.execute('SELECT kind, day, category, count, correct, passed, score, time_spent '
+                                'FROM attempt_rollups WHERE username = ?', (username,)):
+            bucket = rollups.setdefault(row['kind'], {'count': 0, 'days': {}})
+            bucket['count'] += row['count']
+            bucket['days'].setdefault(row['day'], {})[row['category']] = [
+                row['count'], row['correct'], row['passed'], row['score'], row['time_spent']]
+        return rollups
+
+    def _daily_scores(self, conn: sqlite3.Connection, username: str) -> Dict[str, int]:
+        """Điểm theo ngày của user, giữ DAILY_SCORE_RETENTION_DAYS ngày tính từ ngày
+        mới nhất (như Progress.daily_scores; bảng giữ mọi ngày cho bảng xếp hạng)"""
+        daily_scores = {row['day']: row['score'] for row in conn.execute(
+            'SELECT day, score FROM daily_scores WHERE username = ?', (username,))}
+        if not daily_scores:
+            return daily_scores
+        cutoff = (datetime.fromisoformat(max(daily_scores)) -
+                  timedelta(days=DAILY_SCORE_RETENTION_DAYS)).date().isoformat()
+        return {day: score for day, score in daily_scores.items() if day >= cutoff}
+
+    def update_progress(self, username: str, exercise_id: str, score: int,
+                       time_spent: int, topic: str = 'general') -> bool:
+        """Cập nhật tiến độ học tập (một INSERT + một UPDATE cho user)"""
+        try:
+            with self._transaction() as conn:
+                self._apply_attempt(conn, username, exercise_id, score, time_spent, topic,
+                                    datetime.now().isoformat())
+
+            print(f"✅ Progress updated for {username}: +{score} points")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error updating progress: {e}")
+            return False
+
+    def update_progress_batch(self, attempts: List[Dict[str, Any]]) -> bool:
+        """Cập nhật nhiều lượt làm bài trong một transaction"""
+        try:
+            now = datetime.now().isoformat()
+            with self._transaction() as conn:
+                for attempt in attempts:
+                    self._apply_attempt(conn, attempt['username'], attempt['exercise_id'], attempt['score'],
+                                        attempt['time_spent'], attempt['topic'], attempt.get('completed_at') or now)
+
+            print(f"✅ Progress batch applied: {len(attempts)} attempts")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error updating progress batch: {e}")
+            return False
+
+    def get_progress(self, username: str) -> Progress:
+        """Lấy tiến độ học tập"""
+        try:
+            conn = self._connect()
+            row = conn.execute('SELECT * FROM progress WHERE username = ?', (username,)).fetchone()
+            if not row:
+                return Progress(username=username)
+
+            attempts, sessions = self._history_rows(conn, username)
+            return self._progress_from_row(row, attempts, sessions, self._rollups(conn, username),
+                                           self._daily_scores(conn, username))
+
+        except Exception as e:
+            print(f"❌ Error getting progress: {e}")
+            return Progress(username=username)
+
+    def _history_rows(self, conn: sqlite3.Connection, username: str, exercises_offset: int = 0,
+                      games_offset: int = 0) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Lịch sử làm bài / chơi game của user, bỏ qua các bản ghi đầu"""
+        attempts = conn.execute(
+            'SELECT exercise_id, score, topic, time_spent, completed_at FROM exercise_attempts '
+            'WHERE username = ? ORDER BY id LIMIT -1 OFFSET ?', (username, exercises_offset)
+        ).fetchall()
+        sessions = conn.execute(
+            'SELECT session_id, game_type, score, time_spent, completed_at FROM game_sessions '
+            'WHERE username = ? ORDER BY id LIMIT -1 OFFSET ?', (username, games_offset)
+        ).fetchall()
+        return [dict(r) for r in attempts], [dict(r) for r in sessions]
+
+    @staticmethod
+    def _progress_from_row(row: sqlite3.Row, attempts: List[Dict[str, Any]],
+                           sessions: List[Dict[str, Any]],
+                           rollups: Optional[Dict[str, Dict[str, Any]]] = None,
+                           daily_scores: Optional[Dict[str, int]] = None) -> Progress:
+        return Progress.from_dict({
+            'username': row['username'],
+            'completed_exercises': attempts,
+            'game_sessions': sessions,
+            'scores': json.loads(row['scores'] or '{}'),
+            'weak_areas': json.loads(row['weak_areas'] or '[]'),
+            'strengths': json.loads(row['strengths'] or '[]'),
+            'study_time': row['study_time'],
+            'attempts_by_topic': json.loads(row['attempts_by_topic'] or '{}'),
+            'correct_by_topic': json.loads(row['correct_by_topic'] or '{}'),
+            'passed_by_topic': json.loads(row['passed_by_topic'] or '{}'),
+            'last_activity': row['last_activity'],
+            'last_updated': row['last_updated'],
+            'version': row['version'],
+            'version_marks': json.loads(row['version_marks'] or '[]'),
+            'rollups': rollups or {},
+            'daily_scores': daily_scores or {}
+        })
+
+    def get_progress_changes(self, username: str, since: int) -> Optional[Dict[str, Any]]:
+        """Thay đổi tiến độ sau version since: chỉ đọc phần lịch sử client chưa có"""
+        conn = self._connect()
+        row = conn.execute('SELECT * FROM progress WHERE username = ?', (username,)).fetchone()
+        if not row:
+            return Progress(username=username).changes_since(since)
+
+        progress = self._progress_from_row(row, [], [], daily_scores=self._daily_scores(conn, username))
+        if since == progress.version:
+            return None
+        progress.rollups = self._rollups(conn, username)
+        lengths = progress.history_lengths_at(since)
+        if lengths is None:
+            return self.get_progress(username).changes_since(since)
+        changes = progress.delta(since, *self._history_rows(conn, username, *lengths))
+        # progress dựng không kèm lịch sử nên lấy số bài / game từ các cột đếm
+        changes.update(exercises_completed=row['exercises_completed'], games_played=row['games_played'])
+        return changes
+
+    # MOCK TEST HISTORY
+    def save_mock_test_result(self, username: str, test_result: Dict[str, Any]) -> bool:
+        """Lưu kết quả thi thử (giữ MOCK_TEST_CAPACITY bài gần nhất)"""
+        try:
+            now = datetime.now().isoformat()
+            with self._transaction() as conn:
+                # Đánh số tiếp theo bài mới nhất (COUNT(*) bị chặn ở dung lượng nên id sẽ lặp lại)
+                last = conn.execute('SELECT data FROM mock_tests WHERE username = ? ORDER BY id DESC LIMIT 1',
+                                    (username,)).fetchone()
+                number = str(json.loads(last['data']).get('id', '')).rpartition('_')[2] if last else '0'
+                record = {**test_result, 'id': f"test_{int(number) + 1 if number.isdigit() else 1}",
+                          'completed_at': now}
+                conn.execute('INSERT INTO mock_tests (username, data, completed_at) VALUES (?, ?, ?)',
+                             (username, json.dumps(record, ensure_ascii=False), now))
+                conn.execute(
+                    'DELETE FROM mock_tests WHERE username = ? AND id NOT IN '
+                    '(SELECT id FROM mock_tests WHERE username = ? ORDER BY id DESC LIMIT ?)',
+                    (username, username, Config.MOCK_TEST_CAPACITY)
+                )
+            return True
+
+        except Exception as e:
+            print(f"❌ Error saving mock test: {e}")
+            return False
+
+    def get_mock_test_history(self, username: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Lấy lịch sử thi thử gần nhất"""
+        try:
+            rows = self._connect().execute(
+                'SELECT data FROM mock_tests WHERE username = ? ORDER BY id DESC LIMIT ?',
+                (username, limit)
+            ).fetchall()
+            return [json.loads(r['data']) for r in reversed(rows)]
+        except Exception as e:
+            print(f"❌ Error getting mock tests: {e}")
+            return []
+
+    def get_mock_test_sheet(self, username: str, test_id: str) -> Optional[Dict[str, Any]]:
+        """Một bài thi đầy đủ (bảng mock_tests giữ nguyên bản ghi)"""
+        try:
+            rows = self._connect().execute(
+                'SELECT data FROM mock_tests WHERE username = ? ORDER BY id DESC', (username,)
+            )
+            return next((record for record in (json.loads(r['data']) for r in rows)
+                         if record.get('id') == test_id), None)
+        except Exception as e:
+            print(f"❌ Error getting mock test sheet: {e}")
+            return None
+
+    # PROGRESS SUMMARY & HISTORY PAGES
+    def get_progress_summary(self, username: str) -> Dict[str, Any]:
+        """Số liệu tổng hợp của user: chỉ đọc dòng progress và đếm bài thi thử"""
+        try:
+            conn = self._connect()
+            row = conn.execute('SELECT * FROM progress WHERE username = ?', (username,)).fetchone()
+            if not row:
+                return {**Progress(username=username).to_summary_dict(), 'mock_tests_taken': 0}
+            summary = self._progress_from_row(row, [], []).to_summary_dict()
+            summary.update(
+                exercises_completed=row['exercises_completed'],
+                games_played=row['games_played'],
+                mock_tests_taken=conn.execute('SELECT COUNT(*) FROM mock_tests WHERE username = ?',
+                                              (username,)).fetchone()[0]
+            )
+            return summary
+        except Exception as e:
+            print(f"❌ Error getting progress summary: {e}")
+            return {**Progress(username=username).to_summary_dict(), 'mock_tests_taken': 0}
+
+    # Loại lịch sử -> (bảng, các cột trả về)
+    HISTORY_TABLES = {
+        'attempts': ('exercise_attempts', 'exercise_id, score, topic, time_spent, completed_at'),
+        'games': ('game_sessions', 'session_id, game_type, score, time_spent, completed_at'),
+        'mock_tests': ('mock_tests', 'data')
+    }
+
+    def get_history_page(self, username: str, kind: str, cursor: Optional[int] = None,
+                         limit: int = 20) -> Dict[str, Any]:
+        """Một trang lịch sử (mới nhất trước); cursor là id của dòng cũ nhất đã trả về"""
+        try:
+            table, columns = self.HISTORY_TABLES[kind]
+            # Lấy thừa một dòng để biết còn trang sau không (dùng index (username, id))
+            rows = self._connect().execute(
+                f'SELECT id, {columns} FROM {table} WHERE username = ? AND id < ? ORDER BY id DESC LIMIT ?',
+                (username, cursor if cursor is not None else 2 ** 63 - 1, limit + 1)
+            ).fetchall()
+            page = rows[:limit]
+            if kind == 'mock_tests':
+                items = [json.loads(r['data']) for r in page]
+            else:
+                items = [{key: r[key] for key in r.keys() if key != 'id'} for r in page]
+            return {'items': items, 'next_cursor': page[-1]['id'] if len(rows) > limit else None}
+        except Exception as e:
+            print(f"❌ Error getting {kind} page: {e}")
+            return {'items': [], 'next_cursor': None}
+
+    # EXERCISE MANAGEMENT
+    def get_exercises_by_topic(self, topic: str = 'all', limit: int = 20,
+                               difficulty: Optional[str] = None) -> List[Exercise]:
+        """Lấy bài tập theo chủ đề (và độ khó)"""
+        try:
+            conn = self._connect()
+            # Chỉ đọc id qua index (topic, difficulty) rồi chọn k id, thay vì
+            # ORDER BY RANDOM() phải sắp xếp cả bucket cùng dữ liệu bài tập
+            conditions, params = [], []
+            if topic != 'all':
+                conditions.append('topic = ?')
+                params.append(topic)
+            if difficulty:
+                conditions.append('difficulty = ?')
+                params.append(difficulty)
+            where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+            cursor = conn.execute(f'SELECT id FROM exercises{where}', params)
+            ids = reservoir_sample((r['id'] for r in cursor), limit)
+            if not ids:
+                return []
+
+            placeholders = ','.join('?' * len(ids))
+            rows = {r['id']: r['data'] for r in conn.execute(
+                f'SELECT id, data FROM exercises WHERE id IN ({placeholders})', ids)}
+            return [Exercise.from_dict(json.loads(rows[i])) for i in ids if i in rows]
+
+        except Exception as e:
+            print(f"❌ Error getting exercises: {e}")
+            return []
+
+    def get_exercise_by_id(self, exercise_id: int) -> Optional[Exercise]:
+        """Lấy bài tập theo ID"""
+        try:
+            row = self._connect().execute('SELECT data FROM exercises WHERE id = ?', (exercise_id,)).fetchone()
+            return Exercise.from_dict(json.loads(row['data'])) if row else None
+        except Exception as e:
+            print(f"❌ Error getting exercise by ID: {e}")
+            return None
+
+    # LEADERBOARD
+    def get_leaderboard(self, limit: int = 10, window: str = 'all') -> List[Dict[str, Any]]:
+        """Lấy bảng xếp hạng (dùng index trên total_score, hoặc daily_scores theo khoảng)"""
+        try:
+            if window != 'all':
+                rows = self._connect().execute(
+                    'SELECT p.username, p.total_score, p.games_played, p.exercises_completed, p.study_time, '
+                    'w.window_score FROM (SELECT username, SUM(score) AS window_score FROM daily_scores '
+                    'WHERE day >= ? GROUP BY username HAVING window_score > 0) w '
+                    'JOIN progress p ON p.username = w.username '
+                    'ORDER BY w.window_score DESC, p.username LIMIT ?', (window_start(window), limit)
+                ).fetchall()
+                return [{**dict(r), 'rank': i + 1} for i, r in enumerate(rows)]
+
+            rows = self._connect().execute(
+                'SELECT username, total_score, games_played, exercises_completed, study_time '
+                'FROM progress ORDER BY total_score DESC, username LIMIT ?', (limit,)
+            ).fetchall()
+            return [{**dict(r), 'rank': i + 1} for i, r in enumerate(rows)]
+
+        except Exception as e:
+            print(f"❌ Error getting leaderboard: {e}")
+            return []
+
+    def get_leaderboard_rank(self, username: str, radius: int = 5) -> Optional[Dict[str, Any]]:
+        """Thứ hạng của user và các user xếp ngay trên/dưới"""
+        try:
+            conn = self._connect()
+            row = conn.execute('SELECT total_score FROM progress WHERE username = ?', (username,)).fetchone()
+            if row is None:
+                return None
+            score = row['total_score']
+            ahead = conn.execute(
+                'SELECT COUNT(*) FROM progress WHERE total_score > ? OR (total_score = ? AND username < ?)',
+                (score, score, username)
+            ).fetchone()[0]
+            total = conn.execute('SELECT COUNT(*) FROM progress').fetchone()[0]
+            start = max(0, ahead - radius)
+            rows = conn.execute(
+                'SELECT username, total_score, games_played, exercises_completed, study_time '
+                'FROM progress ORDER BY total_score DESC, username LIMIT ? OFFSET ?',
+                (ahead - start + radius + 1, start)
+            ).fetchall()
+            return {
+                'username': username,
+                'rank': ahead + 1,
+                'total_users': total,
+                'around': [{**dict(r), 'rank': start + i + 1} for i, r in enumerate(rows)]
+            }
+
+        except Exception as e:
+            print(f"❌ Error getting leaderboard rank: {e}")
+            return None
@@ -0,0 +1,129 @@
+import atexit
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+class UserMetaBuffer:
+    """Write-behind cho metadata ít quan trọng của user (last_login, login_count).
+
+    Đăng nhập chỉ ghi vào bộ nhớ; một thread nền định kỳ gọi flush(updates)
+    với mọi thay đổi đang chờ để storage ghi một lần cho cả batch (thay vì
+    ghi lại users.json sau mỗi lần đăng nhập). updates có dạng
+    {username: {'last_login': thời điểm mới nhất, 'login_count': số lần tăng}}.
+    Phần còn chờ được ghi nốt khi tắt; crash thì chỉ mất các lần đăng nhập
+    trong khoảng interval cuối.
+
+    flush() tách buffer ra dưới lock rồi mới ghi: đăng nhập mới trong lúc ghi
+    vào buffer mới, chỉ gộp trả lại khi ghi lỗi. Lần đọc (load_user) không
+    chạy chồng lên một lần ghi để không cộng trùng hoặc bỏ sót phần đang ghi.
+    """
+
+    def __init__(self, flush: Callable[[Dict[str, Dict[str, Any]]], None], interval: float = 5.0):
+        self._flush = flush
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._flushing: Dict[str, Dict[str, Any]] = {}
+        self._generation = 0  # Tăng khi bắt đầu và khi kết thúc mỗi lần ghi
+        self.logins_recorded = 0
+        self.flushes = 0
+
+        self._thread = threading.Thread(target=self._run, name='user-meta-flusher', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def record_login(self, username: str, timestamp: str):
+        with self._lock:
+            meta = self._pending.setdefault(username, {'last_login': timestamp, 'login_count': 0})
+            meta['last_login'] = max(meta['last_login'], timestamp)
+            meta['login_count'] += 1
+            self.logins_recorded += 1
+
+    @staticmethod
+    def _merge(meta: Dict[str, Any], other: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if not other:
+            return meta
+        return {
+            'last_login': max(meta['last_login'], other['last_login']),
+            'login_count': meta['login_count'] + other['login_count']
+        }
+
+    def load_user(self, username: str, load: Callable[[], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """Đọc user_data qua load() rồi cộng thay đổi chưa ghi.
+
+        Nếu đang có lần ghi thì chờ nó xong; nếu một lần ghi chen vào giữa lúc
+        load() đọc storage thì đọc lại, để bản đọc và buffer luôn khớp nhau.
+        """
+        while True:
+            with self._lock:
+                generation, writing = self._generation, bool(self._flushing)
+            if writing:
+                with self._flush_lock:
+                    pass
+                continue
+            user_data = load()
+            with self._lock:
+                if generation == self._generation:
+                    meta = dict(self._pending[username]) if username in self._pending else None
+                    break
+        if user_data is None or meta is None:
+            return user_data
+        return {
+            **user_data,
+            'last_login': max(user_data.get('last_login') or '', meta['last_login']),
+            'login_count': user_data.get('login_count', 0) + meta['login_count']
+        }
+
+    def flush(self) -> int:
+        """Ghi các thay đổi đang chờ, trả về số user được ghi"""
+        with self._flush_lock:
+            with self._lock:
+                updates, self._pending = self._pending, {}
+                if not updates:
+                    return 0
+                self._flushing = updates
+                self._generation += 1
+            try:
+                self._flush(updates)
+            except Exception as e:
+                print(f"❌ User metadata flush error: {e}")
+                # Trả lại để thử lại lần sau (gộp với các lần đăng nhập mới)
+                with self._lock:
+                    for username, meta in updates.items():
+                        self._pending[username] = self._merge(meta, self._pending.get(username))
+                    self._flushing = {}
+                    self._generation += 1
+                return 0
+            with self._lock:
+                self._flushing = {}
+                self._generation += 1
+                self.flushes += 1
+            return len(updates)
+
+    def _run(self):
+        while not self._stopped:
+            self._wakeup.wait(self.interval)
+            if self._stopped:
+                break
+            self.flush()
+
+    def close(self):
+        """Dừng thread nền và ghi nốt phần còn chờ"""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._wakeup.set()
+        self._thread.join()
+        self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'interval': self.interval,
+                'logins_recorded': self.logins_recorded,
+                'flushes': self.flushes,
+                'pending_users': len(self._pending)
+            }
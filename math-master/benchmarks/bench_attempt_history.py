@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+So sánh bộ nhớ và kích thước JSON của lịch sử làm bài: list dict (dạng cũ)
+với AttemptHistory dạng cột.
+
+Ví dụ:
+    python benchmarks/bench_attempt_history.py
+    python benchmarks/bench_attempt_history.py --attempts 1000000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from attempt_history import AttemptHistory
+
+TOPICS = ['numbers', 'geometry', 'measurement', 'word_problems', 'fractions']
+
+
+def _records(n, rng):
+    start = datetime(2024, 9, 5, 7, 30)
+    for i in range(n):
+        yield {
+            'exercise_id': rng.randint(1, 5000),
+            'score': rng.choice([0, 10]),
+            'topic': rng.choice(TOPICS),
+            'time_spent': rng.randint(10, 300),
+            'completed_at': (start + timedelta(seconds=i * 37, microseconds=rng.randint(0, 999999))).isoformat()
+        }
+
+
+def _measure(label, build):
+    tracemalloc.start()
+    value = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<28} {size / 1e6:>8.1f} MB")
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark AttemptHistory')
+    parser.add_argument('--attempts', type=int, default=200000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"📚 {args.attempts} lượt làm bài")
+    print("Bộ nhớ:")
+    records = _measure('list dict', lambda: list(_records(args.attempts, random.Random(args.seed))))
+
+    def build_history():
+        history = AttemptHistory.for_exercises()
+        for record in _records(args.attempts, random.Random(args.seed)):
+            history.append(record)
+        return history
+
+    history = _measure('AttemptHistory (cột)', build_history)
+
+    print("JSON trên đĩa:")
+    list_json = json.dumps(records, ensure_ascii=False)
+    columnar_json = json.dumps(history.encode(), ensure_ascii=False)
+    print(f"  {'list dict':<28} {len(list_json) / 1e6:>8.1f} MB")
+    print(f"  {'AttemptHistory.encode()':<28} {len(columnar_json) / 1e6:>8.1f} MB")
+
+    started = time.perf_counter()
+    decoded = AttemptHistory.for_exercises(json.loads(columnar_json))
+    length = len(decoded)
+    print(f"  đọc lại + len(): {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    assert length == len(records)
+    assert decoded[0] == records[0] and decoded[-1] == records[-1]
+    print("✅ Dữ liệu giải mã khớp bản gốc")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark bảng xếp hạng: so sánh sắp xếp lại toàn bộ mỗi request (cách cũ)
+với LeaderboardIndex cập nhật dần, trên N user giả lập.
+
+Ví dụ:
+    python benchmarks/bench_leaderboard.py
+    python benchmarks/bench_leaderboard.py --users 100000 --updates 50000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from leaderboard import LeaderboardIndex
+
+
+def _timed(label, fn, repeat=1):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = (time.perf_counter() - started) / repeat
+    print(f"  {label:<40} {elapsed * 1e6:>12.1f} µs")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark LeaderboardIndex')
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--updates', type=int, default=20000)
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    summaries = {
+        f"student_{i:06d}": {
+            'total_score': rng.randint(0, 5000),
+            'games_played': rng.randint(0, 50),
+            'exercises_completed': rng.randint(0, 200),
+            'study_time': rng.randint(0, 20000)
+        }
+        for i in range(args.users)
+    }
+    usernames = list(summaries)
+    print(f"🏆 {args.users} user, {args.updates} lần cập nhật, {args.queries} truy vấn")
+
+    print("Cách cũ (sắp xếp toàn bộ mỗi request):")
+    _timed('top 20', lambda: sorted(
+        ({'username': u, **s} for u, s in summaries.items()),
+        key=lambda x: x['total_score'], reverse=True)[:20], repeat=5)
+
+    print("LeaderboardIndex:")
+    index = LeaderboardIndex()
+    _timed('rebuild', lambda: index.rebuild(lambda: summaries))
+    _timed('top 20', lambda: index.top(20), repeat=args.queries)
+
+    targets = [rng.choice(usernames) for _ in range(args.queries)]
+    it = iter(targets * 2)
+    _timed('rank(user)', lambda: index.rank(next(it)), repeat=args.queries)
+    it = iter(targets * 2)
+    _timed('around(user, 5)', lambda: index.around(next(it), 5), repeat=args.queries)
+
+    def one_update():
+        username = rng.choice(usernames)
+        summary = summaries[username]
+        summary['total_score'] += rng.randint(1, 10)
+        index.update(username, summary)
+
+    _timed('update (điểm mới của một user)', one_update, repeat=args.updates)
+
+    # Kiểm tra index vẫn khớp với sắp xếp đầy đủ
+    expected = sorted(summaries, key=lambda u: (-summaries[u]['total_score'], u))
+    assert [row['username'] for row in index.top(100)] == expected[:100]
+    for username in targets[:100]:
+        assert index.rank(username) == expected.index(username) + 1
+    print("✅ Kết quả khớp với sắp xếp đầy đủ")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark model: chi phí tạo object (from_dict), to_dict và serialize
+100k Exercise / Progress.
+
+"Trước" là bản sao của class không có __slots__, serialize bằng json của
+thư viện chuẩn; "sau" là model hiện tại qua serializers (orjson nếu có cài).
+
+Ví dụ:
+    python benchmarks/bench_models.py
+    python benchmarks/bench_models.py --count 20000
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import serializers
+from models import Exercise, Progress, create_sample_exercises
+
+
+def _without_slots(cls):
+    """Bản sao của class dùng __dict__ như trước khi thêm __slots__"""
+    namespace = {name: value for name, value in cls.__dict__.items()
+                 if name not in cls.__slots__ and name not in ('__slots__', '__dict__', '__weakref__')}
+    return type(cls.__name__ + 'WithDict', cls.__bases__, namespace)
+
+
+def _exercise_dicts(count, rng):
+    samples = [ex.to_dict() for ex in create_sample_exercises()]
+    return [{**rng.choice(samples), 'id': i} for i in range(count)]
+
+
+def _progress_dicts(count, rng):
+    docs = []
+    for i in range(count):
+        progress = Progress(username=f'student_{i:06d}')
+        for n in range(rng.randint(1, 5)):
+            progress.add_completed_exercise(n, rng.choice([0, 10]), rng.choice(['numbers', 'geometry']),
+                                            rng.randint(10, 120))
+        docs.append(progress.to_dict())
+    return docs
+
+
+def _per_object(label, fn, count):
+    # Tắt GC khi đo như timeit để số liệu ổn định
+    gc.collect()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+    finally:
+        gc.enable()
+    print(f"    {label:<24} {elapsed / count * 1e6:>8.2f} µs/object")
+    return result
+
+
+def _memory_per_object(build, count):
+    tracemalloc.start()
+    objects = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size / count
+
+
+def _bench(name, cls, docs):
+    count = len(docs)
+    before_cls = _without_slots(cls)
+    print(f"{name} ({count} object):")
+    for label, model, dump in (('trước', before_cls, lambda data: json.dumps(data, ensure_ascii=False)),
+                               ('sau', cls, serializers.dumps)):
+        print(f"  {label}:")
+        objects = _per_object('from_dict', lambda: [model.from_dict(doc) for doc in docs], count)
+        dicts = _per_object('to_dict', lambda: [obj.to_dict() for obj in objects], count)
+        _per_object('serialize', lambda: dump(dicts), count)
+        memory = _memory_per_object(lambda: [model.from_dict(doc) for doc in docs], count)
+        print(f"    {'bộ nhớ':<24} {memory:>8.0f} bytes/object")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark models + serializers')
+    parser.add_argument('--count', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"⚙️ serializers: {serializers.get_backends()}")
+    _bench('Exercise', Exercise, _exercise_dicts(args.count, rng))
+    _bench('Progress', Progress, _progress_dicts(args.count, rng))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Stress test ghi tiến độ đồng thời: nhiều process x nhiều thread cùng POST
+/api/progress vào một DATA_DIR tạm, sau đó kiểm tra không mất điểm nào.
+
+Ví dụ:
+    python benchmarks/stress_progress.py
+    PROGRESS_LAYOUT=sharded python benchmarks/stress_progress.py --processes 8
+    JSON_WRITE_MODE=batched python benchmarks/stress_progress.py --threads 32
+    PROGRESS_LOG_ENABLED=true python benchmarks/stress_progress.py --processes 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+
+
+def _student(i, users):
+    return f"student_{i % users:03d}"
+
+
+def _worker(worker_id, threads, requests, users, result_queue):
+    """Một "worker gunicorn": import app và bắn request từ nhiều thread"""
+    sys.path.insert(0, BACKEND_DIR)
+    from app import app
+    from database import db_manager
+
+    client_lock = threading.Lock()
+    expected = Counter()
+    errors = []
+
+    def run(thread_id):
+        client = app.test_client()
+        local = Counter()
+        for n in range(requests):
+            username = _student(worker_id * 7919 + thread_id * 31 + n, users)
+            resp = client.post('/api/progress', json={
+                'username': username,
+                'exercise_id': f'stress_{worker_id}_{thread_id}_{n}',
+                'score': 1,
+                'time_spent': 1,
+                'topic': 'numbers'
+            })
+            if resp.status_code != 200 or not resp.get_json().get('success'):
+                errors.append(resp.status_code)
+                continue
+            local[username] += 1
+        with client_lock:
+            expected.update(local)
+
+    pool = [threading.Thread(target=run, args=(t,)) for t in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+
+    # Tiến trình con thoát bằng os._exit nên phải tự ghi nốt dữ liệu đang chờ
+    if db_manager.progress_log:
+        db_manager.progress_log.close()
+    db_manager.writer.close()
+    result_queue.put((dict(expected), len(errors)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stress test /api/progress')
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=50, help='số request mỗi thread')
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--keep', action='store_true', help='giữ lại DATA_DIR tạm')
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix='math_master_stress_')
+    os.environ['DATA_DIR'] = data_dir
+    os.environ.setdefault('GEMINI_API_KEY', 'your_gemini_key_here')  # không gọi AI thật
+
+    total = args.processes * args.threads * args.requests
+    print(f"🚀 {total} POST /api/progress ({args.processes} process x {args.threads} thread), "
+          f"{args.users} học sinh, DATA_DIR={data_dir}")
+
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    started = time.time()
+    procs = [ctx.Process(target=_worker, args=(i, args.threads, args.requests, args.users, queue))
+             for i in range(args.processes)]
+    for p in procs:
+        p.start()
+    results = [queue.get() for _ in procs]
+    for p in procs:
+        p.join()
+    elapsed = time.time() - started
+
+    expected = Counter()
+    failed = 0
+    for counts, errors in results:
+        expected.update(counts)
+        failed += errors
+
+    sys.path.insert(0, BACKEND_DIR)
+    from database import db_manager
+    lost = 0
+    for username, points in sorted(expected.items()):
+        stored = db_manager.get_progress(username).scores.get('numbers', 0)
+        if stored != points:
+            lost += points - stored
+            print(f"❌ {username}: mong đợi {points} điểm, lưu được {stored}")
+
+    print(f"⏱️ {elapsed:.2f}s ({total / elapsed:.0f} req/s), lỗi HTTP: {failed}, điểm bị mất: {lost}")
+
+    if db_manager.progress_log:
+        db_manager.progress_log.close()
+    if not args.keep:
+        shutil.rmtree(data_dir, ignore_errors=True)
+    if lost or failed:
+        sys.exit(1)
+    print("✅ Không mất cập nhật nào")
+
+
+if __name__ == '__main__':
+    main()
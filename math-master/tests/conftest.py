@@ -0,0 +1,40 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+sys.path.insert(0, BACKEND_DIR)
+
+# Config đọc biến môi trường lúc import: không ghi vào data/ thật, không gọi Gemini,
+# không chạy thread ghi metadata đăng nhập
+os.environ['DATA_DIR'] = tempfile.mkdtemp(prefix='math-master-tests-')
+os.environ['GEMINI_API_KEY'] = ''
+os.environ['USER_META_FLUSH_INTERVAL'] = '0'
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    """Config với mọi đường dẫn dữ liệu trỏ vào tmp_path"""
+    from config import Config
+    data_dir = Config.DATA_DIR
+    for name, value in list(vars(Config).items()):
+        if isinstance(value, str) and value.startswith(data_dir):
+            monkeypatch.setattr(Config, name, str(tmp_path) + value[len(data_dir):])
+    return Config
+
+
+@pytest.fixture
+def make_db(config, monkeypatch):
+    """Tạo DatabaseManager ('json' hoặc 'sqlite') trên thư mục dữ liệu tạm,
+    các tham số khác ghi đè Config (ví dụ PROGRESS_LAYOUT='sharded')"""
+    def make(backend='json', **settings):
+        for name, value in settings.items():
+            monkeypatch.setattr(config, name, value)
+        if backend == 'sqlite':
+            from sqlite_storage import SQLiteDatabaseManager
+            return SQLiteDatabaseManager()
+        from database import DatabaseManager
+        return DatabaseManager()
+    return make
@@ -0,0 +1,23 @@
+import pytest
+
+from ai_cache import PromptCache
+from config import Config
+
+
+@pytest.mark.parametrize('kind', ['adaptive_exercise', 'review_quiz', 'mock_test'])
+def test_generated_content_is_not_cached(tmp_path, kind):
+    # Bấm "tạo đề mới" hai lần với cùng prompt phải gọi lại API
+    cache = PromptCache(str(tmp_path / 'ai_cache.db'), Config.AI_CACHE_TTLS)
+    key = PromptCache.make_key('model', 'Tạo đề ôn tập')
+    cache.store(kind, key, 'đề số 1', 1.0)
+
+    assert cache.lookup(kind, key) is None
+    assert cache.get_stats()['bypassed'] == 1
+
+
+def test_explanation_is_served_from_cache(tmp_path):
+    cache = PromptCache(str(tmp_path / 'ai_cache.db'), Config.AI_CACHE_TTLS)
+    key = PromptCache.make_key('model', 'Giải thích  2 + 2')
+    cache.store('smart_explanation', key, 'Bằng 4', 1.0)
+
+    assert cache.lookup('smart_explanation', PromptCache.make_key('model', 'Giải thích 2 + 2')) == 'Bằng 4'
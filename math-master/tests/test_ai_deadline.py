@@ -0,0 +1,68 @@
+import threading
+import time
+
+import pytest
+
+from ai_services import AIService
+
+
+@pytest.fixture
+def service():
+    service = AIService()
+    service.deadlines = {'chat': 0.05}
+    service.hedge_capacity = 2
+    release = threading.Event()
+    yield service, release
+    release.set()
+
+
+def test_deadline_returns_result_in_time(service):
+    service, _ = service
+    assert service._with_deadline('chat', lambda: 'answer') == 'answer'
+    assert service.get_deadline_stats()['in_flight'] == 0
+
+
+def test_hung_call_falls_back_and_finishes_in_background(service):
+    service, release = service
+    assert service._with_deadline('chat', lambda: release.wait(5) and 'late') is None
+
+    stats = service.get_deadline_stats()
+    assert stats['fallbacks'] == {'chat': 1} and stats['late_pending'] == 1
+    release.set()
+    for _ in range(100):
+        if service.get_deadline_stats()['late_pending'] == 0:
+            break
+        time.sleep(0.01)
+    stats = service.get_deadline_stats()
+    assert stats['late_completed'] == 1 and stats['in_flight'] == 0
+
+
+def test_saturated_pool_skips_hedging(service):
+    service, release = service
+    for _ in range(2):
+        assert service._with_deadline('chat', lambda: release.wait(5)) is None
+
+    started = time.monotonic()
+    calls = []
+    assert service._with_deadline('chat', lambda: calls.append(1)) is None
+    assert time.monotonic() - started < 0.05
+    assert calls == []
+
+    stats = service.get_deadline_stats()
+    assert stats['saturated'] == {'chat': 1}
+    assert stats['in_flight'] == 2 == stats['capacity']
+    assert all(thread.daemon for thread in threading.enumerate() if thread.name.startswith('ai-hedge'))
+
+
+def test_adaptive_exercise_spends_deadline_on_generation_only(service, monkeypatch):
+    service, _ = service
+    service.deadlines = {'adaptive_exercise': 0.2}
+    gemini = type('Gemini', (), {})()
+    gemini.client = object()
+    gemini.generate_adaptive_exercise = lambda *args: time.sleep(0.15) or {'question': 'AI'}
+    monkeypatch.setattr(service, 'gemini', gemini)
+    # Lần gọi API kiểm tra kết nối không được ăn vào hạn chờ của request
+    monkeypatch.setattr(service, 'check_ai_connection', lambda: time.sleep(0.15) or True)
+
+    assert service.generate_adaptive_exercise('beginner', ['numbers'], {}) == {'question': 'AI'}
+    assert service.get_deadline_stats()['fallbacks'] == {}
@@ -0,0 +1,44 @@
+from array import array
+
+from attempt_history import AttemptHistory
+
+
+def _records(count):
+    return [{'exercise_id': f'ex_{i}', 'score': i % 11, 'topic': ('numbers', 'geometry')[i % 2],
+             'time_spent': 30 + i, 'completed_at': f'2024-05-{1 + i % 28:02d}T10:00:00.123456'}
+            for i in range(count)]
+
+
+def test_list_source_is_held_as_columns():
+    records = _records(20)
+    source = [dict(record) for record in records]
+    history = AttemptHistory.for_exercises(source)
+    assert len(history) == 20
+
+    # Document lưu dạng list cũng được chuyển sang các cột, list nguồn (trong cache) không bị sửa
+    history.append({'exercise_id': 7, 'score': 3, 'topic': 'numbers', 'time_spent': 5,
+                    'completed_at': '2024-06-01T08:00:00'})
+    assert isinstance(history.ts, array) and len(history.ts) == 21
+    assert history.extras == {}
+    assert source == records
+    assert history[:20] == records
+    assert history.total_time_spent() == sum(r['time_spent'] for r in records) + 5
+
+
+def test_encoding_round_trip_keeps_odd_records():
+    records = _records(5) + [{'exercise_id': 'ex_odd', 'score': 1.5, 'topic': 'numbers'}]
+    history = AttemptHistory.for_exercises(records)
+    decoded = AttemptHistory.for_exercises(history.encode())
+    assert decoded.to_list() == records
+    assert len(decoded.extras) == 1
+
+
+def test_progress_is_stored_columnar_by_default(make_db, config):
+    db = make_db('json')
+    db.init_user_progress('alice')
+    db.update_progress('alice', 'ex_1', 7, 60, 'numbers')
+
+    doc = db.progress_store.get('alice')
+    assert AttemptHistory.is_encoded(doc['exercise_history'])
+    assert 'completed_exercises' not in doc
+    assert [r['exercise_id'] for r in db.get_progress('alice').completed_exercises] == ['ex_1']
@@ -0,0 +1,122 @@
+import json
+import os
+import stat
+import threading
+
+import pytest
+
+import json_writer
+from json_writer import JSONFileWriter
+
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return json.loads(f.read())
+
+
+def _leftovers(directory):
+    return [name for name in os.listdir(directory) if name.endswith('.tmp')]
+
+
+# ==================== GHI ATOMIC ====================
+@pytest.mark.parametrize('mode', JSONFileWriter.MODES)
+def test_write_replaces_file(tmp_path, mode):
+    path = str(tmp_path / 'data.json')
+    written = []
+    writer = JSONFileWriter(mode, window=0.01, on_written=lambda p, token: written.append(token))
+    writer.write(path, {'v': 1}, token=1)
+    writer.write(path, {'v': 2}, token=2)
+    writer.close()
+
+    assert _read(path) == {'v': 2}
+    assert written[-1] == 2
+    assert _leftovers(tmp_path) == []
+
+
+@pytest.mark.parametrize('mode', ['sync', 'batched'])
+def test_directory_is_synced_after_replace(tmp_path, monkeypatch, mode):
+    synced = []
+    real_fsync = os.fsync
+
+    def fsync(fd):
+        synced.append('dir' if stat.S_ISDIR(os.fstat(fd).st_mode) else 'file')
+        real_fsync(fd)
+
+    monkeypatch.setattr(json_writer.os, 'fsync', fsync)
+    writer = JSONFileWriter(mode, window=0.05)
+    threads = [threading.Thread(target=writer.write, args=(str(tmp_path / name), {'v': 1}))
+               for name in ('a.json', 'b.json')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    writer.close()
+
+    # Sau os.replace thư mục được fsync; batch chỉ fsync thư mục một lần
+    assert synced.count('file') == 2 and synced[-1] == 'dir'
+    assert synced.count('dir') == (2 if mode == 'sync' else 1)
+
+
+def test_failed_write_keeps_previous_file(tmp_path, monkeypatch):
+    path = str(tmp_path / 'data.json')
+    writer = JSONFileWriter('sync')
+    writer.write(path, {'v': 1})
+
+    def crash(fd):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(json_writer.os, 'fsync', crash)
+    with pytest.raises(OSError):
+        writer.write(path, {'v': 2})
+
+    # File cũ còn nguyên, không sót file tạm
+    assert _read(path) == {'v': 1}
+    assert _leftovers(tmp_path) == []
+
+
+def test_batched_write_reports_error_to_waiters(tmp_path):
+    writer = JSONFileWriter('batched', window=0)
+    with pytest.raises(OSError):
+        writer.write(str(tmp_path / 'missing' / 'data.json'), {'v': 1})
+    writer.close()
+
+
+def test_batched_writes_are_coalesced(tmp_path):
+    path = str(tmp_path / 'data.json')
+    writer = JSONFileWriter('batched', window=0.05)
+    threads = [threading.Thread(target=writer.write, args=(path, {'v': i})) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    writer.close()
+
+    stats = writer.get_stats()
+    assert stats['writes_requested'] == 20
+    assert stats['files_written'] < 20
+    assert _read(path)['v'] in range(20)
+
+
+# ==================== PHỤC HỒI ====================
+def test_failed_save_is_not_served_from_cache(make_db, config, monkeypatch):
+    db = make_db('json', JSON_CACHE_ENABLED=True)
+    db.init_user_progress('alice')
+    before = db._load_json(config.PROGRESS_FILE)
+    assert 'alice' in before
+
+    def crash(file_path, text):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(db.writer, '_write_file', crash)
+    with pytest.raises(OSError):
+        db._save_json(config.PROGRESS_FILE, {})
+
+    # Cache bị bỏ nên lần đọc sau lấy lại bản trên đĩa
+    assert db._load_json(config.PROGRESS_FILE) == before
+
+
+def test_corrupt_file_reads_as_missing(make_db, config):
+    db = make_db('json', JSON_CACHE_ENABLED=False)
+    with open(config.PROGRESS_FILE, 'w') as f:
+        f.write('{"alice": {"username": "ali')
+    assert db._load_json(config.PROGRESS_FILE) is None
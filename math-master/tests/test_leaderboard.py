@@ -0,0 +1,124 @@
+import random
+from bisect import bisect_left
+from datetime import date, timedelta
+
+import pytest
+
+from leaderboard import LeaderboardIndex, SortedKeyList
+
+
+# ==================== BẢNG XẾP HẠNG ====================
+def _summaries(scores, daily=None):
+    return {username: {'total_score': score, 'daily_scores': (daily or {}).get(username, {})}
+            for username, score in scores.items()}
+
+
+def test_leaderboard_rank_and_neighbours():
+    index = LeaderboardIndex()
+    index.rebuild(lambda: _summaries({'an': 30, 'binh': 50, 'chi': 30, 'dung': 10}))
+
+    assert [row['username'] for row in index.top(3)] == ['binh', 'an', 'chi']
+    assert [index.rank(name) for name in ('binh', 'an', 'chi', 'dung')] == [1, 2, 3, 4]
+    assert index.rank('unknown') is None
+    assert [row['username'] for row in index.around('chi', radius=1)] == ['an', 'chi', 'dung']
+    assert index.around('chi', radius=1)[1]['rank'] == 3
+
+
+def test_leaderboard_update_moves_user():
+    index = LeaderboardIndex()
+    index.rebuild(lambda: _summaries({'an': 30, 'binh': 50, 'chi': 20}))
+
+    index.update('chi', {'total_score': 60, 'daily_scores': {}})
+    assert [row['username'] for row in index.top()] == ['chi', 'binh', 'an']
+    index.update('moi', {'total_score': 40, 'daily_scores': {}})
+    assert index.rank('moi') == 3 and len(index) == 4
+
+
+def test_leaderboard_ignores_stale_update():
+    index = LeaderboardIndex()
+    index.update('an', {'total_score': 30}, version=3)
+    # Request cũ hơn (version 2) về sau: không ghi đè điểm mới
+    index.update('an', {'total_score': 20}, version=2)
+    assert index.top()[0]['total_score'] == 30
+    index.update('an', {'total_score': 40}, version=4)
+    assert index.top()[0]['total_score'] == 40
+
+
+def test_sorted_key_list_matches_sorted_list(monkeypatch):
+    monkeypatch.setattr(SortedKeyList, 'CHUNK', 8)
+    rng = random.Random(7)
+    expected = sorted((-rng.randint(0, 50), f'u{i}') for i in range(200))
+    keys = SortedKeyList(expected)
+    for _ in range(2000):
+        if expected and rng.random() < 0.5:
+            key = expected.pop(rng.randrange(len(expected)))
+            assert keys.remove(key)
+            assert not keys.remove(key)
+        else:
+            key = (-rng.randint(0, 50), f'n{rng.randint(0, 10 ** 6)}')
+            if key not in expected:
+                expected.insert(bisect_left(expected, key), key)
+                keys.add(key)
+        assert len(keys) == len(expected)
+    assert [keys[i] for i in range(len(keys))] == expected
+    for key in expected[::7] + [(-100, 'a'), (1, 'z')]:
+        assert keys.index(key) == bisect_left(expected, key)
+
+
+def test_leaderboard_window_sums_daily_buckets():
+    today = date.today()
+    old = (today - timedelta(days=60)).isoformat()
+    index = LeaderboardIndex()
+    index.rebuild(lambda: _summaries({'an': 100, 'binh': 20}, daily={
+        'an': {old: 100},
+        'binh': {today.isoformat(): 20},
+    }))
+
+    rows = index.top_window(today.isoformat())
+    assert [(row['username'], row['window_score']) for row in rows] == [('binh', 20)]
+
+
+def test_leaderboard_keeps_only_window_buckets(monkeypatch):
+    import leaderboard
+    today = date(2024, 5, 15)
+    monkeypatch.setattr(leaderboard, 'date', type('FakeDate', (date,), {'today': classmethod(lambda cls: today)}))
+    index = LeaderboardIndex()
+    # Bài làm gửi bù với ngày cũ: không tạo bucket ngoài các khoảng
+    index.update('an', {'total_score': 15, 'daily_scores': {'2024-01-02': 5, '2024-05-14': 10}})
+    assert sorted(index._daily) == ['2024-05-14']
+
+    # Sang tháng sau: bucket của tháng trước bị bỏ, bảng tháng chỉ còn điểm mới
+    today = date(2024, 6, 3)
+    index.update('binh', {'total_score': 4, 'daily_scores': {'2024-06-03': 4}})
+    assert sorted(index._daily) == ['2024-06-03']
+    assert [(row['username'], row['window_score']) for row in index.top_window('2024-06-01')] == [('binh', 4)]
+
+
+@pytest.mark.parametrize('backend', ['json', 'sqlite'])
+def test_database_rank_follows_updates(make_db, backend):
+    db = make_db(backend, PROGRESS_LAYOUT='sharded', PROGRESS_SHARDS=4)
+    names = ('an', 'binh', 'chi')
+    ours = lambda rows: [row['username'] for row in rows if row['username'] in names]
+    for username, score in zip(names, (500, 900, 100)):
+        db.init_user_progress(username)
+        db.update_progress(username, 'ex_1', score, 60, 'numbers')
+
+    assert ours(db.get_leaderboard(100)) == ['binh', 'an', 'chi']
+    db.update_progress('chi', 'ex_2', 1000, 60, 'numbers')
+    assert ours(db.get_leaderboard(100)) == ['chi', 'binh', 'an']
+    rank = db.get_leaderboard_rank('chi', radius=1)
+    assert rank['rank'] == 1 and rank['total_users'] == len(db.get_leaderboard(100))
+    assert ours(rank['around']) == ['chi', 'binh']
+    assert ours(db.get_leaderboard(100, window='today')) == ['chi', 'binh', 'an']
+
+
+def test_sqlite_import_keeps_window_scores(make_db, tmp_path):
+    json_db = make_db('json')
+    json_db.init_user_progress('an')
+    json_db.update_progress('an', 'ex_1', 7, 60, 'numbers')
+
+    # SQLite nhập progress.json lần đầu: điểm theo ngày đi cùng, bảng tuần có ngay
+    db = make_db('sqlite', SQLITE_FILE=str(tmp_path / 'import.db'))
+    rows = {row['username']: row['window_score'] for row in db.get_leaderboard(100, window='week')}
+    assert rows['an'] == 7
+    assert db.get_progress('an').daily_scores == json_db.get_progress('an').daily_scores
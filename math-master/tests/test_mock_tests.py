@@ -0,0 +1,66 @@
+import json
+import os
+from datetime import datetime
+
+from mock_test_store import MockTestStore
+
+
+def _load(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _save(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f)
+
+
+def _test_result(score, completed_at):
+    return {'test_id': 'mock_1', 'score': score, 'completed_at': completed_at}
+
+
+def test_recovery_folds_mock_test_events(make_db, config):
+    # Compact bị dừng giữa chừng: file .compacting còn sự kiện mock_test từ bản cũ
+    now = datetime.now().isoformat()
+    events = [
+        {'seq': 1, 'type': 'exercise', 'username': 'alice', 'ts': now,
+         'exercise_id': 'ex_1', 'score': 7, 'time_spent': 60, 'topic': 'numbers'},
+        {'seq': 2, 'type': 'mock_test', 'username': 'alice', 'ts': now, 'test_result': {'score': 9}},
+    ]
+    with open(config.PROGRESS_LOG_FILE + '.compacting', 'w') as f:
+        f.write(''.join(json.dumps(event) + '\n' for event in events))
+
+    db = make_db('json', PROGRESS_LOG_ENABLED=True)
+    try:
+        assert db.get_progress('alice').get_total_score() == 7
+        assert [test['score'] for test in db.get_mock_test_history('alice')] == [9]
+        assert not os.path.exists(config.PROGRESS_LOG_FILE + '.compacting')
+    finally:
+        db.progress_log.close()
+
+
+def test_interrupted_migration_is_retried(make_db, config):
+    progress = {
+        'alice': {'username': 'alice', 'completed_exercises': [], 'game_sessions': [],
+                  'mock_tests': [_test_result(5, '2024-01-01T10:00:00'), _test_result(8, '2024-01-02T10:00:00')]},
+        'bob': {'username': 'bob', 'completed_exercises': [], 'game_sessions': [],
+                'mock_tests': [_test_result(6, '2024-01-03T10:00:00')]},
+    }
+    _save(config.PROGRESS_FILE, progress)
+    # Lần chuyển trước đã tạo thư mục và chuyển bài đầu của alice rồi dừng
+    store = MockTestStore(config.MOCK_TEST_DIR, config.MOCK_TEST_CAPACITY, config.MOCK_TEST_SHARDS, True, _load, _save)
+    store.append('alice', progress['alice']['mock_tests'][0], '2024-01-01T10:00:00')
+    assert store.count('alice') == 1
+    assert not store.is_migrated()
+
+    db = make_db('json')
+    assert [test['score'] for test in db.get_mock_test_history('alice')] == [5, 8]
+    assert [test['score'] for test in db.get_mock_test_history('bob')] == [6]
+    assert db.mock_tests.is_migrated()
+    assert all('mock_tests' not in doc for doc in db.progress_store.all().values())
+
+    # Đã đánh dấu xong: lần khởi động sau không chuyển lại
+    assert [test['score'] for test in make_db('json').get_mock_test_history('alice')] == [5, 8]
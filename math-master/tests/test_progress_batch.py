@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import parse_progress_attempt
+
+
+def _attempt(**fields):
+    return {'username': 'alice', 'exercise_id': 'ex_1', 'score': 10, **fields}
+
+
+# ==================== VALIDATION ====================
+def test_parse_fills_optional_fields():
+    parsed = parse_progress_attempt(_attempt())
+    assert parsed == {'username': 'alice', 'exercise_id': 'ex_1', 'score': 10, 'time_spent': 60,
+                      'topic': 'general', 'completed_at': None}
+
+
+def test_parse_accepts_integral_float_score():
+    assert parse_progress_attempt(_attempt(score=5.0))['score'] == 5
+
+
+@pytest.mark.parametrize('attempt', [
+    {'bad': 1},
+    {'username': 'alice', 'score': 10},
+    {'username': 'alice', 'exercise_id': 'ex_1'},
+    _attempt(exercise_id=''),
+    _attempt(exercise_id=True),
+    _attempt(score='10'),
+    _attempt(score=None),
+    _attempt(score=True),
+    _attempt(score=2.5),
+    _attempt(score=-1),
+    _attempt(time_spent='60'),
+    _attempt(topic=''),
+    _attempt(completed_at='hôm qua'),
+    _attempt(completed_at=(datetime.now() + timedelta(days=1)).isoformat()),
+    'not an object',
+])
+def test_parse_rejects_invalid_attempts(attempt):
+    with pytest.raises(ValueError):
+        parse_progress_attempt(attempt)
+
+
+# ==================== ENDPOINT ====================
+@pytest.fixture
+def client(make_db, monkeypatch):
+    import app as app_module
+    db = make_db('json')
+    monkeypatch.setattr(app_module, 'db_manager', db)
+    return app_module.app.test_client(), db
+
+
+def test_batch_endpoint_reports_rejected_items(client):
+    test_client, db = client
+    response = test_client.post('/api/progress/batch', json={'attempts': [
+        {'bad': 1},
+        _attempt(exercise_id='ex_ok', topic='numbers'),
+        _attempt(score='5'),
+        {'exercise_id': 'ex_2', 'score': 3},
+    ], 'username': 'alice'})
+
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body['applied'] == 2
+    assert [item['index'] for item in body['rejected']] == [0, 2]
+    progress = db.get_progress('alice')
+    assert [record['exercise_id'] for record in progress.completed_exercises] == ['ex_ok', 'ex_2']
+    assert progress.get_total_score() == 13
+
+
+def test_batch_endpoint_reports_storage_failure(client, monkeypatch):
+    test_client, db = client
+    monkeypatch.setattr(db, 'update_progress_batch', lambda attempts: False)
+    response = test_client.post('/api/progress/batch', json={'attempts': [_attempt(), {'bad': 1}]})
+
+    # 5xx để client không bỏ batch khỏi hàng đợi
+    assert response.status_code == 503
+    body = response.get_json()
+    assert body['success'] is False and body['applied'] == 0
+    assert [item['index'] for item in body['rejected']] == [1]
+
+
+@pytest.mark.parametrize('write_mode', ['sync', 'batched'])
+def test_batch_is_not_reported_saved_when_write_fails(make_db, monkeypatch, write_mode):
+    db = make_db('json', JSON_WRITE_MODE=write_mode)
+
+    def crash(file_path, text):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(db.writer, '_write_file', crash)
+    assert db.update_progress_batch([parse_progress_attempt(_attempt())]) is False
+    # Cache bị bỏ: không đọc ra lượt chưa được ghi
+    assert db.get_progress('alice').get_exercises_completed() == 0
+
+
+def test_batch_endpoint_requires_attempt_list(client):
+    test_client, _ = client
+    assert test_client.post('/api/progress/batch', json={'attempts': []}).status_code == 400
+
+
+# ==================== BACKDATED OFFLINE ATTEMPTS ====================
+@pytest.mark.parametrize('backend', ['json', 'sqlite'])
+def test_backdated_attempts_are_rolled_up(make_db, backend):
+    db = make_db(backend, PROGRESS_RAW_RETENTION_DAYS=7)
+    now = datetime.now()
+    db.update_progress_batch([parse_progress_attempt(_attempt(exercise_id='recent', completed_at=now.isoformat()))])
+    client_version = db.get_progress('alice').version
+
+    # Lượt làm offline gửi bù sau, completed_at cũ hơn hạn giữ lịch sử chi tiết
+    old = (now - timedelta(days=30)).isoformat()
+    db.update_progress_batch([
+        parse_progress_attempt(_attempt(exercise_id='offline_1', score=4, completed_at=old)),
+        parse_progress_attempt(_attempt(exercise_id='recent_2', score=1, completed_at=now.isoformat())),
+    ])
+
+    progress = db.get_progress('alice')
+    assert [record['exercise_id'] for record in progress.completed_exercises] == ['recent', 'recent_2']
+    assert progress.rolled_up_count('exercises') == 1
+    assert progress.get_exercises_completed() == 3
+    assert progress.get_total_score() == 15
+
+    # Bản ghi bị gộp nằm sau vị trí client đã có: client tải lại toàn bộ thay vì nhận delta lệch
+    changes = db.get_progress_changes('alice', client_version)
+    assert changes['full'] is True
+    assert db.get_progress_changes('alice', progress.version) is None
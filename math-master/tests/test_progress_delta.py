@@ -0,0 +1,52 @@
+import pytest
+
+
+def _record_attempts(db, username, attempts):
+    for exercise_id, score, topic in attempts:
+        assert db.update_progress(username, exercise_id, score, 60, topic)
+
+
+@pytest.fixture
+def backends(make_db, config, tmp_path):
+    """Một DatabaseManager JSON và một SQLite (SQLite nhập dữ liệu mẫu từ các file JSON)"""
+    json_db = make_db('json')
+    sqlite_db = make_db('sqlite', SQLITE_FILE=str(tmp_path / 'delta.db'))
+    return {'json': json_db, 'sqlite': sqlite_db}
+
+
+def test_delta_matches_between_json_and_sqlite(backends):
+    changes = {}
+    for name, db in backends.items():
+        db.init_user_progress('alice')
+        _record_attempts(db, 'alice', [('ex_1', 10, 'numbers'), ('ex_2', 0, 'geometry')])
+        since = db.get_progress('alice').version
+        _record_attempts(db, 'alice', [('ex_3', 5, 'numbers'), ('ex_4', 7, 'measurement')])
+        changes[name] = db.get_progress_changes('alice', since)
+
+    json_changes, sqlite_changes = changes['json'], changes['sqlite']
+    assert json_changes['full'] is False and sqlite_changes['full'] is False
+    for field in ('daily_scores', 'scores', 'exercises_completed', 'attempts_by_topic',
+                  'correct_by_topic', 'study_time', 'version'):
+        assert sqlite_changes[field] == json_changes[field], field
+    assert [a['exercise_id'] for a in sqlite_changes['completed_exercises']] == ['ex_3', 'ex_4']
+    assert [a['exercise_id'] for a in json_changes['completed_exercises']] == ['ex_3', 'ex_4']
+    assert sum(json_changes['daily_scores'].values()) == 22
+
+
+def test_delta_daily_scores_match_full_document(backends):
+    db = backends['sqlite']
+    db.init_user_progress('bob')
+    _record_attempts(db, 'bob', [('ex_1', 3, 'numbers')])
+    since = db.get_progress('bob').version
+    _record_attempts(db, 'bob', [('ex_2', 4, 'numbers')])
+
+    changes = db.get_progress_changes('bob', since)
+    assert changes['daily_scores'] == db.get_progress('bob').daily_scores
+    assert sum(changes['daily_scores'].values()) == 7
+
+
+def test_no_changes_returns_none(backends):
+    for db in backends.values():
+        db.init_user_progress('carol')
+        _record_attempts(db, 'carol', [('ex_1', 1, 'numbers')])
+        assert db.get_progress_changes('carol', db.get_progress('carol').version) is None
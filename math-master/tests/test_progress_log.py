@@ -0,0 +1,152 @@
+import json
+import multiprocessing
+import os
+from datetime import datetime
+
+import pytest
+
+from progress_log import ProgressEventLog
+
+USERS = ['alice', 'bob']
+
+
+def _event(seq, username, score):
+    return {'seq': seq, 'type': 'exercise', 'username': username, 'ts': datetime.now().isoformat(),
+            'exercise_id': f'ex_{seq}', 'score': score, 'time_spent': 60, 'topic': 'numbers'}
+
+
+def _write_lines(path, events, tail=''):
+    with open(path, 'w') as f:
+        f.write(''.join(json.dumps(event) + '\n' for event in events) + tail)
+
+
+# ==================== KHÔI PHỤC SAU CRASH ====================
+def test_crash_recovery_replays_log_and_compacting_file(make_db, config):
+    # Crash giữa lúc compact: .compacting chưa gộp, log mới có thêm sự kiện và một dòng ghi dở
+    _write_lines(config.PROGRESS_LOG_FILE + '.compacting', [_event(1, 'alice', 4), _event(2, 'bob', 6)])
+    _write_lines(config.PROGRESS_LOG_FILE, [_event(3, 'alice', 5)], tail='{"seq": 4, "type": "exer')
+
+    db = make_db('json', PROGRESS_LOG_ENABLED=True)
+    try:
+        assert not os.path.exists(config.PROGRESS_LOG_FILE + '.compacting')
+        assert db.get_progress('alice').get_total_score() == 9
+        assert db.get_progress('bob').get_total_score() == 6
+        # seq tiếp nối phần đã có trong log, dòng ghi dở không làm hỏng dòng mới
+        assert db.progress_log.append('exercise', 'bob', exercise_id='ex_new', score=1,
+                                      time_spent=60, topic='numbers')['seq'] == 4
+        assert db.progress_log.compact() == 2
+        assert db.get_progress('bob').get_total_score() == 7
+    finally:
+        db.progress_log.close()
+
+    # Khởi động lại sau khi đã gộp: không áp dụng trùng
+    db = make_db('json', PROGRESS_LOG_ENABLED=True)
+    try:
+        assert db.get_progress('alice').get_total_score() == 9
+        assert db.get_progress('bob').get_total_score() == 7
+        assert [e['exercise_id'] for e in db.get_progress('alice').completed_exercises] == ['ex_1', 'ex_3']
+    finally:
+        db.progress_log.close()
+
+
+def test_failed_fold_keeps_events_for_next_compaction(tmp_path):
+    folded, failing = [], [True]
+
+    def fold(events):
+        if failing[0]:
+            raise OSError('disk full')
+        folded.extend(event['seq'] for event in events)
+
+    log = ProgressEventLog(str(tmp_path / 'progress.log.jsonl'), fold, compact_interval=3600)
+    try:
+        log.append('exercise', 'alice', score=1)
+        assert log.compact() == 0
+        assert [e['seq'] for e in log.events_for('alice')] == [1]
+        log.append('exercise', 'alice', score=2)
+
+        failing[0] = False
+        assert log.compact() == 2
+        assert folded == [1, 2]
+        assert log.events_for('alice') == []
+    finally:
+        log.close()
+
+
+def test_worker_started_after_compaction_continues_seq(tmp_path):
+    log_file = str(tmp_path / 'progress.log.jsonl')
+    first = ProgressEventLog(log_file, lambda events: None, compact_interval=3600)
+    try:
+        for _ in range(3):
+            first.append('exercise', 'alice', score=1)
+        assert first.compact() == 3
+        # Worker mới chỉ biết seq trong snapshot lúc khởi động (ở đây: 0)
+        second = ProgressEventLog(log_file, lambda events: None, compact_interval=3600)
+        try:
+            assert second.append('exercise', 'bob', score=1)['seq'] == 4
+            assert first.append('exercise', 'alice', score=1)['seq'] == 5
+            assert [e['seq'] for e in second.events_for('alice')] == [5]
+        finally:
+            second.close()
+    finally:
+        first.close()
+
+
+# ==================== NHIỀU WORKER ====================
+def _worker(log_file, worker, count, result_queue):
+    log = ProgressEventLog(log_file, lambda events: None, compact_interval=3600)
+    seqs = []
+    for i in range(count):
+        seqs.append(log.append('exercise', USERS[i % 2], worker=worker, i=i)['seq'])
+    result_queue.put(seqs)
+
+
+def test_processes_share_one_seq_sequence(tmp_path):
+    log_file = str(tmp_path / 'progress.log.jsonl')
+    ctx = multiprocessing.get_context('fork')
+    result_queue = ctx.Queue()
+    workers = [ctx.Process(target=_worker, args=(log_file, worker, 50, result_queue)) for worker in range(4)]
+    for process in workers:
+        process.start()
+    seqs = [seq for _ in workers for seq in result_queue.get(timeout=30)]
+    for process in workers:
+        process.join(30)
+
+    assert sorted(seqs) == list(range(1, 201))
+    with open(log_file) as f:
+        assert sorted(json.loads(line)['seq'] for line in f) == list(range(1, 201))
+
+
+def _db_worker(worker, count):
+    from database import DatabaseManager
+    db = DatabaseManager()
+    for i in range(count):
+        db.update_progress(USERS[i % 2], f'ex_{worker}_{i}', 1, 60, 'numbers')
+    db.progress_log.close()
+
+
+@pytest.mark.parametrize('compact_events', [7, 1000])
+def test_compaction_in_one_worker_keeps_other_workers_events(make_db, config, compact_events):
+    # Log nhỏ: các worker liên tục compact trong khi worker khác đang ghi
+    db = make_db('json', PROGRESS_LOG_ENABLED=True, PROGRESS_LOG_COMPACT_EVENTS=compact_events,
+                 PROGRESS_LOG_COMPACT_INTERVAL=0.01)
+    for username in USERS:
+        db.init_user_progress(username)
+    db.progress_log.close()
+
+    ctx = multiprocessing.get_context('fork')
+    workers = [ctx.Process(target=_db_worker, args=(worker, 40)) for worker in range(4)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(60)
+    assert [process.exitcode for process in workers] == [0] * 4
+
+    db = make_db('json', PROGRESS_LOG_ENABLED=True)
+    try:
+        for username in USERS:
+            progress = db.get_progress(username)
+            assert progress.get_exercises_completed() == 80
+            assert len({e['exercise_id'] for e in progress.completed_exercises}) == 80
+        assert not os.path.exists(config.PROGRESS_LOG_FILE + '.compacting')
+    finally:
+        db.progress_log.close()
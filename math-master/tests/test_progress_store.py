@@ -0,0 +1,101 @@
+import json
+import os
+
+import pytest
+
+from models import Progress
+from progress_store import ShardedProgressStore
+
+
+def _load(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _save(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f)
+
+
+def _doc(username, *scores):
+    progress = Progress(username=username)
+    for i, score in enumerate(scores):
+        progress.add_completed_exercise(f'ex_{i}', score, 'numbers', 60)
+    return progress.to_storage_dict()
+
+
+def _store(tmp_path, shard_count):
+    return ShardedProgressStore(str(tmp_path / 'progress'), shard_count, _load, _save)
+
+
+USERS = [f'user_{i}' for i in range(40)]
+
+
+# ==================== SHARD ====================
+def test_shards_route_each_user_to_one_file(tmp_path):
+    store = _store(tmp_path, 8)
+    store.put_many({username: _doc(username, 1) for username in USERS})
+
+    shard_files = sorted(name for name in os.listdir(store.progress_dir) if name.startswith('shard_'))
+    assert 1 < len(shard_files) <= 8
+    for username in USERS:
+        shard = _load(store._shard_file(username))
+        assert shard[username]['username'] == username
+        assert store.get(username)['username'] == username
+    # Mỗi user chỉ nằm trong đúng một shard
+    assert sum(len(_load(os.path.join(store.progress_dir, name))) for name in shard_files) == len(USERS)
+
+
+def test_per_user_layout_quotes_file_names(tmp_path):
+    store = _store(tmp_path, 0)
+    store.put('an/../bình', _doc('an/../bình', 3))
+
+    assert store.get('an/../bình')['username'] == 'an/../bình'
+    assert os.listdir(store.progress_dir).count('user_an%2F..%2Fb%C3%ACnh.json') == 1
+    assert store.summaries()['an/../bình']['total_score'] == 3
+
+
+@pytest.mark.parametrize('shard_count', [0, 8])
+def test_index_is_kept_per_shard(tmp_path, shard_count):
+    store = _store(tmp_path, shard_count)
+    assert store.is_empty()
+    store.put_many({username: _doc(username, 1) for username in USERS})
+    assert not store.is_empty()
+
+    # Ghi một user chỉ sửa index của shard chứa user đó
+    target = USERS[0]
+    index_file = store._index_file(store._bucket(target))
+    before = {path: _load(path) for path in store._index_files()}
+    store.put(target, _doc(target, 1, 9))
+    changed = [path for path in store._index_files() if _load(path) != before[path]]
+    assert changed == [index_file]
+
+    summaries = store.summaries()
+    assert sorted(summaries) == sorted(USERS)
+    assert summaries[target]['total_score'] == 10
+    assert sorted(store.all()) == sorted(USERS)
+
+
+def test_legacy_index_is_split(tmp_path):
+    progress_dir = tmp_path / 'progress'
+    progress_dir.mkdir()
+    _save(str(progress_dir / 'index.json'), {username: {'total_score': 1} for username in USERS})
+
+    store = _store(tmp_path, 8)
+    assert not (progress_dir / 'index.json').exists()
+    assert sorted(store.summaries()) == sorted(USERS)
+    for username in USERS:
+        assert username in _load(store._index_file(store._bucket(username)))
+
+
+def test_database_migrates_progress_json_to_shards(make_db, config):
+    _save(config.PROGRESS_FILE, {username: _doc(username, 2) for username in USERS[:5]})
+    db = make_db('json', PROGRESS_LAYOUT='sharded', PROGRESS_SHARDS=4)
+
+    assert db.get_progress(USERS[0]).get_total_score() == 2
+    db.update_progress(USERS[0], 'ex_new', 7, 60, 'numbers')
+    assert db.get_progress(USERS[0]).get_total_score() == 9
+    assert sorted(db.progress_store.summaries()) == sorted(USERS[:5])
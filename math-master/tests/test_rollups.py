@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import Progress, parse_progress_attempt
+
+TOPICS = ('numbers', 'geometry')
+
+
+def _attempts(now):
+    """Lượt làm bài trải 20 ngày gần nhất (giữ chi tiết 7 ngày), có cả game"""
+    attempts = []
+    for i in range(20):
+        attempts.append({'username': 'alice', 'exercise_id': f'ex_{i}', 'score': i % 11,
+                         'time_spent': 30 + i, 'topic': TOPICS[i % 2],
+                         'completed_at': (now - timedelta(days=19 - i)).isoformat()})
+        if i % 4 == 0:
+            attempts.append({'username': 'alice', 'exercise_id': f'game_{i}', 'score': 2, 'time_spent': 10,
+                             'topic': 'speed', 'completed_at': (now - timedelta(days=19 - i)).isoformat()})
+    return [parse_progress_attempt(attempt) for attempt in attempts]
+
+
+def _expected(attempts):
+    exercises = [a for a in attempts if not a['exercise_id'].startswith('game')]
+    by_topic = lambda rule: {t: n for t in TOPICS
+                             if (n := sum(1 for a in exercises if a['topic'] == t and rule(a['score'])))}
+    return {
+        'exercises_completed': len(exercises),
+        'games_played': len(attempts) - len(exercises),
+        'total_score': sum(a['score'] for a in attempts),
+        'study_time': sum(a['time_spent'] for a in attempts),
+        'attempts_by_topic': by_topic(lambda score: True),
+        'correct_by_topic': by_topic(lambda score: score > 0),
+        'passed_by_topic': by_topic(lambda score: score >= 5),
+    }
+
+
+def _summary(progress):
+    return {
+        'exercises_completed': progress.get_exercises_completed(),
+        'games_played': progress.get_games_played(),
+        'total_score': progress.get_total_score(),
+        'study_time': progress.get_study_time(),
+        'attempts_by_topic': progress.attempts_by_topic,
+        'correct_by_topic': progress.correct_by_topic,
+        'passed_by_topic': progress.passed_by_topic,
+    }
+
+
+@pytest.mark.parametrize('backend', ['json', 'sqlite'])
+def test_rollup_keeps_totals_and_aggregates(make_db, backend):
+    db = make_db(backend, PROGRESS_RAW_RETENTION_DAYS=7)
+    attempts = _attempts(datetime.now())
+    for attempt in attempts:
+        assert db.update_progress_batch([attempt])
+
+    progress = db.get_progress('alice')
+    assert _summary(progress) == _expected(attempts)
+    # Chỉ còn chi tiết trong hạn giữ, phần cũ nằm trong rollups
+    cutoff = (datetime.now() - timedelta(days=7)).date().isoformat()
+    assert all(r['completed_at'][:10] >= cutoff for r in [*progress.completed_exercises, *progress.game_sessions])
+    assert progress.rolled_up_count('exercises') + len(progress.completed_exercises) == 20
+    assert progress.rolled_up_count('exercises') > 0 and progress.rolled_up_count('games') > 0
+    assert sum(progress.daily_scores.values()) == _expected(attempts)['total_score']
+    # Số bài đạt trong rollups là chính xác (không phải số bài có điểm > 0)
+    rolled_passed = sum(entry[2] for days in progress.rollups['exercises']['days'].values()
+                        for entry in days.values())
+    recent_passed = sum(1 for r in progress.completed_exercises if r['score'] >= 5)
+    assert rolled_passed + recent_passed == sum(_expected(attempts)['passed_by_topic'].values())
+    assert rolled_passed < sum(entry[1] for days in progress.rollups['exercises']['days'].values()
+                               for entry in days.values())
+
+
+def test_rollup_matches_between_json_and_sqlite(make_db, tmp_path):
+    attempts = _attempts(datetime.now())
+    documents = {}
+    for backend in ('json', 'sqlite'):
+        db = make_db(backend, PROGRESS_RAW_RETENTION_DAYS=7, SQLITE_FILE=str(tmp_path / 'rollups.db'))
+        db.init_user_progress(backend)
+        for attempt in attempts:
+            assert db.update_progress_batch([{**attempt, 'username': backend}])
+        documents[backend] = db.get_progress(backend)
+
+    json_progress, sqlite_progress = documents['json'], documents['sqlite']
+    assert _summary(sqlite_progress) == _summary(json_progress)
+    assert sqlite_progress.rollups == json_progress.rollups
+    assert sqlite_progress.scores == json_progress.scores
+    assert [r['exercise_id'] for r in sqlite_progress.completed_exercises] == \
+        [r['exercise_id'] for r in json_progress.completed_exercises]
+
+
+def test_passed_by_topic_migrated_from_history_and_rollups():
+    progress = Progress(username='alice')
+    for i, score in enumerate((10, 4, 6, 0)):
+        progress.add_completed_exercise(f'ex_{i}', score, 'numbers', 60)
+    data = progress.to_storage_dict()
+    del data['passed_by_topic']
+    data['rollups'] = {'exercises': {'count': 3, 'days': {'2020-01-01': {'numbers': [3, 2, 1, 12, 180]}}}}
+
+    assert Progress.needs_migration(data)
+    assert Progress.from_dict(data).passed_by_topic == {'numbers': 3}
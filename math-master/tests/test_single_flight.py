@@ -0,0 +1,186 @@
+import asyncio
+import threading
+
+import pytest
+
+from single_flight import AsyncSingleFlight, SingleFlight
+
+
+# ==================== SingleFlight (thread) ====================
+def _run_threads(count, target):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def test_sync_coalesces_concurrent_calls():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls, results = [], []
+
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        return 'answer'
+
+    threads = _run_threads(5, lambda: results.append(flights.do('key', fn)))
+    while flights.get_stats()['coalesced'] < 4:
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ['answer'] * 5
+    assert len(calls) == 1
+    assert flights.get_stats() == {'calls': 1, 'coalesced': 4, 'max_waiters': 4, 'in_flight': 0}
+    # Lời gọi đã xong: request sau gọi lại
+    assert flights.do('key', lambda: 'again') == 'again'
+
+
+def test_sync_error_is_shared_with_waiters():
+    flights = SingleFlight()
+    release = threading.Event()
+    errors = []
+
+    def fn():
+        release.wait(5)
+        raise RuntimeError('boom')
+
+    def call():
+        try:
+            flights.do('key', fn)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    threads = _run_threads(3, call)
+    while flights.get_stats()['coalesced'] < 2:
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert errors == ['boom'] * 3
+    assert flights.get_stats()['in_flight'] == 0
+
+
+# ==================== AsyncSingleFlight ====================
+def test_async_coalesces_concurrent_calls():
+    async def scenario():
+        flights = AsyncSingleFlight()
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return 'answer'
+
+        results = await asyncio.gather(*(flights.do('key', fn) for _ in range(5)))
+        return results, calls, flights.get_stats()
+
+    results, calls, stats = asyncio.run(scenario())
+    assert results == ['answer'] * 5
+    assert len(calls) == 1
+    assert stats == {'calls': 1, 'coalesced': 4, 'max_waiters': 4, 'in_flight': 0}
+
+
+def test_async_error_is_shared_with_waiters():
+    async def scenario():
+        flights = AsyncSingleFlight()
+
+        async def fn():
+            await asyncio.sleep(0.01)
+            raise RuntimeError('boom')
+
+        results = await asyncio.gather(*(flights.do('key', fn) for _ in range(3)), return_exceptions=True)
+        return results, flights.get_stats()
+
+    results, stats = asyncio.run(scenario())
+    assert [str(result) for result in results] == ['boom'] * 3
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert stats['in_flight'] == 0
+
+
+def test_async_cancelled_leader_does_not_cancel_waiters():
+    async def scenario():
+        flights = AsyncSingleFlight()
+        release = asyncio.Event()
+
+        async def fn():
+            await release.wait()
+            return 'answer'
+
+        leader = asyncio.ensure_future(flights.do('key', fn))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(flights.do('key', fn))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return leader, await waiter, flights
+
+    leader, result, flights = asyncio.run(scenario())
+    assert leader.cancelled()
+    assert result == 'answer'
+    assert flights.get_stats()['in_flight'] == 0
+
+
+def test_async_call_keeps_running_when_every_caller_is_cancelled():
+    async def scenario():
+        flights = AsyncSingleFlight()
+        finished = []
+
+        async def fn():
+            await asyncio.sleep(0.01)
+            finished.append(1)
+            return 'answer'
+
+        caller = asyncio.ensure_future(flights.do('key', fn))
+        await asyncio.sleep(0)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        await asyncio.sleep(0.05)
+        return finished, flights.get_stats()
+
+    finished, stats = asyncio.run(scenario())
+    assert finished == [1]
+    assert stats['in_flight'] == 0
+
+
+def test_async_cancelled_call_raises_for_every_caller():
+    async def scenario():
+        flights = AsyncSingleFlight()
+
+        async def fn():
+            await asyncio.sleep(10)
+
+        callers = [asyncio.ensure_future(flights.do('key', fn)) for _ in range(2)]
+        await asyncio.sleep(0)
+        flights._flights['key'][0].cancel()
+        return await asyncio.gather(*callers, return_exceptions=True), flights.get_stats()
+
+    results, stats = asyncio.run(scenario())
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+    assert stats['in_flight'] == 0
+
+
+def test_asgi_call_ai_falls_back_when_shared_call_is_cancelled(monkeypatch):
+    pytest.importorskip('starlette')
+    pytest.importorskip('google.genai')
+    import asgi
+
+    monkeypatch.setattr(asgi.ai_service, 'gemini', type('Gemini', (), {'client': object()})())
+
+    async def scenario():
+        flights = AsyncSingleFlight()
+
+        async def call():
+            return await flights.do('key', lambda: asyncio.sleep(10))
+
+        result = asyncio.ensure_future(asgi._call_ai('chat', call(), lambda: 'fallback'))
+        await asyncio.sleep(0.01)
+        flights._flights['key'][0].cancel()
+        return await result
+
+    assert asyncio.run(scenario()) == 'fallback'
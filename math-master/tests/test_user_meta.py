@@ -0,0 +1,92 @@
+import threading
+
+import pytest
+
+from user_meta import UserMetaBuffer
+
+
+class SlowStorage:
+    """Storage giả: ghi xong dữ liệu rồi mới chờ gate (như lúc fsync/commit chậm)"""
+
+    def __init__(self):
+        self.users = {'alice': {'username': 'alice', 'last_login': '', 'login_count': 0}}
+        self.written = threading.Event()
+        self.gate = threading.Event()
+        self.gate.set()
+        self.fail = False
+
+    def write(self, updates):
+        if self.fail:
+            raise OSError('disk full')
+        for username, meta in updates.items():
+            user = self.users[username]
+            user['last_login'] = max(user['last_login'], meta['last_login'])
+            user['login_count'] += meta['login_count']
+        self.written.set()
+        self.gate.wait(5)
+
+    def load(self, username):
+        return dict(self.users[username])
+
+
+@pytest.fixture
+def storage():
+    storage = SlowStorage()
+    buffer = UserMetaBuffer(storage.write, interval=60)
+    yield storage, buffer
+    storage.gate.set()
+    buffer.close()
+
+
+def test_login_during_flush_is_counted_once(storage):
+    storage, buffer = storage
+    buffer.record_login('alice', '2024-01-01T08:00:00')
+    storage.gate.clear()
+    flusher = threading.Thread(target=buffer.flush)
+    flusher.start()
+    assert storage.written.wait(5)
+
+    # Storage đã có lần ghi nhưng flush chưa xong: lần đọc chờ flush, không cộng trùng
+    buffer.record_login('alice', '2024-01-01T09:00:00')
+    seen = []
+    reader = threading.Thread(target=lambda: seen.append(buffer.load_user('alice', lambda: storage.load('alice'))))
+    reader.start()
+    reader.join(0.1)
+    assert reader.is_alive()
+
+    storage.gate.set()
+    flusher.join(5)
+    reader.join(5)
+    assert seen[0]['login_count'] == 2
+    assert seen[0]['last_login'] == '2024-01-01T09:00:00'
+
+    assert buffer.flush() == 1
+    assert storage.users['alice']['login_count'] == 2
+    assert buffer.load_user('alice', lambda: storage.load('alice'))['login_count'] == 2
+
+
+def test_failed_flush_keeps_logins_for_next_flush(storage):
+    storage, buffer = storage
+    buffer.record_login('alice', '2024-01-01T08:00:00')
+    storage.fail = True
+    assert buffer.flush() == 0
+    buffer.record_login('alice', '2024-01-01T09:00:00')
+    assert buffer.load_user('alice', lambda: storage.load('alice'))['login_count'] == 2
+
+    storage.fail = False
+    assert buffer.flush() == 1
+    assert storage.users['alice'] == {'username': 'alice', 'last_login': '2024-01-01T09:00:00', 'login_count': 2}
+    assert buffer.flush() == 0
+
+
+@pytest.mark.parametrize('backend', ['json', 'sqlite'])
+def test_pending_logins_are_visible_before_flush(make_db, backend):
+    db = make_db(backend, USER_META_FLUSH_INTERVAL=60)
+    assert db.save_user({'username': 'alice', 'password': 'secret123'})
+    for _ in range(3):
+        assert db.update_user_last_login('alice')
+    assert db.get_user('alice').login_count == 3
+
+    assert db.user_meta.flush() == 1
+    assert db.get_user('alice').login_count == 3
+    db.user_meta.close()